@@ -4,16 +4,50 @@ Anti-Sycophant Hook for Claude Code
 Detects sycophantic responses and automatically corrects Claude's behavior
 """
 
+# Annotations are never evaluated at runtime, which keeps the typing import off
+# the hot path of a hook that starts a fresh interpreter for every response
+from __future__ import annotations
+
+import io
 import json
+import math
 import sys
 import re
 import os
-from typing import List, Dict, Tuple
-from datetime import datetime
+import zlib
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from time import perf_counter_ns, time
 
 # Configuration
 BLOCK_AND_REVISE = True  # If True, blocks and asks for revision. If False, just warns
 SENSITIVITY = "medium"    # "low", "medium", or "high" - how aggressive to be
+NOTIFIER = "detached" if sys.platform == "darwin" else "none"  # "detached", "desktop" or "none"
+TREND_WINDOW = 0       # Assistant turns scored per session; 0 decides on the latest response alone
+TREND_DECAY = 0.8      # Weight kept per turn of age in the trend score
+TREND_THRESHOLD = 3.0  # Trend score at which a response with hits is blocked
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes read per backward seek when tailing the transcript
+STREAM_DECODE_THRESHOLD = 64 * 1024  # Larger records are streamed for their text, not decoded in full
+STREAM_BLOCK_SIZE = 64 * 1024  # Bytes of a streamed record read from the transcript at a time
+TELEMETRY = False  # Append a timing record per Stop event to STATE_DIR/telemetry.jsonl
+
+# Rule packs: JSON files next to the hook, plus hook_config.anti_sycophant in the SuperClaude metadata
+HOOK_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_DIR = os.environ.get("ANTI_SYCOPHANT_RULES_DIR") or os.path.join(HOOK_DIR, "anti_sycophant_rules")
+METADATA_FILE = os.path.join(os.path.dirname(HOOK_DIR), ".superclaude-metadata.json")
+
+# State kept between hook invocations (detector cache, per-session transcript index, daemon socket),
+# next to the installed hook so each install directory has its own
+STATE_DIR = os.environ.get("ANTI_SYCOPHANT_STATE_DIR") or os.path.join(HOOK_DIR, ".anti_sycophant")
+USE_DETECTOR_CACHE = os.environ.get("ANTI_SYCOPHANT_NO_CACHE") != "1"
+DETECTOR_CACHE_VERSION = 6
+MAX_TRACKED_SESSIONS = 64  # Sessions kept in the transcript offset index (least recently used evicted)
+
+# Per-invocation telemetry, forced on with ANTI_SYCOPHANT_TELEMETRY=1
+TELEMETRY_FILE = os.path.join(STATE_DIR, "telemetry.jsonl")
+TELEMETRY_MAX_BYTES = 1024 * 1024  # Size at which the file is rotated to telemetry.jsonl.1
+TELEMETRY_STAGES = ("load", "extract", "detect", "emit", "total")
+HOOK_TIMEOUT_MS = 5000  # Matches the Stop hook timeout configured in settings.json
 
 # Sycophantic phrases to detect (case-insensitive)
 SYCOPHANTIC_PHRASES = {
@@ -105,8 +139,31 @@ LEGITIMATE_PHRASES = [
     r"yes, that[''']s the definition"
 ]
 
+# Confidence levels checked for each SENSITIVITY setting, strongest first
+SENSITIVITY_LEVELS = {
+    "high": ["high_confidence", "medium_confidence", "low_confidence"],
+    "medium": ["high_confidence", "medium_confidence"],
+    "low": ["high_confidence"]
+}
+
+# Multi-turn scoring: tiers tracked per turn and their weight in the trend score
+TREND_LEVELS = ("high_confidence", "medium_confidence", "low_confidence")
+TREND_WEIGHTS = {"high_confidence": 3.0, "medium_confidence": 2.0, "low_confidence": 1.0}
 
-def load_transcript(transcript_path: str) -> List[Dict]:
+# Notification backends: detached child process, blocking desktop notifier, or disabled
+NOTIFIERS = ("detached", "desktop", "none")
+
+# Negations that, directly before a match, mean the phrase is not an agreement
+NEGATION_PATTERN = re.compile(r"(?:not|don[''']t\s+think|wouldn[''']t\s+say)\s+$", re.IGNORECASE)
+NEGATION_WINDOW = 40  # Characters before a match searched for a negation
+
+# Sentence ends (terminal punctuation before whitespace, or a line break) scoping the context checks.
+# Leading with one character class lets the regex engine skip ahead between candidates.
+SENTENCE_BOUNDARY = re.compile(r"[.!?\n](?:(?<=\n)|[.!?]*(?=\s|$))")
+LEGITIMATE_WINDOW = 200  # Characters around a match searched for an allowlisted phrase
+
+
+def load_transcript(transcript_path: str) -> list[dict]:
     """Load and parse the conversation transcript."""
     try:
         messages = []
@@ -124,7 +181,646 @@ def load_transcript(transcript_path: str) -> List[Dict]:
         return []
 
 
-def extract_claude_response(messages: List[Dict]) -> str:
+def _is_assistant_record(message: dict) -> bool:
+    """Check whether a transcript record holds an assistant response."""
+    if not isinstance(message, dict):
+        return False
+    if message.get('type') == 'assistant' and 'message' in message:
+        msg = message['message']
+        return isinstance(msg, dict) and msg.get('role') == 'assistant'
+    return message.get('role') == 'assistant' or message.get('type') == 'assistant_message'
+
+
+# Byte-level JSON scanning for streaming an assistant record without building its dict tree.
+# The record is read from the transcript in blocks; skipped values are scanned and dropped.
+_JSON_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_JSON_QUOTE = re.compile(rb'"(?:(?<!\\")|(?<=\\\\"))')  # A quote with no backslash, or two or more, before it
+_JSON_SCALAR = re.compile(rb'[^,:\]}\s]+')
+_JSON_STRUCTURE = re.compile(rb'["\[\]{}]')
+
+
+class _Unstreamable(Exception):
+    """The record has a shape the streaming reader does not model; decode it in full instead."""
+
+
+class _RecordReader:
+    """
+    Forward view of one transcript record, read from the file STREAM_BLOCK_SIZE
+    bytes at a time. Positions are relative to the start of the record. Bytes
+    before the last released position are dropped on the next read, so a walk
+    holds one block plus the token it is reading rather than the whole record.
+    """
+
+    def __init__(self, f, offset: int, length: int, block_size: int = STREAM_BLOCK_SIZE):
+        self.f = f
+        self.offset = offset  # File offset of the record
+        self.length = length  # Record size, excluding its newline
+        self.block_size = block_size
+        self.base = 0         # Record position of data[0]
+        self.floor = 0        # Record position before which bytes may be dropped
+        self.data = bytearray()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop)
+            return bytes(self.data[index.start - self.base:index.stop - self.base])
+        self._fill(index + 1)
+        return self.data[index - self.base]
+
+    def _fill(self, pos: int) -> None:
+        """Read blocks until the data reaches record position `pos` or the end of the record."""
+        read_end = self.base + len(self.data)
+        if read_end >= min(pos, self.length):
+            return
+        if self.floor > self.base:
+            del self.data[:self.floor - self.base]
+            self.base = self.floor
+        self.f.seek(self.offset + read_end)
+        while read_end < min(pos, self.length):
+            block = self.f.read(min(self.block_size, self.length - read_end))
+            if not block:
+                raise ValueError(f"Record ends early at byte {read_end}")
+            self.data += block
+            read_end += len(block)
+
+    def read_all(self) -> bytes:
+        """Read the whole record, for the full decoder."""
+        self.f.seek(self.offset)
+        return self.f.read(self.length)
+
+    def release(self, pos: int) -> None:
+        """Let the bytes before `pos` go; the walk will not look back past it."""
+        if pos > self.floor:
+            self.floor = pos
+
+    def startswith(self, prefix: bytes, pos: int) -> bool:
+        self._fill(pos + len(prefix))
+        return self.data.startswith(prefix, pos - self.base)
+
+    def match_end(self, pattern: re.Pattern, pos: int) -> int | None:
+        """Return the end of the `pattern` match at `pos`, or None; reads on while the match reaches the data's end."""
+        self._fill(pos + 1)
+        while True:
+            match = pattern.match(self.data, pos - self.base)
+            if match is None:
+                return None
+            end = self.base + match.end()
+            if end < self.base + len(self.data) or end >= self.length:
+                return end
+            self._fill(end + self.block_size)
+
+    def search(self, pattern: re.Pattern, pos: int) -> int:
+        """Return the position of the next single-byte `pattern` match from `pos`, or -1; scanned bytes are released."""
+        while True:
+            self.release(pos)
+            self._fill(pos + 1)
+            match = pattern.search(self.data, pos - self.base)
+            if match is not None:
+                return self.base + match.start()
+            pos = self.base + len(self.data)
+            if pos >= self.length:
+                return -1
+
+    def string_end(self, pos: int, keep: bool = False) -> int:
+        """
+        Return the position just past the JSON string whose opening quote is at `pos`.
+        Unless `keep` is set the string is only being skipped, and its bytes are
+        released as the scan moves on.
+        """
+        scan = pos + 1
+        while True:
+            self._fill(scan + 1)
+            match = _JSON_QUOTE.search(self.data, scan - self.base)
+            if match is not None:
+                # Quotes after a single backslash never match; after a longer run, the quote
+                # closes the string only if the run is even (\\" is a backslash, then the end)
+                quote = self.base + match.start()
+                run_start = quote
+                while run_start > self.base and self.data[run_start - 1 - self.base] == 0x5c:
+                    run_start -= 1
+                if (quote - run_start) % 2 == 0:
+                    return quote + 1
+                if not keep:
+                    self.release(quote)
+                scan = quote + 1
+                continue
+
+            scan = self.base + len(self.data)
+            if scan >= self.length:
+                raise ValueError(f"Unterminated JSON string at byte {pos}")
+            if not keep:
+                # Drop what was scanned, but keep one backslash if the data ends in an odd run:
+                # a quote at the start of the next block is judged by the run's parity
+                run_start = scan
+                while run_start > self.base and self.data[run_start - 1 - self.base] == 0x5c:
+                    run_start -= 1
+                self.release(scan - (scan - run_start) % 2)
+            self._fill(scan + self.block_size)
+
+
+def _skip_whitespace(buf: _RecordReader, pos: int) -> int:
+    buf.release(pos)
+    return buf.match_end(_JSON_WHITESPACE, pos)
+
+
+def _skip_container(buf: _RecordReader, pos: int) -> int:
+    """Return the position just past the object or array starting at `pos`."""
+    depth = 0
+    while True:
+        token_pos = buf.search(_JSON_STRUCTURE, pos)
+        if token_pos < 0:
+            raise ValueError("Unterminated JSON container")
+        token = buf[token_pos]
+        if token == 0x22:
+            pos = buf.string_end(token_pos)  # Strings are jumped over whole
+        elif token == 0x5b or token == 0x7b:
+            depth += 1
+            pos = token_pos + 1
+        else:
+            depth -= 1
+            pos = token_pos + 1
+            if depth == 0:
+                return pos
+
+
+def _skip_value(buf: _RecordReader, pos: int) -> int:
+    """Return the position just past the JSON value starting at `pos`."""
+    if buf.startswith(b'"', pos):
+        return buf.string_end(pos)
+    if buf[pos:pos + 1] in (b'{', b'['):
+        return _skip_container(buf, pos)
+    end = buf.match_end(_JSON_SCALAR, pos)
+    if end is None:
+        raise ValueError(f"Invalid JSON value at byte {pos}")
+    return end
+
+
+def _decode_string(buf: _RecordReader, pos: int) -> tuple[str | None, int]:
+    """Decode the JSON string at `pos`; returns (None, end) when the value is not a string."""
+    if not buf.startswith(b'"', pos):
+        return None, _skip_value(buf, pos)
+    end = buf.string_end(pos, keep=True)
+    raw = buf[pos + 1:end - 1]
+    return (raw.decode('utf-8') if b'\\' not in raw else json.loads(buf[pos:end])), end
+
+
+def _iter_members(buf: _RecordReader, pos: int) -> Iterator[tuple[bytes, int]]:
+    """
+    Yield (raw_key, value_position) for each member of the object starting at `pos`.
+    The consumer sends back the position after the value it read or skipped.
+    """
+    pos = _skip_whitespace(buf, pos + 1)
+    if buf.startswith(b'}', pos):
+        return pos + 1
+    while True:
+        if not buf.startswith(b'"', pos):
+            raise ValueError(f"Expected object key at byte {pos}")
+        end = buf.string_end(pos, keep=True)
+        key = buf[pos:end]
+        if b'\\' in key:
+            raise _Unstreamable("Escaped object key")
+        pos = _skip_whitespace(buf, end)
+        if not buf.startswith(b':', pos):
+            raise ValueError(f"Expected ':' at byte {pos}")
+        pos = yield key, _skip_whitespace(buf, pos + 1)
+        pos = _skip_whitespace(buf, pos)
+        if buf.startswith(b'}', pos):
+            return pos + 1
+        if not buf.startswith(b',', pos):
+            raise ValueError(f"Expected ',' or '}}' at byte {pos}")
+        pos = _skip_whitespace(buf, pos + 1)
+
+
+def _walk_object(buf: _RecordReader, pos: int, handle) -> int:
+    """Drive _iter_members, calling `handle(key, value_position)` which returns the value's end."""
+    members = _iter_members(buf, pos)
+    try:
+        key, value_pos = next(members)
+        while True:
+            key, value_pos = members.send(handle(key, value_pos))
+    except StopIteration as stop:
+        return stop.value
+
+
+def _read_content(buf: _RecordReader, pos: int) -> tuple[str, int]:
+    """Read a message's `content`: a string, or the text blocks of a content list joined by spaces."""
+    if buf.startswith(b'"', pos):
+        return _decode_string(buf, pos)
+    if not buf.startswith(b'[', pos):
+        raise _Unstreamable("Non-list, non-string content")
+
+    text_parts = []
+    pos = _skip_whitespace(buf, pos + 1)
+    if buf.startswith(b']', pos):
+        return '', pos + 1
+    while True:
+        if buf.startswith(b'{', pos):
+            block = {}
+
+            def read_block_member(key: bytes, value_pos: int) -> int:
+                # Only a block's type and text are decoded; tool inputs and results are skipped
+                if key == b'"type"' or key == b'"text"':
+                    value, end = _decode_string(buf, value_pos)
+                    if value is None and key == b'"text"':
+                        raise _Unstreamable("Non-string text block")
+                    block[key] = value
+                    return end
+                return _skip_value(buf, value_pos)
+
+            pos = _walk_object(buf, pos, read_block_member)
+            if block.get(b'"type"') == 'text':
+                text_parts.append(block.get(b'"text"', ''))
+        else:
+            pos = _skip_value(buf, pos)
+        pos = _skip_whitespace(buf, pos)
+        if buf.startswith(b']', pos):
+            return ' '.join(text_parts), pos + 1
+        if not buf.startswith(b',', pos):
+            raise ValueError(f"Expected ',' or ']' at byte {pos}")
+        pos = _skip_whitespace(buf, pos + 1)
+
+
+def stream_assistant_text(line: bytes | _RecordReader) -> str | None:
+    """
+    Return the response text of an assistant transcript record, or None if it is
+    not an assistant record. Walks the JSON bytes instead of building the record:
+    only text blocks are decoded and tool payloads are skipped over as they are
+    read, so memory use follows the size of the assistant text rather than the
+    size of the record. Raises _Unstreamable for shapes that need the full decoder.
+    """
+    if isinstance(line, bytes):
+        line = _RecordReader(io.BytesIO(line), 0, len(line))
+    pos = _skip_whitespace(line, 0)
+    if not line.startswith(b'{', pos):
+        return None
+
+    record = {}   # Decoded top-level scalars and content text, keyed by raw key
+    message = {}  # Same for the nested `message` object
+
+    def read_message_member(key: bytes, value_pos: int) -> int:
+        if key == b'"role"':
+            message[key], end = _decode_string(line, value_pos)
+            return end
+        if key == b'"content"':
+            message[key], end = _read_content(line, value_pos)
+            return end
+        return _skip_value(line, value_pos)
+
+    def read_record_member(key: bytes, value_pos: int) -> int:
+        if key == b'"type"' or key == b'"role"':
+            record[key], end = _decode_string(line, value_pos)
+            return end
+        if key == b'"content"':
+            record[key], end = _read_content(line, value_pos)
+            return end
+        if key == b'"message"':
+            if line.startswith(b'{', value_pos):
+                message.clear()
+                record[key] = message
+                return _walk_object(line, value_pos, read_message_member)
+            record[key], end = _decode_string(line, value_pos)
+            if record[key] is None:
+                raise _Unstreamable("Non-object, non-string message")
+            return end
+        return _skip_value(line, value_pos)
+
+    end = _walk_object(line, pos, read_record_member)
+    if _skip_whitespace(line, end) != len(line):
+        raise ValueError("Extra data after JSON record")
+
+    # Same precedence as _is_assistant_record and extract_claude_response
+    record_type = record.get(b'"type"')
+    if record_type == 'assistant' and b'"message"' in record:
+        if record[b'"message"'] is message and message.get(b'"role"') == 'assistant':
+            return message.get(b'"content"', '')
+        return None
+    if record.get(b'"role"') == 'assistant':
+        return record.get(b'"content"', '')
+    if record_type == 'assistant_message':
+        text = record.get(b'"message"', '')
+        if text is message:
+            raise _Unstreamable("Object-valued assistant_message")
+        return text
+    return None
+
+
+# Transcript work done by the current Stop event, reported in its telemetry record
+_READ_STATS = {"bytes_read": 0, "records_parsed": 0, "extract_ns": 0}
+
+
+def _decode_assistant_line(line: bytes | _RecordReader) -> str | None:
+    """Return the response text of a transcript line, or None if it is not an assistant record."""
+    # Cheap byte check first: most trailing lines are tool results we never need to parse
+    if isinstance(line, bytes) and b'assistant' not in line:
+        return None
+    start = perf_counter_ns()
+    try:
+        return _decode_record_text(line)
+    finally:
+        _READ_STATS["records_parsed"] += 1
+        _READ_STATS["extract_ns"] += perf_counter_ns() - start
+
+
+def _decode_record_text(line: bytes | _RecordReader) -> str | None:
+    """Decode one transcript record that may be an assistant turn and return its text."""
+    if len(line) > STREAM_DECODE_THRESHOLD:
+        try:
+            return stream_assistant_text(line)
+        except _Unstreamable:
+            pass  # The full decoder settles shapes the walker does not model
+        except ValueError:
+            return None  # Not a JSON record, or one still being written
+        if isinstance(line, _RecordReader):
+            line = line.read_all()
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return extract_claude_response([record]) if _is_assistant_record(record) else None
+
+
+def _decode_line_at(f, offset: int, length: int, line: bytes | None) -> str | None:
+    """Decode the transcript line at `offset`; `line` is None when it was too long to read into memory."""
+    if line is not None:
+        return _decode_assistant_line(line)
+    _READ_STATS["bytes_read"] += length  # The streaming reader goes over it once more
+    return _decode_assistant_line(_RecordReader(f, offset, length))
+
+
+def _read_line_at(f, offset: int) -> tuple[bytes | None, int, bool]:
+    """
+    Read the line starting at `offset`; returns (line, length without the newline,
+    terminated). A line longer than STREAM_DECODE_THRESHOLD is only measured, block
+    by block, and returned as None for the streaming reader to walk in the file.
+    """
+    f.seek(offset)
+    line = f.readline(STREAM_DECODE_THRESHOLD + 1)
+    _READ_STATS["bytes_read"] += len(line)
+    if line.endswith(b'\n'):
+        return line, len(line) - 1, True
+    length = len(line)
+    if length <= STREAM_DECODE_THRESHOLD:
+        return line, length, False
+    while True:
+        block = f.read(TAIL_BLOCK_SIZE)
+        _READ_STATS["bytes_read"] += len(block)
+        newline = block.find(b'\n')
+        if newline >= 0:
+            return None, length + newline, True
+        if not block:
+            return None, length, False
+        length += len(block)
+
+
+def _iter_lines_reversed(f, block_size: int = TAIL_BLOCK_SIZE) -> Iterator[tuple[int, int, bytes | None]]:
+    """
+    Yield (offset, length, line) for each line of a binary file from last to first,
+    reading backwards in blocks. Lines longer than STREAM_DECODE_THRESHOLD are not
+    assembled: `line` is None and the streaming reader walks them in the file.
+    """
+    f.seek(0, os.SEEK_END)
+    position = line_end = f.tell()
+    pending = []  # Pieces of the line currently being assembled, last piece first
+
+    def assembled(start: int) -> bytes | None:
+        return b''.join(reversed(pending)) if line_end - start <= STREAM_DECODE_THRESHOLD else None
+
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        block = f.read(read_size)
+        _READ_STATS["bytes_read"] += len(block)
+        parts = block.split(b'\n')
+        if len(parts) == 1:
+            if line_end - position <= STREAM_DECODE_THRESHOLD:
+                pending.append(block)
+            continue
+        start = position + len(block) - len(parts[-1])
+        pending.append(parts[-1])
+        yield start, line_end - start, assembled(start)
+        for line in reversed(parts[1:-1]):
+            start -= len(line) + 1
+            yield start, len(line), line
+        pending = [parts[0]]
+        line_end = start - 1
+    yield 0, line_end, assembled(0)
+
+
+def _tail_assistant_response(f) -> tuple[str | None, int | None, int]:
+    """Tail the transcript from EOF; returns (response, response_offset, parsed_size)."""
+    parsed_size = None
+    for offset, length, line in _iter_lines_reversed(f):
+        if parsed_size is None:
+            # Text after the last newline is a record still being written; parse it next time
+            parsed_size = offset
+        response = _decode_line_at(f, offset, length, line)
+        if response is not None:
+            return response, offset, parsed_size
+    return None, None, parsed_size or 0
+
+
+def _scan_appended_records(f, start: int) -> tuple[str | None, int | None, int]:
+    """Parse the lines appended after `start`; returns (response, response_offset, parsed_size)."""
+    response, response_offset, offset = None, None, start
+    while True:
+        line, length, terminated = _read_line_at(f, offset)
+        if not length and not terminated:
+            break
+        candidate = _decode_line_at(f, offset, length, line)
+        if candidate is not None:
+            response, response_offset = candidate, offset
+        if not terminated:
+            # Like the tail path: use a last record whose newline is not flushed yet if it
+            # already decodes, but leave the cursor before it so it is parsed again next time
+            break
+        offset += length + 1
+    return response, response_offset, offset
+
+
+def _read_response_at(f, offset: int) -> str | None:
+    """Re-read the assistant response whose record starts at a known byte offset."""
+    line, length, _ = _read_line_at(f, offset)
+    return _decode_line_at(f, offset, length, line)
+
+
+def find_latest_assistant_response(transcript_path: str, cursor: dict | None = None) -> tuple[str | None, dict | None]:
+    """
+    Return (response, cursor) for the most recent assistant record in the transcript.
+    A cursor from the previous Stop event of the same session means only the bytes
+    appended since then are parsed; a missing, truncated or replaced transcript is
+    tailed from EOF instead.
+    """
+    try:
+        stat = os.stat(transcript_path)
+    except OSError:
+        return None, None
+
+    with open(transcript_path, 'rb') as f:
+        response = None
+        if (cursor and cursor.get('path') == transcript_path and cursor.get('inode') == stat.st_ino
+                and cursor.get('device') == stat.st_dev and cursor.get('size', 0) <= stat.st_size):
+            response, response_offset, parsed_size = _scan_appended_records(f, cursor['size'])
+            if response is None and cursor.get('assistant_offset') is not None:
+                # Nothing new was said; the previous response must still be where we left it
+                response_offset = cursor['assistant_offset']
+                response = _read_response_at(f, response_offset)
+        if response is None:
+            response, response_offset, parsed_size = _tail_assistant_response(f)
+
+    new_cursor = {
+        'path': transcript_path,
+        'device': stat.st_dev,
+        'inode': stat.st_ino,
+        'size': parsed_size,
+        'assistant_offset': response_offset if response is not None else None
+    }
+    return response, new_cursor
+
+
+def _write_json_atomic(path: str, data) -> None:
+    """Write JSON to a temp file and rename it into place so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+class SessionIndex:
+    """
+    Per-session transcript cursors persisted between Stop events, so each event
+    only parses the bytes appended since the previous one. Sessions are kept in
+    least-recently-used order and the oldest are evicted past `max_sessions`.
+    """
+
+    def __init__(self, path: str | None = None, max_sessions: int = MAX_TRACKED_SESSIONS):
+        self.path = path
+        self.max_sessions = max_sessions
+        self.sessions: dict[str, dict] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str | None = None, max_sessions: int = MAX_TRACKED_SESSIONS) -> SessionIndex:
+        """Load the index from disk; a missing or corrupt file starts an empty index."""
+        index = cls(path or os.path.join(STATE_DIR, "sessions.json"), max_sessions)
+        try:
+            with open(index.path, 'r', encoding='utf-8') as f:
+                sessions = json.load(f).get("sessions", {})
+            if isinstance(sessions, dict):
+                index.sessions = sessions
+        except (OSError, ValueError, AttributeError):
+            pass
+        return index
+
+    def get(self, session_id: str) -> dict | None:
+        """Return the cursor stored for a session, if any."""
+        return self.sessions.get(session_id)
+
+    def put(self, session_id: str, cursor: dict) -> list[str]:
+        """Store a session cursor as most recently used; returns the evicted session ids."""
+        self.sessions.pop(session_id, None)
+        self.sessions[session_id] = cursor
+        evicted = []
+        while len(self.sessions) > self.max_sessions:
+            oldest = next(iter(self.sessions))
+            del self.sessions[oldest]
+            evicted.append(oldest)
+        self.dirty = True
+        return evicted
+
+    def save(self) -> None:
+        """Persist the index if it changed; failures only cost a full tail read next time."""
+        if not self.dirty or not self.path:
+            return
+        try:
+            _write_json_atomic(self.path, {"sessions": self.sessions})
+            self.dirty = False
+        except OSError:
+            pass
+
+
+class TrendRing:
+    """
+    Fixed-size on-disk ring buffer of per-tier hit counts for the last `window` assistant
+    turns of one session. Decayed per-tier sums are kept in the header and updated
+    incrementally (add the new turn, subtract the one leaving the window), so recording
+    a turn touches one slot and the header regardless of how long the session is.
+    """
+
+    MAGIC = b"ASR1"
+    # magic, window, head, filled, last counted record offset, decay, decayed sums per tier
+    HEADER_FORMAT = "<4sHHHqd3d"
+    SLOT_FORMAT = "<3H"  # Hit counts per tier for one turn
+
+    def __init__(self, session_id: str, window: int, decay: float):
+        self.path = self.path_for(session_id)
+        self.window = window
+        self.decay = decay
+
+    @staticmethod
+    def path_for(session_id: str) -> str:
+        """Return the ring file of a session (ids that are not filename-safe are hashed)."""
+        if not session_id or not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", session_id):
+            session_id = f"{zlib.crc32(session_id.encode('utf-8')):08x}"
+        return os.path.join(STATE_DIR, "trends", f"{session_id}.ring")
+
+    @classmethod
+    def remove(cls, session_id: str) -> None:
+        """Delete a session's ring (called when the session index evicts it)."""
+        try:
+            os.remove(cls.path_for(session_id))
+        except OSError:
+            pass
+
+    def record(self, turn_offset: int | None, counts: list[int]) -> list[float]:
+        """
+        Add one turn's per-tier hit counts (in TREND_LEVELS order) and return the decayed
+        per-tier sums over the window. A turn whose record offset was already counted
+        (the same response evaluated again) leaves the ring unchanged.
+        """
+        import struct
+
+        header_size = struct.calcsize(self.HEADER_FORMAT)
+        slot_size = struct.calcsize(self.SLOT_FORMAT)
+        file_size = header_size + self.window * slot_size
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            data = os.read(fd, file_size)
+            header = struct.unpack_from(self.HEADER_FORMAT, data) if len(data) == file_size else None
+            if header is None or header[0] != self.MAGIC or header[1] != self.window or header[5] != self.decay:
+                # New session, or the window/decay settings changed: start an empty ring
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, file_size)
+                header = (self.MAGIC, self.window, 0, 0, -1, self.decay, 0.0, 0.0, 0.0)
+            _, _, head, filled, last_offset, _, *sums = header
+
+            if turn_offset is not None and turn_offset == last_offset:
+                return sums
+
+            leaving = struct.unpack_from(self.SLOT_FORMAT, data, header_size + head * slot_size) \
+                if filled == self.window else (0, 0, 0)
+            factor = self.decay ** self.window
+            sums = [max(0.0, self.decay * total + count - factor * old)
+                    for total, count, old in zip(sums, counts, leaving)]
+
+            os.lseek(fd, header_size + head * slot_size, os.SEEK_SET)
+            os.write(fd, struct.pack(self.SLOT_FORMAT, *(min(count, 0xFFFF) for count in counts)))
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, struct.pack(self.HEADER_FORMAT, self.MAGIC, self.window, (head + 1) % self.window,
+                                     min(filled + 1, self.window),
+                                     turn_offset if turn_offset is not None else -1, self.decay, *sums))
+            return sums
+        finally:
+            os.close(fd)
+
+
+def extract_claude_response(messages: list[dict]) -> str:
     """Extract the most recent Claude response from messages."""
     # Look for the last assistant message
     for message in reversed(messages):
@@ -158,143 +854,1092 @@ def extract_claude_response(messages: List[Dict]) -> str:
     return ""
 
 
+# A "simple" pattern is a plain phrase: literals, escaped punctuation and bracket
+# classes, optionally anchored with a leading ^. These are merged into a prefix trie.
+_SIMPLE_ATOM = re.compile(r"\[[^\]\\]*\]|\\[^A-Za-z0-9]|[^\\\[\]().*+?{}|^$]")
+_TRIE_END = ''
+PREFILTER_MAX_VARIANTS = 16  # Spellings a bracket-class phrase may expand to before the pre-filter is dropped
+PREFILTER_MIN_WORD = 5  # Shorter words ("put" is in "output") never serve as keywords
+# Words too frequent in ordinary responses to gate on; a phrase with no other word is checked whole
+PREFILTER_COMMON_WORDS = frozenset("""
+    about catch completely correct could entirely exactly great helpful identified makes point question
+    really right sense thank thanks there think thinking totally understand useful which would
+""".split())
+
+
+def _pattern_atoms(pattern: str) -> list[str] | None:
+    """Split a simple pattern into lowercase atoms, or return None if it needs the full regex engine."""
+    anchored = pattern.startswith('^')
+    body = pattern[1:] if anchored else pattern
+    atoms = _SIMPLE_ATOM.findall(body)
+    if ''.join(atoms) != body or not atoms:
+        return None
+    atoms = [atom if atom.startswith('\\') else atom.lower() for atom in atoms]
+    return (['^'] if anchored else []) + atoms
+
+
+def _pattern_literals(pattern: str) -> list[str] | None:
+    """
+    Spell out every lowercase string a simple pattern matches, expanding its bracket
+    classes; a line-start anchor becomes a leading newline. None if the pattern is not
+    simple, has a range or negated class, or has more than PREFILTER_MAX_VARIANTS spellings.
+    """
+    atoms = _pattern_atoms(pattern)
+    if atoms is None:
+        return None
+    literals = ['\n'] if atoms[0] == '^' else ['']
+    for atom in atoms[1:] if atoms[0] == '^' else atoms:
+        if atom.startswith('['):
+            members = atom[1:-1]
+            if not members or members.startswith('^') or '-' in members[1:-1]:
+                return None
+            choices = sorted(set(members.lower()))
+        else:
+            choices = [atom[-1]]
+        literals = [literal + choice for literal in literals for choice in choices]
+        if len(literals) > PREFILTER_MAX_VARIANTS:
+            return None
+    return literals
+
+
+def _pattern_words(literal: str) -> list[str]:
+    """Split a spelled-out phrase into its runs of letters and digits."""
+    return re.findall(r"[^\W_]+", literal)
+
+
+def prefilter_keywords(patterns: list[str]) -> list[str]:
+    """
+    Choose keywords such that every pattern contains at least one of them, so lowercased
+    text containing none of them cannot match any pattern. Distinctive words (at least
+    PREFILTER_MIN_WORD long and not in PREFILTER_COMMON_WORDS) are picked greedily by how
+    many patterns they cover; a pattern without one ("that makes sense") and every
+    line-anchored pattern ("^good point", kept as "\\ngood point") contribute their whole
+    phrase, in every spelling. Returns [] (no pre-filtering) when a pattern uses regex
+    syntax the keywords cannot be derived from.
+    """
+    coverage: dict[str, set[int]] = {}
+    keywords = set()
+    for index, pattern in enumerate(patterns):
+        literals = _pattern_literals(pattern)
+        if not literals:
+            return []
+        if literals[0].startswith('\n'):
+            keywords.update(literals)  # Checked only at line starts, which is cheap and precise
+            continue
+        # Words common to every spelling; the first and last may be parts of longer words
+        words = set(_pattern_words(literals[0])).intersection(*(_pattern_words(lit) for lit in literals[1:]))
+        distinctive = {word for word in words - PREFILTER_COMMON_WORDS if len(word) >= PREFILTER_MIN_WORD}
+        if not distinctive:
+            keywords.update(literals)
+        for word in distinctive:
+            coverage.setdefault(word, set()).add(index)
+
+    uncovered = set().union(*coverage.values()) if coverage else set()
+    while uncovered:
+        best = max(sorted(coverage), key=lambda word: (len(coverage[word] & uncovered), len(word)))
+        keywords.add(best)
+        uncovered -= coverage.pop(best)
+
+    # A keyword containing another one adds nothing
+    return [keyword for keyword in sorted(keywords)
+            if not any(other != keyword and other in keyword for other in keywords)]
+
+
+def _alternation_source(patterns: list[str]) -> str:
+    """
+    Build one regex source matching any of the patterns against lowercased text.
+    Simple patterns are factored into a prefix trie so the engine tests each
+    position against a handful of branches instead of every phrase.
+    """
+    trie: dict[str, dict] = {}
+    complex_patterns = []
+    for pattern in patterns:
+        atoms = _pattern_atoms(pattern)
+        if atoms is None:
+            complex_patterns.append(f"(?i:{pattern})")
+            continue
+        node = trie
+        for atom in atoms:
+            node = node.setdefault(atom, {})
+        node[_TRIE_END] = {}
+
+    def emit(node: dict[str, dict]) -> str:
+        branches = [atom + emit(child) for atom, child in node.items() if atom != _TRIE_END]
+        if not branches:
+            return ''
+        if _TRIE_END in node:
+            return f"(?:{'|'.join(branches)})?"
+        if len(branches) == 1:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})"
+
+    alternatives = ([emit(trie)] if trie else []) + complex_patterns
+    return '|'.join(alternatives)
+
+
+class SycophancyMatcher:
+    """
+    Each confidence tier compiled once into its own alternation, so one scan per
+    tier returns every hit of that tier. A phrase inside a stronger one ("absolutely"
+    in "absolutely brilliant") is still reported by its own tier.
+    Responses containing none of the prefilter keywords skip the scans entirely.
+    """
+
+    def __init__(self, phrases: dict[str, list[str]], legitimate: list[str], levels: list[str],
+                 sources: dict[str, str] | None = None, legitimate_source: str | None = None,
+                 keywords: list[str] | None = None):
+        self.phrases = phrases
+        self.levels = list(levels)
+        patterns = [p for level in self.levels for p in phrases.get(level, [])]
+        if sources is None:
+            sources = {level: _alternation_source(phrases.get(level, [])) for level in self.levels}
+        if legitimate_source is None:
+            legitimate_source = _alternation_source(legitimate)
+        if keywords is None:
+            keywords = prefilter_keywords(patterns)
+        self.sources = sources
+        self.legitimate_source = legitimate_source
+        self.keywords = keywords
+        # Line-anchored phrases (stored with a leading newline) are only compared at line starts
+        self._line_starts = tuple(keyword[1:] for keyword in keywords if keyword.startswith('\n'))
+        self._anywhere = [keyword for keyword in keywords if not keyword.startswith('\n')]
+        self.patterns = [(level, re.compile(sources[level], re.MULTILINE))
+                         for level in self.levels if sources.get(level)]
+        self.legitimate = re.compile(self.legitimate_source) if self.legitimate_source else None
+
+    def spec(self) -> dict:
+        """Return the assembled regex sources in a JSON-serializable form for the detector cache."""
+        return {
+            "levels": self.levels,
+            "sources": self.sources,
+            "legitimate_source": self.legitimate_source,
+            "keywords": self.keywords
+        }
+
+    @staticmethod
+    def _fold(text: str) -> tuple[str, int]:
+        """Lowercase text for matching; fall back to IGNORECASE when lowering shifts offsets."""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered, 0
+        return text, re.IGNORECASE
+
+    def may_match(self, subject: str) -> bool:
+        """Cheap pre-filter on lowercased text: False means no pattern can match it."""
+        if not self.keywords:
+            return True
+        for keyword in self._anywhere:
+            if keyword in subject:
+                return True
+        if self._line_starts:
+            for line in subject.split('\n'):
+                if line.startswith(self._line_starts):
+                    return True
+        return False
+
+    def scan(self, text: str) -> list[tuple[str, str, int, int]]:
+        """Return (matched_text, confidence_level, start, end) for every hit, strongest tier first."""
+        if not self.patterns:
+            return []
+        subject, flags = self._fold(text)
+        if not flags and not self.may_match(subject):
+            return []
+        hits = []
+        for level, pattern in self.patterns:
+            if flags:
+                pattern = re.compile(pattern.pattern, re.MULTILINE | flags)
+            for match in pattern.finditer(subject):
+                if match.start() == match.end():
+                    continue
+                hits.append((text[match.start():match.end()], level, match.start(), match.end()))
+        return hits
+
+    def is_legitimate(self, text: str) -> bool:
+        """Check whether the text contains an allowlisted agreement phrase."""
+        if not self.legitimate:
+            return False
+        subject, flags = self._fold(text)
+        pattern = re.compile(self.legitimate_source, flags) if flags else self.legitimate
+        return pattern.search(subject) is not None
+
+
+_MATCHERS: dict[str, SycophancyMatcher] = {}
+_DETECTOR: dict | None = None  # {"sources", "referenced", "rules", "specs"}, mirrored in the detector cache
+
+
+def _source_stamp(path: str) -> list:
+    """Return [path, mtime_ns, size] for a rule source; a missing file stamps as [path, None, None]."""
+    try:
+        stat = os.stat(path)
+        return [path, stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return [path, None, None]
+
+
+def _rule_pack_files() -> list[str]:
+    """Return the JSON rule packs in RULES_DIR, in the order they are applied."""
+    try:
+        names = sorted(name for name in os.listdir(RULES_DIR) if name.endswith(".json"))
+    except OSError:
+        return []
+    return [os.path.join(RULES_DIR, name) for name in names]
+
+
+def _rule_sources(referenced: list[str]) -> list[list]:
+    """Stamp every file the rules depend on: the metadata file, RULES_DIR packs and packs it references."""
+    return [_source_stamp(path) for path in [METADATA_FILE] + _rule_pack_files() + list(referenced)]
+
+
+def _read_rule_file(path: str) -> dict | None:
+    """Read one JSON object, warning on stderr (never failing the hook) when it is unusable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"anti_sycophant: ignoring rule pack {path}: {e}", file=sys.stderr)
+        return None
+    if not isinstance(data, dict):
+        print(f"anti_sycophant: ignoring rule pack {path}: not a JSON object", file=sys.stderr)
+        return None
+    return data
+
+
+def load_rule_packs() -> tuple[list[tuple[str, dict]], list[str]]:
+    """
+    Collect rule packs in the order they apply: RULES_DIR/*.json by name, then the files
+    listed in the metadata's hook_config.anti_sycophant.rule_packs, then that inline config.
+    Returns (packs as (origin, pack), referenced_files).
+    """
+    packs = []
+    for path in _rule_pack_files():
+        pack = _read_rule_file(path)
+        if pack is not None:
+            packs.append((path, pack))
+
+    referenced = []
+    if os.path.exists(METADATA_FILE):
+        metadata = _read_rule_file(METADATA_FILE) or {}
+        hook_config = metadata.get("hook_config")
+        config = hook_config.get("anti_sycophant") if isinstance(hook_config, dict) else None
+        if isinstance(config, dict):
+            for path in config.get("rule_packs", []):
+                path = os.path.expanduser(str(path))
+                referenced.append(path)
+                pack = _read_rule_file(path)
+                if pack is not None:
+                    packs.append((path, pack))
+            packs.append((f"{METADATA_FILE} (hook_config.anti_sycophant)", config))
+    return packs, referenced
+
+
+def _valid_patterns(patterns, origin: str) -> list[str]:
+    """Keep the patterns that compile; report the rest without failing."""
+    if not isinstance(patterns, list):
+        print(f"anti_sycophant: {origin}: expected a list of patterns", file=sys.stderr)
+        return []
+    valid = []
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+        except (re.error, TypeError) as e:
+            print(f"anti_sycophant: {origin}: skipping pattern {pattern!r}: {e}", file=sys.stderr)
+            continue
+        valid.append(pattern)
+    return valid
+
+
+# Group references by number (\1, \g<1>, (?(1)...)) would point at another phrase's groups
+# once the patterns share one alternation
+_NUMBERED_GROUP_REFERENCE = re.compile(r"(?<!\\)(?:\\\\)*(?:\\[1-9]|\\g<\d+>)|\(\?\(\d+\)")
+
+
+def _combinable_patterns(patterns: list[str], origins: dict[str, str]) -> list[str]:
+    """
+    Keep the patterns that still work when spliced into one alternation with the others:
+    a global inline flag or a named group repeated across packs compiles on its own but
+    not combined. Reports the rest without failing.
+    """
+    def skip(pattern: str, reason) -> None:
+        print(f"anti_sycophant: {origins.get(pattern, 'rules')}: skipping pattern {pattern!r}: {reason}",
+              file=sys.stderr)
+
+    kept = []
+    for pattern in patterns:
+        if _NUMBERED_GROUP_REFERENCE.search(pattern):
+            skip(pattern, "numbered group references are not supported, use (?P<name>...) and (?P=name)")
+        else:
+            kept.append(pattern)
+    try:
+        re.compile(_alternation_source(kept), re.MULTILINE)
+        return kept
+    except re.error:
+        pass
+
+    # Find the offenders by growing the alternation one pattern at a time
+    accepted = []
+    for pattern in kept:
+        try:
+            re.compile(_alternation_source(accepted + [pattern]), re.MULTILINE)
+        except re.error as e:
+            skip(pattern, f"{e} when combined with the other phrases")
+            continue
+        accepted.append(pattern)
+    return accepted
+
+
+def merge_rule_packs(packs: list[tuple[str, dict]]) -> dict:
+    """
+    Merge rule packs over the built-in tables. Phrase lists are appended (duplicates
+    dropped); `block_and_revise`, `sensitivity`, `notifier`, the `trend_*` settings and
+    `telemetry` are overridden by the last pack setting them; `"reset_phrases": true` discards
+    the phrases accumulated before that pack. Patterns that break the combined matcher
+    are dropped with a warning.
+    """
+    phrases = {level: list(patterns) for level, patterns in SYCOPHANTIC_PHRASES.items()}
+    origins: dict[str, str] = {}  # Pack that first added each pattern, for warnings
+    legitimate = list(LEGITIMATE_PHRASES)
+    block_and_revise = BLOCK_AND_REVISE
+    telemetry = TELEMETRY
+    sensitivity = SENSITIVITY
+    notifier = NOTIFIER
+    trend = {"trend_window": TREND_WINDOW, "trend_decay": TREND_DECAY, "trend_threshold": TREND_THRESHOLD}
+    trend_limits = {"trend_window": (0, 1000), "trend_decay": (0.01, 1.0), "trend_threshold": (0.01, 1e6)}
+
+    for origin, pack in packs:
+        if pack.get("reset_phrases"):
+            phrases = {level: [] for level in SYCOPHANTIC_PHRASES}
+            legitimate = []
+        if isinstance(pack.get("block_and_revise"), bool):
+            block_and_revise = pack["block_and_revise"]
+        if isinstance(pack.get("telemetry"), bool):
+            telemetry = pack["telemetry"]
+        if "sensitivity" in pack:
+            if pack["sensitivity"] in SENSITIVITY_LEVELS:
+                sensitivity = pack["sensitivity"]
+            else:
+                print(f"anti_sycophant: {origin}: unknown sensitivity {pack['sensitivity']!r}", file=sys.stderr)
+        if "notifier" in pack:
+            if pack["notifier"] in NOTIFIERS:
+                notifier = pack["notifier"]
+            else:
+                print(f"anti_sycophant: {origin}: unknown notifier {pack['notifier']!r}", file=sys.stderr)
+        for key, (low, high) in trend_limits.items():
+            if key not in pack:
+                continue
+            value = pack[key]
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and low <= value <= high:
+                trend[key] = int(value) if key == "trend_window" else float(value)
+            else:
+                print(f"anti_sycophant: {origin}: {key} must be between {low} and {high}", file=sys.stderr)
+        for level, patterns in (pack.get("phrases") or {}).items():
+            if level not in phrases:
+                print(f"anti_sycophant: {origin}: unknown confidence level {level!r}", file=sys.stderr)
+                continue
+            for pattern in _valid_patterns(patterns, origin):
+                origins.setdefault(pattern, origin)
+                phrases[level].append(pattern)
+        for pattern in _valid_patterns(pack.get("legitimate_phrases", []), origin):
+            origins.setdefault(pattern, origin)
+            legitimate.append(pattern)
+
+    # Each tier is one alternation, and the allowlist another
+    return {
+        "phrases": {level: _combinable_patterns(list(dict.fromkeys(patterns)), origins)
+                    for level, patterns in phrases.items()},
+        "legitimate": _combinable_patterns(list(dict.fromkeys(legitimate)), origins),
+        "block_and_revise": block_and_revise,
+        "sensitivity": sensitivity,
+        "notifier": notifier,
+        "telemetry": telemetry,
+        **trend
+    }
+
+
+def _detector_cache_path() -> str:
+    """Return the detector cache file, keyed by a hash of the built-in tables and defaults."""
+    tables = json.dumps(
+        [DETECTOR_CACHE_VERSION, SYCOPHANTIC_PHRASES, LEGITIMATE_PHRASES, SENSITIVITY_LEVELS,
+         BLOCK_AND_REVISE, SENSITIVITY, NOTIFIER, TELEMETRY, TREND_WINDOW, TREND_DECAY, TREND_THRESHOLD,
+         RULES_DIR, METADATA_FILE],
+        sort_keys=True
+    )
+    # crc32 instead of hashlib: importing hashlib costs more than rebuilding the detector
+    key = f"{zlib.crc32(tables.encode('utf-8')):08x}"
+    return os.path.join(STATE_DIR, f"detector-{key}.json")
+
+
+def load_detector_cache() -> dict:
+    """Load the cached merged rules and detector specs; empty if missing or unreadable."""
+    if not USE_DETECTOR_CACHE:
+        return {}
+    try:
+        with open(_detector_cache_path(), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_detector_cache(detector: dict) -> None:
+    """Atomically write the merged rules and detector specs, dropping caches built from older tables."""
+    if not USE_DETECTOR_CACHE:
+        return
+    cache_path = _detector_cache_path()
+    try:
+        _write_json_atomic(cache_path, detector)
+        for name in os.listdir(STATE_DIR):
+            if name.startswith("detector-") and name.endswith(".json") and name != os.path.basename(cache_path):
+                os.remove(os.path.join(STATE_DIR, name))
+    except OSError:
+        pass  # The cache is an optimization; never fail the hook over it
+
+
+def _get_detector() -> dict:
+    """Return the merged rules and specs, rebuilding them only when a rule source changed."""
+    global _DETECTOR
+    if _DETECTOR is None:
+        cache = load_detector_cache()
+        if (isinstance(cache.get("rules"), dict) and isinstance(cache.get("specs"), dict)
+                and _rule_sources(cache.get("referenced", [])) == cache.get("sources")):
+            _DETECTOR = cache
+        else:
+            packs, referenced = load_rule_packs()
+            _DETECTOR = {
+                "sources": _rule_sources(referenced),
+                "referenced": referenced,
+                "rules": merge_rule_packs(packs),
+                "specs": {}
+            }
+            save_detector_cache(_DETECTOR)
+    return _DETECTOR
+
+
+def get_rules() -> dict:
+    """
+    Return the merged rules: {"phrases", "legitimate", "block_and_revise", "sensitivity",
+    "notifier", "telemetry", "trend_window", "trend_decay", "trend_threshold"}.
+    """
+    return _get_detector()["rules"]
+
+
+def rules_changed() -> bool:
+    """Check whether a rule pack or the metadata changed since the rules were loaded."""
+    return _DETECTOR is not None and _rule_sources(_DETECTOR["referenced"]) != _DETECTOR["sources"]
+
+
+def reset_detector() -> None:
+    """Forget the loaded rules and compiled matchers so the next lookup reloads them."""
+    global _DETECTOR
+    _DETECTOR = None
+    _MATCHERS.clear()
+
+
+def get_matcher(sensitivity: str | None = None) -> SycophancyMatcher:
+    """Return the compiled matcher for a sensitivity level, reusing the on-disk cache when valid."""
+    detector = _get_detector()
+    rules = detector["rules"]
+    sensitivity = sensitivity or rules["sensitivity"]
+    matcher = _MATCHERS.get(sensitivity)
+    if matcher is not None:
+        return matcher
+
+    levels = SENSITIVITY_LEVELS.get(sensitivity, SENSITIVITY_LEVELS["low"])
+    spec = detector["specs"].get(sensitivity)
+
+    if spec and spec.get("levels") == levels:
+        matcher = SycophancyMatcher(rules["phrases"], rules["legitimate"], levels,
+                                    spec.get("sources"), spec.get("legitimate_source"), spec.get("keywords"))
+    else:
+        matcher = SycophancyMatcher(rules["phrases"], rules["legitimate"], levels)
+        detector["specs"][sensitivity] = matcher.spec()
+        save_detector_cache(detector)
+
+    _MATCHERS[sensitivity] = matcher
+    return matcher
+
+
+def _is_quoted(text: str, start: int, end: int) -> bool:
+    """Check if the match is wrapped in quotes (might be quoting someone)."""
+    before = text[start - 1:start]
+    return before in ('"', "'") and text[end:end + 1] == before
+
+
+def _is_negated(text: str, start: int, lower_bound: int = 0) -> bool:
+    """Check if the match is directly preceded by "not", "don't think" or "wouldn't say"."""
+    window_start = max(lower_bound, start - NEGATION_WINDOW)
+    return NEGATION_PATTERN.search(text[window_start:start]) is not None
+
+
+class ResponseContext:
+    """
+    Sentence boundaries of one response, found in a single pass, so the allowlist and
+    negation checks for each match only look at the text around it. Allowlist results
+    are cached per window, so several matches in one sentence cost a single search.
+    """
+
+    def __init__(self, text: str, matcher: SycophancyMatcher):
+        self.text = text
+        self.matcher = matcher
+        self.ends = [match.end() for match in SENTENCE_BOUNDARY.finditer(text)]
+        self._legitimate: dict[tuple[int, int], bool] = {}
+
+    def sentence_start(self, position: int) -> int:
+        """Return the offset where the sentence containing `position` begins."""
+        index = bisect_right(self.ends, position)
+        return self.ends[index - 1] if index else 0
+
+    def _sentence_end(self, position: int, following: int = 0) -> int:
+        """Return the end of the sentence containing `position`, or of the `following`-th after it."""
+        index = bisect_left(self.ends, position) + following
+        return self.ends[index] if index < len(self.ends) else len(self.text)
+
+    def is_legitimate(self, start: int, end: int) -> bool:
+        """
+        Check for an allowlisted phrase in the match's sentence or the one after it
+        ("You're right. The formula is correct."), at most LEGITIMATE_WINDOW characters away.
+        """
+        window = (max(self.sentence_start(start), start - LEGITIMATE_WINDOW),
+                  min(self._sentence_end(end, following=1), end + LEGITIMATE_WINDOW))
+        legitimate = self._legitimate.get(window)
+        if legitimate is None:
+            legitimate = self.matcher.is_legitimate(self.text[window[0]:window[1]])
+            self._legitimate[window] = legitimate
+        return legitimate
+
+    def is_negated(self, start: int) -> bool:
+        """Check for a negation directly before the match, within its sentence."""
+        return _is_negated(self.text, start, self.sentence_start(start))
+
+
 def check_for_legitimate_context(text: str, phrase_match: str) -> bool:
     """Check if the matched phrase appears to be in a legitimate context."""
-    # Check if it's part of a legitimate agreement
-    for legitimate in LEGITIMATE_PHRASES:
-        if re.search(legitimate, text, re.IGNORECASE):
-            return True
-    
-    # Check if it's in quotes (might be quoting someone)
-    if f'"{phrase_match}"' in text or f"'{phrase_match}'" in text:
-        return True
-    
-    # Check if it's preceded by "not" or "don't think"
-    negation_patterns = [
-        r"not\s+" + re.escape(phrase_match),
-        r"don[''']t\s+think\s+" + re.escape(phrase_match),
-        r"wouldn[''']t\s+say\s+" + re.escape(phrase_match)
-    ]
-    for pattern in negation_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
+    context = ResponseContext(text, get_matcher())
+
+    # Check each occurrence: quoted, negated, or next to an allowlisted phrase
+    start = text.find(phrase_match)
+    while start != -1:
+        end = start + len(phrase_match)
+        if _is_quoted(text, start, end) or context.is_negated(start) or context.is_legitimate(start, end):
             return True
-    
+        start = text.find(phrase_match, start + 1)
+
     return False
 
 
-def detect_sycophantic_language(text: str) -> Tuple[bool, List[str], str]:
+def find_sycophantic_hits(text: str, sensitivity: str | None = None) -> list[tuple[str, str]]:
+    """Return (matched_phrase, confidence_level) for every hit not in a legitimate context."""
+    if not text:
+        return []
+
+    matcher = get_matcher(sensitivity)
+    hits = matcher.scan(text)
+    if not hits:
+        return []
+
+    # Context checks are scoped to each match's sentence, so an allowlisted phrase
+    # elsewhere in a long response no longer suppresses every match
+    context = ResponseContext(text, matcher)
+    return [
+        (matched_text, confidence_level)
+        for matched_text, confidence_level, start, end in hits
+        if not (_is_quoted(text, start, end) or context.is_negated(start) or context.is_legitimate(start, end))
+    ]
+
+
+def detect_sycophantic_language(text: str, sensitivity: str | None = None) -> tuple[bool, list[str], str]:
     """
     Detect sycophantic language in text.
     Returns: (is_sycophantic, matched_phrases, confidence_level)
     """
-    if not text:
-        return False, [], ""
-    
-    matched_phrases = []
-    highest_confidence = ""
-    
-    # Check each confidence level based on sensitivity setting
-    levels_to_check = []
-    if SENSITIVITY == "high":
-        levels_to_check = ["high_confidence", "medium_confidence", "low_confidence"]
-    elif SENSITIVITY == "medium":
-        levels_to_check = ["high_confidence", "medium_confidence"]
-    else:  # low
-        levels_to_check = ["high_confidence"]
-    
-    for confidence_level in levels_to_check:
-        for pattern in SYCOPHANTIC_PHRASES[confidence_level]:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-            for match in matches:
-                matched_text = match.group(0)
-                # Check if this is in a legitimate context
-                if not check_for_legitimate_context(text, matched_text):
-                    matched_phrases.append(matched_text)
-                    if not highest_confidence:
-                        highest_confidence = confidence_level
-    
+    hits = find_sycophantic_hits(text, sensitivity)
+    matched_phrases = [phrase for phrase, _ in hits]
+    found_levels = {level for _, level in hits}
+
+    # Report the strongest confidence level that produced a hit
+    levels = get_matcher(sensitivity).levels if hits else []
+    highest_confidence = next((level for level in levels if level in found_levels), "")
+
     return len(matched_phrases) > 0, matched_phrases, highest_confidence
 
 
-def main():
-    """Main hook function."""
+def _notification_command(message: str) -> list[str]:
+    """Build the platform's desktop notification command."""
+    if sys.platform == "darwin":
+        escaped = message.replace('\\', '\\\\').replace('"', '\\"')
+        return ['osascript', '-e', f'display notification "{escaped}" with title "Claude Code Hook"']
+    return ['notify-send', '--app-name=Claude Code', 'Claude Code Hook', message]
+
+
+def send_notification(message: str, notifier: str | None = None) -> None:
+    """
+    Deliver a notification through the configured backend; callers emit the decision first.
+    "detached" starts the notifier as an independent child and returns immediately,
+    "desktop" waits (up to a second) for it, and "none" does nothing. Fails silently.
+    """
+    notifier = notifier or get_rules()["notifier"]
+    if notifier not in ("detached", "desktop"):
+        return
+
+    import subprocess
+    command = _notification_command(message)
     try:
-        # Read input from Claude Code
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON input: {e}", file=sys.stderr)
-        sys.exit(1)
-    
-    
+        if notifier == "detached":
+            subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, start_new_session=True, close_fds=True)
+        else:
+            subprocess.run(command, capture_output=True, timeout=1)
+    except Exception:
+        pass  # Fail silently if notification doesn't work
+
+
+def evaluate_stop_event(input_data: dict, sessions: SessionIndex | None = None) -> dict:
+    """
+    Evaluate one Stop event without writing output or exiting, so the same logic
+    serves the in-process hook and the resident daemon.
+    `sessions` holds the transcript cursors kept between events.
+    Returns {"exit_code", "stdout", "stderr", "notification", "telemetry"}; the
+    telemetry entry is completed by record_telemetry() once the output is written.
+    """
     # Extract relevant information
     transcript_path = input_data.get('transcript_path', '')
     session_id = input_data.get('session_id', '')
     stop_hook_active = input_data.get('stop_hook_active', False)
-    
+
+    started = perf_counter_ns()
+    _READ_STATS.update(bytes_read=0, records_parsed=0, extract_ns=0)
+    telemetry = {"session": session_id, "decision": "skip", "bytes_read": 0, "records_parsed": 0,
+                 "matches": 0, "load_us": 0, "extract_us": 0, "detect_us": 0}
+    result = {"exit_code": 0, "stdout": "", "stderr": "", "notification": None, "telemetry": telemetry}
+
     # Don't run if we're already in a stop hook loop
     if stop_hook_active:
-        sys.exit(0)
-    
-    # Load and analyze transcript
-    messages = load_transcript(transcript_path)
-    if not messages:
-        sys.exit(0)
-    
-    # Get Claude's latest response
-    claude_response = extract_claude_response(messages)
-    
-    
+        return result
+
+    # Find the latest assistant response, parsing only what changed since the last event
+    cursor = sessions.get(session_id) if sessions is not None else None
+    try:
+        claude_response, cursor = find_latest_assistant_response(transcript_path, cursor)
+    except Exception as e:
+        telemetry["decision"] = "error"
+        result["stderr"] = f"Error loading transcript: {e}\n"
+        return result
+    if sessions is not None and session_id and cursor:
+        for evicted_id in sessions.put(session_id, cursor):
+            TrendRing.remove(evicted_id)
+
+    # Decoding records is reported as extraction; the rest of the transcript work as loading
+    loaded = perf_counter_ns()
+    telemetry.update(
+        decision="none",
+        bytes_read=_READ_STATS["bytes_read"],
+        records_parsed=_READ_STATS["records_parsed"],
+        load_us=(loaded - started - _READ_STATS["extract_ns"]) // 1000,
+        extract_us=_READ_STATS["extract_ns"] // 1000
+    )
+
     if not claude_response:
-        sys.exit(0)
-    
+        return result
+
     # Check for sycophantic language
-    is_sycophantic, matched_phrases, confidence = detect_sycophantic_language(claude_response)
-    
-    
-    if is_sycophantic:
-        
-        if BLOCK_AND_REVISE:
-            # Create feedback for Claude
-            phrases_list = "\n  - ".join(matched_phrases)
-            
-            # Add visible notification
-            import subprocess
-            try:
-                # Send notification to terminal (works on macOS)
-                subprocess.run(['osascript', '-e', f'display notification "Anti-sycophant hook triggered: {matched_phrases[0]}" with title "Claude Code Hook"'], 
-                             capture_output=True, timeout=1)
-            except:
-                pass  # Fail silently if notification doesn't work
-            
-            output = {
-                "decision": "block",
-                "reason": (
-                    "🚫 ANTI-SYCOPHANT HOOK ACTIVATED\n"
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                    f"Detected phrases: {', '.join(matched_phrases)}\n"
-                    f"Confidence level: {confidence}\n"
-                    f"Timestamp: {datetime.now().strftime('%H:%M:%S')}\n"
-                    "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-                    "⚠️ BEHAVIORAL CORRECTION: Your response contained sycophantic language. "
-                    "Please revise your response to:\n"
-                    "1. Focus on technical accuracy and facts\n"
-                    "2. Provide objective analysis without excessive agreement\n"
-                    "3. Maintain a professional, analytical tone\n\n"
-                    "Revise your response without sycophantic language."
-                )
-            }
-            
-            print(json.dumps(output))
-            sys.exit(0)
+    rules = get_rules()
+    hits = find_sycophantic_hits(claude_response)
+
+    # Multi-turn scoring: every new turn (clean ones too) enters the session's ring
+    trend_score = None
+    if rules["trend_window"] and session_id:
+        counts = [sum(1 for _, level in hits if level == tier) for tier in TREND_LEVELS]
+        try:
+            ring = TrendRing(session_id, rules["trend_window"], rules["trend_decay"])
+            sums = ring.record(cursor.get('assistant_offset') if cursor else None, counts)
+            trend_score = sum(TREND_WEIGHTS[tier] * total for tier, total in zip(TREND_LEVELS, sums))
+        except OSError:
+            pass  # Without the ring, decide on this response alone
+
+    telemetry.update(decision="pass", matches=len(hits), detect_us=(perf_counter_ns() - loaded) // 1000)
+    if not hits:
+        return result
+
+    matched_phrases = [phrase for phrase, _ in hits]
+    found_levels = {level for _, level in hits}
+    confidence = next((level for level in get_matcher().levels if level in found_levels), "")
+    trend_note = "" if trend_score is None else (
+        f"Trend score: {trend_score:.2f} (threshold {rules['trend_threshold']:g}, "
+        f"last {rules['trend_window']} turns)\n"
+    )
+
+    if rules["block_and_revise"] and (trend_score is None or trend_score >= rules["trend_threshold"]):
+        from datetime import datetime
+
+        # Create feedback for Claude
+        output = {
+            "decision": "block",
+            "reason": (
+                "🚫 ANTI-SYCOPHANT HOOK ACTIVATED\n"
+                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+                f"Detected phrases: {', '.join(matched_phrases)}\n"
+                f"Confidence level: {confidence}\n"
+                f"{trend_note}"
+                f"Timestamp: {datetime.now().strftime('%H:%M:%S')}\n"
+                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
+                "⚠️ BEHAVIORAL CORRECTION: Your response contained sycophantic language. "
+                "Please revise your response to:\n"
+                "1. Focus on technical accuracy and facts\n"
+                "2. Provide objective analysis without excessive agreement\n"
+                "3. Maintain a professional, analytical tone\n\n"
+                "Revise your response without sycophantic language."
+            )
+        }
+        result["stdout"] = json.dumps(output) + "\n"
+        result["notification"] = f"Anti-sycophant hook triggered: {matched_phrases[0]}"
+        telemetry["decision"] = "block"
+    else:
+        # Just warn to stderr (visible in transcript mode)
+        result["stderr"] = f"⚠️ Sycophantic language detected: {', '.join(matched_phrases)}\n{trend_note}"
+        telemetry["decision"] = "warn"
+
+    return result
+
+
+def telemetry_enabled() -> bool:
+    """Check whether telemetry records are written (ANTI_SYCOPHANT_TELEMETRY=1 or a rule pack)."""
+    if os.environ.get("ANTI_SYCOPHANT_TELEMETRY") == "1":
+        return True
+    return get_rules()["telemetry"]
+
+
+def write_telemetry(record: dict, path: str | None = None) -> None:
+    """
+    Append one compact JSON line with a single O_APPEND write, so records from
+    concurrent hooks and the daemon never interleave. The file is rotated to `.1`
+    once it reaches TELEMETRY_MAX_BYTES.
+    """
+    path = path or TELEMETRY_FILE
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode('utf-8')
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        try:
+            fd = os.open(path, flags, 0o600)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, flags, 0o600)
+        try:
+            if os.fstat(fd).st_size >= TELEMETRY_MAX_BYTES:
+                # Writers still holding the old file append to the rotated copy, which is harmless
+                os.replace(path, f"{path}.1")
+                os.close(fd)
+                fd = os.open(path, flags, 0o600)
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass  # Telemetry must never fail the hook
+
+
+def record_telemetry(result: dict, source: str, started: int, emit_ns: int) -> None:
+    """
+    Complete an evaluated event's telemetry with the time spent writing its output
+    (`emit_ns`) and since `started` (a perf_counter_ns() value), then append it.
+    """
+    if not result.get("telemetry") or not telemetry_enabled():
+        return
+    record = {"ts": round(time(), 3), "source": source, **result["telemetry"],
+              "emit_us": emit_ns // 1000, "total_us": (perf_counter_ns() - started) // 1000}
+    write_telemetry(record)
+
+
+def main():
+    """Main hook function."""
+    started = perf_counter_ns()
+    try:
+        # Read input from Claude Code
+        input_data = json.load(sys.stdin)
+    except json.JSONDecodeError as e:
+        print(f"Error parsing JSON input: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    sessions = SessionIndex.load()
+    result = evaluate_stop_event(input_data, sessions)
+
+    # Emit the decision before any side effect
+    emit_start = perf_counter_ns()
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    sys.stdout.flush()
+    sys.stderr.flush()
+    emit_ns = perf_counter_ns() - emit_start
+
+    if result["notification"]:
+        send_notification(result["notification"])
+    sessions.save()
+    record_telemetry(result, "hook", started, emit_ns)
+    sys.exit(result["exit_code"])
+
+
+def iter_assistant_responses(transcript_path: str) -> Iterator[str]:
+    """Stream the text of every assistant response in a transcript, in file order."""
+    with open(transcript_path, 'rb') as f:
+        for line in f:
+            text = _decode_assistant_line(line)
+            if text:
+                yield text
+
+
+def scan_transcript(transcript_path: str, sensitivity: str | None = None) -> dict:
+    """Check every assistant response in one transcript; returns per-file counts."""
+    levels = get_matcher(sensitivity).levels
+    summary = {
+        "path": transcript_path,
+        "bytes": 0,
+        "messages": 0,
+        "flagged": 0,
+        "hits": {level: 0 for level in levels},
+        "error": None
+    }
+    try:
+        summary["bytes"] = os.path.getsize(transcript_path)
+        for text in iter_assistant_responses(transcript_path):
+            summary["messages"] += 1
+            hits = find_sycophantic_hits(text, sensitivity)
+            if hits:
+                summary["flagged"] += 1
+            for _, level in hits:
+                summary["hits"][level] += 1
+    except OSError as e:
+        summary["error"] = str(e)
+    return summary
+
+
+def _expand_transcript_paths(targets: list[str]) -> list[str]:
+    """Expand directories (recursively, *.jsonl) and glob patterns into transcript files."""
+    import glob
+
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            matches = glob.glob(os.path.join(target, "**", "*.jsonl"), recursive=True)
+        elif os.path.isfile(target):
+            matches = [target]
         else:
-            # Just warn to stderr (visible in transcript mode)
-            phrases_list = ", ".join(matched_phrases)
-            print(f"⚠️ Sycophantic language detected: {phrases_list}", file=sys.stderr)
-            sys.exit(0)
-    
-    # No sycophantic language detected
-    sys.exit(0)
+            matches = glob.glob(os.path.expanduser(target), recursive=True)
+        paths.extend(path for path in matches if os.path.isfile(path))
+    return sorted(set(paths))
+
+
+def scan_transcripts(targets: list[str], sensitivity: str | None = None, workers: int | None = None) -> int:
+    """
+    Audit archived transcripts with the same rules the hook enforces, checking every
+    assistant message (not just the last one) across a process pool.
+    Prints per-file hit counts, per-tier totals and throughput.
+    """
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    paths = _expand_transcript_paths(targets)
+    if not paths:
+        print("No transcripts found", file=sys.stderr)
+        return 1
+
+    sensitivity = sensitivity or get_rules()["sensitivity"]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    start = time.perf_counter()
+    if workers == 1:
+        results = [scan_transcript(path, sensitivity) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(scan_transcript, paths, [sensitivity] * len(paths),
+                                        chunksize=max(1, len(paths) // (workers * 4))))
+    elapsed = time.perf_counter() - start
+
+    levels = get_matcher(sensitivity).levels
+    totals = {level: 0 for level in levels}
+    print(f"{'hits':>6} {'flagged':>8} {'messages':>9}  transcript")
+    for summary in results:
+        if summary["error"]:
+            print(f"{'-':>6} {'-':>8} {'-':>9}  {summary['path']} ({summary['error']})")
+            continue
+        for level, count in summary["hits"].items():
+            totals[level] += count
+        print(f"{sum(summary['hits'].values()):>6} {summary['flagged']:>8} {summary['messages']:>9}  {summary['path']}")
+
+    total_bytes = sum(summary["bytes"] for summary in results)
+    total_messages = sum(summary["messages"] for summary in results)
+    total_flagged = sum(summary["flagged"] for summary in results)
+    megabytes = total_bytes / (1024 * 1024)
+
+    print(f"\nSensitivity: {sensitivity}")
+    for level in levels:
+        print(f"  {level:<18} {totals[level]:>8}")
+    print(f"Flagged messages: {total_flagged}/{total_messages}")
+    print(f"Scanned {len(results)} files, {megabytes:.1f} MB in {elapsed:.2f}s "
+          f"({megabytes / elapsed if elapsed else 0:.1f} MB/s, {workers} workers)")
+    return 0
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    # Rounding away float noise first keeps 0.28 * 25 at rank 7, not 8
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    return sorted_values[min(len(sorted_values) - 1, max(0, rank - 1))]
+
+
+def load_telemetry(path: str | None = None) -> list[dict]:
+    """Read telemetry records from the rotated file and the current one, oldest first."""
+    path = path or TELEMETRY_FILE
+    records = []
+    for candidate in (f"{path}.1", path):
+        try:
+            with open(candidate, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # A line cut short by a crash
+                    if isinstance(record, dict):
+                        records.append(record)
+        except OSError:
+            continue
+    return records
+
+
+def report_telemetry(path: str | None = None, budget_ms: float = HOOK_TIMEOUT_MS, since_hours: float | None = None) -> int:
+    """
+    Print per-stage latency percentiles from the telemetry file and how many events
+    finished within `budget_ms`; returns 1 if any event exceeded the budget.
+    """
+    records = load_telemetry(path)
+    if since_hours is not None:
+        cutoff = time() - since_hours * 3600
+        records = [record for record in records if record.get("ts", 0) >= cutoff]
+    if not records:
+        print(f"No telemetry records in {path or TELEMETRY_FILE} "
+              "(enable with ANTI_SYCOPHANT_TELEMETRY=1 or \"telemetry\": true in a rule pack)", file=sys.stderr)
+        return 1
+
+    def column(key: str) -> list:
+        return sorted(record[key] for record in records if isinstance(record.get(key), (int, float)))
+
+    sources: dict[str, int] = {}
+    decisions: dict[str, int] = {}
+    for record in records:
+        sources[record.get("source", "?")] = sources.get(record.get("source", "?"), 0) + 1
+        decisions[record.get("decision", "?")] = decisions.get(record.get("decision", "?"), 0) + 1
+
+    print(f"Events: {len(records)} ({', '.join(f'{name}: {count}' for name, count in sorted(sources.items()))})")
+    print(f"Decisions: {', '.join(f'{name}: {count}' for name, count in sorted(decisions.items()))}\n")
+    print(f"{'stage':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for stage in TELEMETRY_STAGES:
+        values = column(f"{stage}_us")
+        if values:
+            p50, p95, p99 = (_percentile(values, fraction) / 1000 for fraction in (0.50, 0.95, 0.99))
+            print(f"{stage:<16} {p50:>9.3f} {p95:>9.3f} {p99:>9.3f} {values[-1] / 1000:>9.3f}")
+    for key in ("bytes_read", "records_parsed", "matches"):
+        values = column(key)
+        if values:
+            print(f"{key:<16} {_percentile(values, 0.50):>9} {_percentile(values, 0.95):>9} "
+                  f"{_percentile(values, 0.99):>9} {values[-1]:>9}")
+
+    totals = column("total_us")
+    over_budget = sum(1 for value in totals if value >= budget_ms * 1000)
+    print(f"\nWithin the {budget_ms:g} ms budget: {len(totals) - over_budget}/{len(totals)}")
+    if over_budget:
+        print(f"❌ {over_budget} events exceeded the budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _parse_importtime(stderr: str) -> tuple[float, list[tuple[str, float]]]:
+    """Parse `-X importtime` output into total import ms and the slowest top-level imports."""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not name[1:].startswith(" "):  # Nested imports are indented under their parent
+            top_level.append((name.strip(), int(cumulative) / 1000))
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return sum(ms for _, ms in top_level), top_level[:5]
+
+
+def bench_startup(runs: int = 20) -> int:
+    """
+    Run the hook the way Claude Code does (a fresh interpreter with a Stop event on
+    stdin) and report wall time per invocation with and without the detector cache.
+    """
+    import subprocess
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        transcript_path = os.path.join(temp_dir, "transcript.jsonl")
+        with open(transcript_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"type": "user", "message": {"role": "user", "content": "Is the cache warm?"}}) + "\n")
+            f.write(json.dumps({"type": "assistant", "message": {"role": "assistant", "content": [
+                {"type": "text", "text": "You're absolutely right, the cache is warm."}
+            ]}}) + "\n")
+        event = json.dumps({"session_id": "bench-startup", "transcript_path": transcript_path})
+        command = [sys.executable, os.path.abspath(__file__)]
+
+        print(f"Hook startup benchmark ({runs} runs per mode)")
+        print(f"{'mode':<10} {'mean ms':>9} {'p50 ms':>9} {'min ms':>9} {'imports ms':>11}")
+        top_imports: list[tuple[str, float]] = []
+        for mode, overrides in (("cached", {}), ("uncached", {"ANTI_SYCOPHANT_NO_CACHE": "1"})):
+            env = dict(os.environ, ANTI_SYCOPHANT_STATE_DIR=os.path.join(temp_dir, "state"), **overrides)
+            subprocess.run(command, input=event, capture_output=True, text=True, env=env)  # Warm-up
+
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(command, input=event, capture_output=True, text=True, env=env)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+
+            traced = subprocess.run([sys.executable, "-X", "importtime"] + command[1:],
+                                    input=event, capture_output=True, text=True, env=env)
+            import_ms, slowest = _parse_importtime(traced.stderr)
+            if mode == "cached":
+                top_imports = slowest
+            print(f"{mode:<10} {sum(timings) / len(timings):>9.2f} {timings[len(timings) // 2]:>9.2f} "
+                  f"{timings[0]:>9.2f} {import_ms:>11.2f}")
+
+        print("\nSlowest top-level imports (cached mode):")
+        for name, ms in top_imports:
+            print(f"  {name:<30} {ms:>8.2f} ms")
+    return 0
+
+
+def run_command(argv: list[str]) -> int:
+    """Run a maintenance subcommand; the Stop hook itself is invoked without arguments."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="anti_sycophant.py", description="Anti-sycophant hook utilities")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bench_parser = subparsers.add_parser("bench-startup", help="Measure end-to-end hook wall time per invocation")
+    bench_parser.add_argument("--runs", type=int, default=20, help="Invocations per mode (default: 20)")
+
+    scan_parser = subparsers.add_parser("scan", help="Audit archived transcripts with the hook's rules")
+    scan_parser.add_argument("targets", nargs="+", help="Transcript files, directories or glob patterns")
+    scan_parser.add_argument("--sensitivity", choices=sorted(SENSITIVITY_LEVELS),
+                             help="Sensitivity level to apply (default: the configured one)")
+    scan_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+
+    telemetry_parser = subparsers.add_parser("telemetry", help="Report latency percentiles from hook telemetry")
+    telemetry_parser.add_argument("--file", help=f"Telemetry file (default: {TELEMETRY_FILE})")
+    telemetry_parser.add_argument("--budget-ms", type=float, default=HOOK_TIMEOUT_MS,
+                                  help=f"Per-event budget to check against (default: {HOOK_TIMEOUT_MS})")
+    telemetry_parser.add_argument("--since", type=float, metavar="HOURS", help="Only report the last HOURS hours")
+
+    args = parser.parse_args(argv)
+    if args.command == "bench-startup":
+        return bench_startup(args.runs)
+    if args.command == "scan":
+        return scan_transcripts(args.targets, args.sensitivity, args.workers)
+    if args.command == "telemetry":
+        return report_telemetry(args.file, args.budget_ms, args.since)
+    return 1
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_command(sys.argv[1:]))
     main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Anti-Sycophant Hook Client
+Forwards the Stop event to the resident detector daemon over a Unix socket and
+prints its decision, falling back to in-process detection when the daemon is down.
+Kept to the standard library's cheapest imports: this runs on every response.
+"""
+
+import os
+import socket
+import sys
+
+HOOK_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.environ.get("ANTI_SYCOPHANT_STATE_DIR") or os.path.join(HOOK_DIR, ".anti_sycophant")
+SOCKET_PATH = os.path.join(STATE_DIR, "daemon.sock")
+RESPONSE_TIMEOUT = 4.5  # Leaves headroom under the 5s Stop hook timeout
+
+# Transcript cursors for the in-process fallback, loaded on first use like the daemon's
+_sessions = None
+
+
+def forward(payload: bytes) -> tuple:
+    """Send the Stop event to the daemon; returns (exit_code, stdout, stderr) as bytes."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(RESPONSE_TIMEOUT)
+        client.connect(SOCKET_PATH)
+        client.sendall(payload)
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        client.close()
+
+    response = b''.join(chunks)
+    header, _, body = response.partition(b'\n')
+    exit_code, stdout_length = (int(field) for field in header.split())
+    return exit_code, body[:stdout_length], body[stdout_length:]
+
+
+def start_daemon(idle_timeout: str) -> None:
+    """Launch the daemon detached so the next Stop event can use it."""
+    import subprocess
+    daemon_path = os.path.join(HOOK_DIR, "anti_sycophant_daemon.py")
+    try:
+        subprocess.Popen(
+            [sys.executable, daemon_path, "--idle-timeout", idle_timeout],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True, close_fds=True
+        )
+    except OSError:
+        pass
+
+
+def run_in_process(payload: bytes) -> int:
+    """Evaluate the event with the regular hook logic in this process."""
+    global _sessions
+    sys.path.insert(0, HOOK_DIR)
+    import json
+    import anti_sycophant
+
+    started = anti_sycophant.perf_counter_ns()
+    try:
+        input_data = json.loads(payload)
+    except ValueError as e:
+        print(f"Error parsing JSON input: {e}", file=sys.stderr)
+        return 1
+
+    if _sessions is None:
+        _sessions = anti_sycophant.SessionIndex.load()
+    result = anti_sycophant.evaluate_stop_event(input_data, _sessions)
+    emit_start = anti_sycophant.perf_counter_ns()
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    sys.stdout.flush()
+    sys.stderr.flush()
+    emit_ns = anti_sycophant.perf_counter_ns() - emit_start
+    if result["notification"]:
+        anti_sycophant.send_notification(result["notification"])
+    _sessions.save()
+    anti_sycophant.record_telemetry(result, "client", started, emit_ns)
+    return result["exit_code"]
+
+
+def main():
+    """Client entry point: `anti_sycophant_client.py [--idle-timeout SECONDS] [--no-autostart]`."""
+    args = sys.argv[1:]
+    idle_timeout = args[args.index("--idle-timeout") + 1] if "--idle-timeout" in args[:-1] else "900"
+    autostart = "--no-autostart" not in args
+
+    payload = sys.stdin.buffer.read()
+    try:
+        exit_code, stdout, stderr = forward(payload)
+    except (OSError, ValueError):
+        if autostart:
+            start_daemon(idle_timeout)
+        sys.exit(run_in_process(payload))
+
+    sys.stdout.buffer.write(stdout)
+    sys.stderr.buffer.write(stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
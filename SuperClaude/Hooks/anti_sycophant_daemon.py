@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Anti-Sycophant Detector Daemon
+Keeps the compiled detector and the per-session transcript index in memory and
+answers Stop events forwarded by anti_sycophant_client.py over a Unix socket
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import anti_sycophant  # noqa: E402
+
+SOCKET_NAME = "daemon.sock"
+DEFAULT_IDLE_TIMEOUT = 900  # Seconds without a Stop event before the daemon exits
+REQUEST_TIMEOUT = 5         # Matches the Stop hook timeout configured in settings.json
+SHUTDOWN_REQUEST = {"request": "shutdown"}  # Sent by the installer before removing the hook
+
+
+def get_socket_path() -> str:
+    """Return the Unix socket path shared by the daemon and its client."""
+    return os.path.join(anti_sycophant.STATE_DIR, SOCKET_NAME)
+
+
+def _daemon_is_running(socket_path: str) -> bool:
+    """Check whether another daemon is already answering on the socket."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(0.5)
+        probe.connect(socket_path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def _receive_request(conn: socket.socket) -> bytes:
+    """Read the forwarded Stop event until the client shuts down its write side."""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def _encode_response(result: dict) -> bytes:
+    """Frame a hook result as '<exit_code> <stdout_bytes>\\n' followed by stdout and stderr."""
+    stdout = result["stdout"].encode('utf-8')
+    stderr = result["stderr"].encode('utf-8')
+    return f"{result['exit_code']} {len(stdout)}\n".encode('ascii') + stdout + stderr
+
+
+def serve(idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> int:
+    """Serve Stop events until idle for `idle_timeout` seconds (0 keeps it running)."""
+    socket_path = get_socket_path()
+    os.makedirs(anti_sycophant.STATE_DIR, exist_ok=True)
+
+    if os.path.exists(socket_path):
+        if _daemon_is_running(socket_path):
+            print(f"Daemon already running on {socket_path}", file=sys.stderr)
+            return 0
+        os.remove(socket_path)  # Stale socket left by a daemon that did not exit cleanly
+
+    # Restart when the hook script changes so edited phrase tables take effect
+    hook_path = os.path.abspath(anti_sycophant.__file__)
+    hook_mtime = os.stat(hook_path).st_mtime_ns
+
+    # Compile the detector and load the session index before accepting the first event
+    anti_sycophant.get_matcher()
+    sessions = anti_sycophant.SessionIndex.load()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(socket_path)
+        os.chmod(socket_path, 0o600)
+        server.listen(16)
+        server.settimeout(idle_timeout or None)
+
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break  # Idle shutdown
+
+            started = time.perf_counter_ns()
+            with conn:
+                conn.settimeout(REQUEST_TIMEOUT)
+                try:
+                    event = json.loads(_receive_request(conn))
+                    if event == SHUTDOWN_REQUEST:
+                        break  # The socket is removed on the way out; the requester waits for that
+                    result = anti_sycophant.evaluate_stop_event(event, sessions)
+                except Exception as e:
+                    result = {"exit_code": 0, "stdout": "", "stderr": f"anti_sycophant daemon error: {e}\n",
+                              "notification": None}
+                emit_start = time.perf_counter_ns()
+                try:
+                    conn.sendall(_encode_response(result))
+                except OSError:
+                    pass  # Client gave up waiting; nothing else to do
+                emit_ns = time.perf_counter_ns() - emit_start
+
+            # Side effects run only after the decision has been delivered
+            if result.get("notification"):
+                anti_sycophant.send_notification(result["notification"])
+            anti_sycophant.record_telemetry(result, "daemon", started, emit_ns)
+
+            # Recompile before the next event if a rule pack or the metadata changed
+            if anti_sycophant.rules_changed():
+                anti_sycophant.reset_detector()
+                anti_sycophant.get_matcher()
+
+            try:
+                if os.stat(hook_path).st_mtime_ns != hook_mtime:
+                    break
+            except OSError:
+                break  # Hook was uninstalled
+    finally:
+        # Hand the cursors over to the in-process hook for when the daemon is down
+        sessions.save()
+        server.close()
+        try:
+            os.remove(socket_path)
+        except OSError:
+            pass
+
+    return 0
+
+
+def main():
+    """Daemon entry point."""
+    parser = argparse.ArgumentParser(description="Resident detector daemon for the anti-sycophant Stop hook")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help=f"Exit after this many idle seconds, 0 to never exit (default: {DEFAULT_IDLE_TIMEOUT})")
+    args = parser.parse_args()
+    sys.exit(serve(args.idle_timeout))
+
+
+if __name__ == "__main__":
+    main()
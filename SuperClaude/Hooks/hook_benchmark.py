@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Anti-Sycophant Hook Benchmark
+Generates synthetic transcripts and times each stage of the Stop hook at every
+sensitivity level, reporting latency percentiles and memory, and comparing the
+results against a stored baseline so detector regressions fail loudly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import anti_sycophant  # noqa: E402
+
+DEFAULT_BASELINE = "hook-benchmark-baseline.json"  # In the current directory, not the hook's state
+DEFAULT_TOLERANCE = 0.25  # Allowed p50 slowdown over the baseline before failing
+NOISE_FLOOR_MS = 0.05     # Differences below this are timer noise, never regressions
+
+FILLER_WORDS = (
+    "the function returns a list of records from cache after parsing each line and the "
+    "test suite covers edge cases where input is empty or malformed so we handle errors "
+    "by logging them then retry with backoff until timeout config value is reached"
+).split()
+
+
+def _sample_phrase(pattern: str) -> str:
+    """Turn a phrase pattern into literal text it matches (first choice of each class)."""
+    text = re.sub(r"\[(.)[^\]]*\]", r"\1", pattern.lstrip("^"))
+    return re.sub(r"\\(.)", r"\1", text)
+
+
+def _filler(rng: random.Random, size: int) -> str:
+    """Return roughly `size` characters of neutral prose."""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(FILLER_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words) + "."
+
+
+def generate_transcript(path: str, turns: int = 500, text_bytes: int = 600, tool_bytes: int = 4000,
+                        tool_ratio: float = 0.5, phrase_density: float = 0.2, seed: int = 1) -> dict:
+    """
+    Write a synthetic Claude Code transcript and return a summary of what it contains.
+
+    Each turn is a user prompt followed by an assistant record; `tool_ratio` is the chance
+    the assistant record also carries a tool_use block (and the next user record a
+    tool_result) of about `tool_bytes` bytes. `phrase_density` is the fraction of assistant
+    responses that open with a phrase from the detector's tables.
+    """
+    rng = random.Random(seed)
+    phrases = [_sample_phrase(pattern)
+               for patterns in anti_sycophant.get_rules()["phrases"].values() for pattern in patterns]
+    with_phrase = 0
+    with_tool = 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for turn in range(turns):
+            f.write(json.dumps({"type": "user", "message": {
+                "role": "user", "content": _filler(rng, rng.randint(20, 200))}}) + "\n")
+
+            text = _filler(rng, max(1, int(rng.gauss(text_bytes, text_bytes / 4))))
+            if rng.random() < phrase_density:
+                text = f"{rng.choice(phrases).capitalize()}. {text}"
+                with_phrase += 1
+            content = [{"type": "text", "text": text}]
+            if rng.random() < tool_ratio:
+                with_tool += 1
+                payload = _filler(rng, max(1, int(rng.gauss(tool_bytes, tool_bytes / 4))))
+                content.append({"type": "tool_use", "id": f"toolu_{turn}", "name": "Write",
+                                "input": {"file_path": f"/tmp/file_{turn}.py", "content": payload}})
+            f.write(json.dumps({"type": "assistant", "message": {"role": "assistant", "content": content}}) + "\n")
+
+            if content[-1]["type"] == "tool_use":
+                f.write(json.dumps({"type": "user", "message": {"role": "user", "content": [
+                    {"type": "tool_result", "tool_use_id": f"toolu_{turn}",
+                     "content": _filler(rng, max(1, int(rng.gauss(tool_bytes, tool_bytes / 4))))}
+                ]}}) + "\n")
+
+    return {
+        "bytes": os.path.getsize(path),
+        "turns": turns,
+        "with_phrase": with_phrase,
+        "with_tool": with_tool
+    }
+
+
+def measure(stage, iterations: int) -> dict:
+    """Time `stage()` over `iterations` runs, then trace its Python allocation peak once."""
+    stage()  # Warm-up: compiles the matcher and fills the page cache
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        stage()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": anti_sycophant._percentile(timings, 0.50),
+        "p95_ms": anti_sycophant._percentile(timings, 0.95),
+        "p99_ms": anti_sycophant._percentile(timings, 0.99),
+        "peak_kib": peak / 1024
+    }
+
+
+def _peak_rss_kib() -> float | None:
+    """Peak resident set size of this process, or None where `resource` is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == "darwin" else float(peak)  # Bytes on macOS, KiB on Linux
+
+
+def use_state_dir(state_dir: str) -> None:
+    """Point the hook's detector cache, session index, trend rings and telemetry at `state_dir`."""
+    anti_sycophant.STATE_DIR = state_dir
+    anti_sycophant.TELEMETRY_FILE = os.path.join(state_dir, "telemetry.jsonl")
+    anti_sycophant.reset_detector()
+
+
+def previous_event_cursor(transcript_path: str) -> dict | None:
+    """
+    Return the cursor the hook would have stored at the Stop event before the last
+    assistant turn, so a timed lookup parses only the final turn, as a live event does.
+    """
+    assistant_offsets = []
+    offset = 0
+    with open(transcript_path, 'rb') as f:
+        for line in f:
+            if anti_sycophant._decode_assistant_line(line) is not None:
+                assistant_offsets.append((offset, offset + len(line)))
+            offset += len(line)
+    if len(assistant_offsets) < 2:
+        return None
+
+    previous_offset, previous_end = assistant_offsets[-2]
+    stat = os.stat(transcript_path)
+    return {"path": transcript_path, "device": stat.st_dev, "inode": stat.st_ino,
+            "size": previous_end, "assistant_offset": previous_offset}
+
+
+def run_benchmark(transcript_path: str, iterations: int = 20) -> dict:
+    """
+    Time the stages the Stop hook runs on one transcript: finding the latest response
+    (tailing from EOF, and from the previous event's cursor), detection of every
+    response at each sensitivity level, and the whole evaluate_stop_event call.
+    """
+    responses = list(anti_sycophant.iter_assistant_responses(transcript_path))
+    cursor = previous_event_cursor(transcript_path)
+
+    def stop_event() -> dict:
+        sessions = anti_sycophant.SessionIndex()
+        if cursor:
+            sessions.put("benchmark", dict(cursor))
+        return anti_sycophant.evaluate_stop_event(
+            {"transcript_path": transcript_path, "session_id": "benchmark"}, sessions)
+
+    stages = {
+        "find_latest[tail]": lambda: anti_sycophant.find_latest_assistant_response(transcript_path),
+        "find_latest[cursor]": lambda: anti_sycophant.find_latest_assistant_response(
+            transcript_path, dict(cursor) if cursor else None)
+    }
+    for sensitivity in anti_sycophant.SENSITIVITY_LEVELS:
+        stages[f"detect[{sensitivity}]"] = (
+            lambda sensitivity=sensitivity: [anti_sycophant.find_sycophantic_hits(text, sensitivity)
+                                             for text in responses]
+        )
+    stages["evaluate_stop_event"] = stop_event
+
+    results = {name: measure(stage, iterations) for name, stage in stages.items()}
+    hits = {sensitivity: sum(1 for text in responses if anti_sycophant.find_sycophantic_hits(text, sensitivity))
+            for sensitivity in anti_sycophant.SENSITIVITY_LEVELS}
+    return {"stages": results, "responses": len(responses), "flagged": hits}
+
+
+def compare_to_baseline(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Return one message per regression: a stage whose p50 grew beyond `tolerance`, or a
+    change in how many responses were flagged. The noisier p95/p99 are reported but never gate.
+    """
+    regressions = []
+    for name, current in result["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if not previous:
+            continue
+        limit = previous["p50_ms"] * (1 + tolerance)
+        if current["p50_ms"] > limit and current["p50_ms"] - previous["p50_ms"] > NOISE_FLOOR_MS:
+            regressions.append(f"{name} p50: {current['p50_ms']:.3f} ms "
+                               f"(baseline {previous['p50_ms']:.3f} ms, limit {limit:.3f} ms)")
+
+    for level, count in result["flagged"].items():
+        expected = baseline.get("flagged", {}).get(level)
+        if expected is not None and count != expected:
+            regressions.append(f"detect[{level}] flagged {count} responses (baseline {expected})")
+    return regressions
+
+
+def _print_report(config: dict, transcript: dict, result: dict) -> None:
+    """Print the per-stage table."""
+    print(f"Transcript: {transcript['bytes'] / 1024:.0f} KiB, {transcript['turns']} turns, "
+          f"{transcript['with_tool']} with tool payloads, {transcript['with_phrase']} with tracked phrases")
+    print(f"Iterations per stage: {config['iterations']}\n")
+    print(f"{'stage':<26} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+    for name, stats in result["stages"].items():
+        print(f"{name:<26} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} "
+              f"{stats['peak_kib']:>10.0f}")
+
+    flagged = ", ".join(f"{level}: {count}" for level, count in result["flagged"].items())
+    print(f"\nFlagged responses of {result['responses']}: {flagged}")
+    if result["peak_rss_kib"] is not None:
+        print(f"Peak RSS: {result['peak_rss_kib'] / 1024:.1f} MiB")
+
+
+def main():
+    """Benchmark entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the anti-sycophant hook on synthetic transcripts")
+    parser.add_argument("--turns", type=int, default=500, help="Conversation turns to generate (default: 500)")
+    parser.add_argument("--text-bytes", type=int, default=600, help="Mean assistant text size (default: 600)")
+    parser.add_argument("--tool-bytes", type=int, default=4000, help="Mean tool payload size (default: 4000)")
+    parser.add_argument("--tool-ratio", type=float, default=0.5,
+                        help="Fraction of assistant turns carrying a tool_use block (default: 0.5)")
+    parser.add_argument("--phrase-density", type=float, default=0.2,
+                        help="Fraction of responses opening with a tracked phrase (default: 0.2)")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed runs per stage (default: 20)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the transcript (default: 1)")
+    parser.add_argument("--transcript", help="Benchmark an existing transcript instead of generating one")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"Baseline file (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--state-dir",
+                        help="Hook state directory for the detector cache and trend rings (default: a temporary "
+                             f"directory, leaving {anti_sycophant.STATE_DIR} untouched)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown over the baseline (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    config = {key: getattr(args, key) for key in
+              ("turns", "text_bytes", "tool_bytes", "tool_ratio", "phrase_density", "iterations", "seed")}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        use_state_dir(os.path.abspath(args.state_dir) if args.state_dir else os.path.join(temp_dir, "state"))
+        if args.transcript:
+            transcript_path = args.transcript
+            config["transcript"] = os.path.abspath(transcript_path)
+            transcript = {"bytes": os.path.getsize(transcript_path), "turns": "?", "with_tool": "?", "with_phrase": "?"}
+        else:
+            transcript_path = os.path.join(temp_dir, "transcript.jsonl")
+            transcript = generate_transcript(transcript_path, args.turns, args.text_bytes, args.tool_bytes,
+                                             args.tool_ratio, args.phrase_density, args.seed)
+        result = run_benchmark(transcript_path, args.iterations)
+
+    result["peak_rss_kib"] = _peak_rss_kib()
+    _print_report(config, transcript, result)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        anti_sycophant._write_json_atomic(args.baseline, {"config": config, "stages": result["stages"],
+                                                           "flagged": result["flagged"]})
+        print(f"\nBaseline saved to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline to compare against (run with --save-baseline to store one)")
+        sys.exit(0)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"\n⚠️ Baseline was recorded with a different configuration, not comparing: {baseline.get('config')}")
+        sys.exit(0)
+
+    regressions = compare_to_baseline(result, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ REGRESSION against {args.baseline} (tolerance {args.tolerance:.0%}):", file=sys.stderr)
+        for message in regressions:
+            print(f"  {message}", file=sys.stderr)
+        sys.exit(1)
+    print(f"\n✅ Within {args.tolerance:.0%} of baseline {args.baseline}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
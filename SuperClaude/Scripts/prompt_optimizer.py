@@ -8,119 +8,201 @@ import sys
 import os
 import json
 import re
+import time
+import fnmatch
+import functools
+import hashlib
+import struct
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-class PromptOptimizer:
-    def __init__(self):
-        self.context = self._gather_context()
-
-    def _gather_context(self) -> Dict:
-        """Gather project context for enrichment"""
-        context = {
-            'cwd': os.getcwd(),
-            'files': [],
-            'framework': None,
-            'language': None,
-            'has_tests': False,
-            'has_git': os.path.exists('.git')
-        }
-
-        # Detect project type
-        if os.path.exists('package.json'):
-            context['framework'] = 'Node.js/JavaScript'
-            context['language'] = 'JavaScript/TypeScript'
-            context['has_tests'] = os.path.exists('test') or os.path.exists('tests') or os.path.exists('__tests__')
-        elif os.path.exists('requirements.txt') or os.path.exists('pyproject.toml'):
-            context['framework'] = 'Python'
-            context['language'] = 'Python'
-            context['has_tests'] = os.path.exists('tests') or os.path.exists('test')
-        elif os.path.exists('Cargo.toml'):
-            context['framework'] = 'Rust'
-            context['language'] = 'Rust'
-        elif os.path.exists('go.mod'):
-            context['framework'] = 'Go'
-            context['language'] = 'Go'
-
-        # Get recent files in current directory
-        try:
-            for item in os.listdir('.')[:10]:
-                if os.path.isfile(item) and not item.startswith('.'):
-                    context['files'].append(item)
-        except:
-            pass
-
-        return context
-
-    def classify_request(self, request: str) -> str:
-        """Classify the type of request"""
-        request_lower = request.lower()
-
-        # Feature implementation
-        if any(word in request_lower for word in ['add', 'create', 'implement', 'build', 'make']):
-            return 'feature'
-
-        # Bug fixing
-        elif any(word in request_lower for word in ['fix', 'bug', 'error', 'broken', 'crash']):
-            return 'bugfix'
-
-        # Performance
-        elif any(word in request_lower for word in ['slow', 'performance', 'optimize', 'speed']):
-            return 'performance'
-
-        # Refactoring
-        elif any(word in request_lower for word in ['refactor', 'clean', 'improve', 'reorganize']):
-            return 'refactor'
-
-        # Testing
-        elif any(word in request_lower for word in ['test', 'testing', 'coverage']):
-            return 'testing'
-
-        # Documentation
-        elif any(word in request_lower for word in ['document', 'docs', 'readme', 'comment']):
-            return 'documentation'
-
-        # Analysis
-        elif any(word in request_lower for word in ['why', 'analyze', 'understand', 'explain']):
-            return 'analysis'
-
-        else:
-            return 'general'
-
-    def scaffold_prompt(self, request: str, request_type: str) -> str:
-        """Create scaffolded prompt based on request type"""
-
-        # Base context
-        context_info = []
-        if self.context['framework']:
-            context_info.append(f"Project type: {self.context['framework']}")
-        if self.context['language']:
-            context_info.append(f"Language: {self.context['language']}")
-        if self.context['files']:
-            context_info.append(f"Project contains: {', '.join(self.context['files'][:5])}")
-
-        context_str = '\n'.join(context_info) if context_info else "Working in current directory"
-
-        # Build scaffolded prompt based on type
-        if request_type == 'feature':
-            return self._scaffold_feature(request, context_str)
-        elif request_type == 'bugfix':
-            return self._scaffold_bugfix(request, context_str)
-        elif request_type == 'performance':
-            return self._scaffold_performance(request, context_str)
-        elif request_type == 'refactor':
-            return self._scaffold_refactor(request, context_str)
-        elif request_type == 'testing':
-            return self._scaffold_testing(request, context_str)
-        elif request_type == 'documentation':
-            return self._scaffold_documentation(request, context_str)
-        elif request_type == 'analysis':
-            return self._scaffold_analysis(request, context_str)
-        else:
-            return self._scaffold_general(request, context_str)
-
-    def _scaffold_feature(self, request: str, context: str) -> str:
-        return f"""<context>
+CONTEXT_CACHE_VERSION = 3
+CONTEXT_CACHE_LIMIT = 128  # Working directories remembered (least recently gathered dropped)
+RACY_MTIME_WINDOW = 2.0    # Seconds; a directory modified this recently may change again within its mtime tick
+
+# Project scan budget: the walk stops at whichever limit is reached first
+SCAN_TIME_BUDGET = 0.25  # Seconds
+SCAN_MAX_ENTRIES = 20000
+SCAN_MAX_DEPTH = 6
+SCAN_WORKERS = min(8, os.cpu_count() or 1)
+SCAN_STAMP_DEPTH = 1  # Directory levels whose mtimes validate the cached context (0 is the root)
+
+# Directories never worth descending into, .gitignore or not
+PRUNED_DIRS = {
+    '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv', '.tox', '.nox',
+    '.mypy_cache', '.pytest_cache', '.ruff_cache', '.next', '.cache', 'target', 'dist', 'build'
+}
+
+# Marker file -> (framework, language), most specific first when a directory has several
+PROJECT_MARKERS = [
+    ('package.json', 'Node.js/JavaScript', 'JavaScript/TypeScript'),
+    ('pyproject.toml', 'Python', 'Python'),
+    ('requirements.txt', 'Python', 'Python'),
+    ('setup.py', 'Python', 'Python'),
+    ('Cargo.toml', 'Rust', 'Rust'),
+    ('go.mod', 'Go', 'Go'),
+    ('pom.xml', 'Maven', 'Java'),
+    ('build.gradle', 'Gradle', 'Java/Kotlin'),
+    ('build.gradle.kts', 'Gradle', 'Java/Kotlin'),
+    ('Gemfile', 'Ruby', 'Ruby'),
+    ('composer.json', 'PHP', 'PHP'),
+    ('Package.swift', 'Swift', 'Swift'),
+]
+
+LANGUAGE_EXTENSIONS = {
+    '.py': 'Python', '.js': 'JavaScript', '.jsx': 'JavaScript', '.mjs': 'JavaScript',
+    '.ts': 'TypeScript', '.tsx': 'TypeScript', '.go': 'Go', '.rs': 'Rust', '.java': 'Java',
+    '.kt': 'Kotlin', '.rb': 'Ruby', '.php': 'PHP', '.cs': 'C#', '.c': 'C', '.h': 'C',
+    '.cpp': 'C++', '.cc': 'C++', '.hpp': 'C++', '.swift': 'Swift', '.scala': 'Scala', '.sh': 'Shell'
+}
+
+TEST_DIRS = {'test', 'tests', '__tests__', 'spec', 'specs'}
+TEST_FILE_PATTERN = re.compile(
+    r'^(?:test_.+\.py|.+_test\.(?:py|go)|.+\.(?:test|spec)\.(?:js|jsx|ts|tsx|mjs)|.+Test\.(?:java|kt))$'
+)
+
+
+# Request vocabulary: category -> {keyword: weight}, in priority order for tied scores.
+# Generic verbs weigh less than domain words, so "add tests" is testing and
+# "improve performance" is performance.
+REQUEST_VOCABULARY: Dict[str, Dict[str, float]] = {
+    'feature': {'add': 0.8, 'create': 0.8, 'implement': 1.0, 'build': 0.8, 'make': 0.5, 'feature': 1.0,
+                'support': 0.6, 'new': 0.4, 'introduce': 0.8, 'enable': 0.6},
+    'bugfix': {'fix': 1.0, 'bug': 1.0, 'error': 1.0, 'broken': 1.0, 'crash': 1.0, 'fail': 0.8,
+               'failure': 0.8, 'exception': 0.8, 'wrong': 0.6, 'issue': 0.6, 'regression': 1.0},
+    'performance': {'slow': 1.0, 'slowly': 1.0, 'performance': 1.0, 'optimize': 1.0, 'speed': 1.0,
+                    'fast': 0.8, 'faster': 0.8, 'latency': 1.0, 'memory': 0.6, 'bottleneck': 1.0, 'profile': 0.8},
+    'refactor': {'refactor': 1.0, 'clean': 0.6, 'cleanup': 0.8, 'improve': 0.5, 'improvement': 0.5,
+                 'reorganize': 1.0, 'restructure': 1.0, 'simplify': 0.8, 'rename': 0.8, 'extract': 0.6},
+    'testing': {'test': 1.0, 'testing': 1.0, 'coverage': 1.0, 'unittest': 1.0, 'pytest': 1.0, 'spec': 0.8,
+                'mock': 0.8, 'fixture': 0.8},
+    'documentation': {'document': 1.0, 'documentation': 1.0, 'docs': 1.0, 'readme': 1.0, 'comment': 0.6,
+                      'docstring': 1.0, 'changelog': 1.0, 'guide': 0.6, 'tutorial': 0.8},
+    'analysis': {'why': 0.75, 'analyze': 1.0, 'analysis': 1.0, 'understand': 1.0, 'explain': 1.0,
+                 'investigate': 1.0, 'review': 0.8, 'how': 0.4, 'compare': 0.8}
+}
+SECONDARY_LABEL_RATIO = 0.5  # Other categories scoring at least this share of the top score are also reported
+LEADING_KEYWORD_BONUS = 1.2  # The first keyword is usually the imperative ("document the crash handler")
+_TOKEN = re.compile(r"[a-z0-9]+")
+_VOWEL = re.compile(r"[aeiouy]")
+STEM_MIN_LENGTH = 3  # Stems never get shorter than this; shorter words are kept whole
+
+
+@functools.lru_cache(maxsize=4096)
+def _stem(token: str) -> str:
+    """
+    Strip one inflectional suffix so "fix", "fixes", "fixed" and "fixing" share an index key.
+    Only real suffixes come off: -ies/-ied, -ing, -ed after a consonant ("speed" keeps its
+    "ed"), a doubled final consonant ("debugging"), then a plural -s and a silent -e, so
+    "optimize" and "optimized" meet at "optimiz".
+    """
+    if len(token) <= STEM_MIN_LENGTH:
+        return token
+    if token.endswith(('ies', 'ied')) and len(token) > STEM_MIN_LENGTH + 2:
+        return token[:-3] + 'y'
+    for suffix in ('ing', 'ed'):
+        if token.endswith(suffix):
+            stem = token[:-len(suffix)]
+            if (len(stem) < STEM_MIN_LENGTH or not _VOWEL.search(stem)
+                    or (suffix == 'ed' and stem[-1] in 'aeiou')):
+                return token
+            if len(stem) > STEM_MIN_LENGTH and stem[-1] == stem[-2] and stem[-1] not in 'aeiouylsz':
+                stem = stem[:-1]
+            return stem
+    if token.endswith('s') and token[-2] not in 'siu':  # Not "class", "analysis", "status"
+        token = token[:-1]
+    if token.endswith('e') and len(token) > STEM_MIN_LENGTH and token[-2] not in 'aeiou':
+        token = token[:-1]
+    return token
+
+
+def _stems(text: str) -> List[str]:
+    """Tokenize lowercased text into stems"""
+    return [_stem(token) for token in _TOKEN.findall(text)]
+
+
+class RequestClassifier:
+    """
+    Scores a request against every category in one pass. Keywords are stemmed
+    into a single stem -> [(category, weight)] index, so the request is tokenized
+    once and each distinct token costs one dict lookup however large the
+    vocabulary grows. Whole tokens are matched, so "make" no longer fires on
+    "makefile".
+    """
+
+    def __init__(self, vocabulary: Optional[Dict[str, Dict[str, float]]] = None):
+        self.categories: List[str] = []
+        self.priority: Dict[str, int] = {}
+        self.index: Dict[str, List[Tuple[str, float]]] = {}
+        for category, keywords in (vocabulary or REQUEST_VOCABULARY).items():
+            self.add_keywords(category, keywords)
+
+    def add_keywords(self, category: str, keywords: Dict[str, float]) -> None:
+        """Add or reweight single-word keywords; a new category ranks after the existing ones on ties"""
+        if category not in self.priority:
+            self.priority[category] = len(self.categories)
+            self.categories.append(category)
+        for keyword, weight in keywords.items():
+            stems = _stems(keyword.lower())
+            if len(stems) != 1:
+                continue  # Keywords are single words; requests are matched token by token
+            stem = stems[0]
+            entries = [entry for entry in self.index.get(stem, []) if entry[0] != category]
+            entries.append((category, float(weight)))
+            self.index[stem] = entries
+
+    def score(self, request: str) -> List[Tuple[str, float]]:
+        """Return (category, score) for every category with a keyword in the request, best first"""
+        scores: Dict[str, float] = {}
+        seen = set()
+        bonus = LEADING_KEYWORD_BONUS
+        for stem in _stems(request.lower()):
+            if stem in seen:
+                continue  # Repeating a word does not make the request more of that type
+            seen.add(stem)
+            entries = self.index.get(stem)
+            if entries:
+                for category, weight in entries:
+                    scores[category] = scores.get(category, 0.0) + weight * bonus
+                bonus = 1.0
+        return sorted(scores.items(), key=lambda item: (-item[1], self.priority[item[0]]))
+
+    def classify(self, request: str) -> List[str]:
+        """Return the best category followed by any close runners-up, or ['general']"""
+        scores = self.score(request)
+        if not scores:
+            return ['general']
+        top = scores[0][1]
+        return [category for category, score in scores if score >= top * SECONDARY_LABEL_RATIO]
+
+
+def load_vocabulary(path: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Return the built-in vocabulary merged with a user file of the same shape
+    ($SUPERCLAUDE_PROMPT_VOCABULARY, or ~/.claude/prompt_vocabulary.json)
+    """
+    vocabulary = {category: dict(keywords) for category, keywords in REQUEST_VOCABULARY.items()}
+    path = path or os.environ.get('SUPERCLAUDE_PROMPT_VOCABULARY') or os.path.join(
+        os.path.expanduser('~'), '.claude', 'prompt_vocabulary.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            extra = json.load(f)
+    except (OSError, ValueError):
+        return vocabulary
+    if isinstance(extra, dict):
+        for category, keywords in extra.items():
+            if isinstance(keywords, dict):
+                vocabulary.setdefault(category, {}).update(
+                    {str(keyword): weight for keyword, weight in keywords.items()
+                     if isinstance(weight, (int, float)) and not isinstance(weight, bool)})
+    return vocabulary
+
+
+# Built-in scaffolds, one per request type. {context} and {request} are filled in at
+# render time; {{ and }} stand for literal braces.
+SCAFFOLD_TEMPLATES: Dict[str, str] = {
+    'feature': """<context>
 {context}
 User request: {request}
 </context>
@@ -156,10 +238,8 @@ Implement the requested feature with production-ready code
 ✓ Code follows project conventions
 ✓ Documentation updated
 ✓ Error handling implemented
-</validation>"""
-
-    def _scaffold_bugfix(self, request: str, context: str) -> str:
-        return f"""<context>
+</validation>""",
+    'bugfix': """<context>
 {context}
 Issue reported: {request}
 </context>
@@ -193,10 +273,8 @@ Identify and fix the reported issue while preventing regression
 ✓ Tests added to prevent regression
 ✓ No new issues introduced
 ✓ All existing tests still pass
-</validation>"""
-
-    def _scaffold_performance(self, request: str, context: str) -> str:
-        return f"""<context>
+</validation>""",
+    'performance': """<context>
 {context}
 Performance concern: {request}
 </context>
@@ -235,10 +313,8 @@ Identify and resolve performance bottlenecks with measurable improvements
 ✓ No functionality broken
 ✓ Optimizations documented
 ✓ Performance tests added
-</validation>"""
-
-    def _scaffold_refactor(self, request: str, context: str) -> str:
-        return f"""<context>
+</validation>""",
+    'refactor': """<context>
 {context}
 Refactoring request: {request}
 </context>
@@ -277,10 +353,8 @@ Improve code quality and maintainability without changing functionality
 ✓ No functionality changed
 ✓ Code more maintainable
 ✓ Documentation updated
-</validation>"""
-
-    def _scaffold_testing(self, request: str, context: str) -> str:
-        return f"""<context>
+</validation>""",
+    'testing': """<context>
 {context}
 Testing request: {request}
 </context>
@@ -317,10 +391,8 @@ Create comprehensive tests to ensure code quality and prevent regressions
 ✓ Tests are maintainable
 ✓ Tests run quickly
 ✓ Clear test documentation
-</validation>"""
-
-    def _scaffold_documentation(self, request: str, context: str) -> str:
-        return f"""<context>
+</validation>""",
+    'documentation': """<context>
 {context}
 Documentation request: {request}
 </context>
@@ -361,10 +433,8 @@ Create clear, comprehensive documentation for developers and users
 ✓ Documentation is clear
 ✓ No outdated information
 ✓ Consistent formatting
-</validation>"""
-
-    def _scaffold_analysis(self, request: str, context: str) -> str:
-        return f"""<context>
+</validation>""",
+    'analysis': """<context>
 {context}
 Analysis request: {request}
 </context>
@@ -403,10 +473,8 @@ Provide thorough analysis with clear insights and actionable findings
 ✓ Clear conclusions provided
 ✓ Actionable insights included
 ✓ Supporting data documented
-</validation>"""
-
-    def _scaffold_general(self, request: str, context: str) -> str:
-        return f"""<context>
+</validation>""",
+    'general': """<context>
 {context}
 Request: {request}
 </context>
@@ -438,18 +506,845 @@ Complete the requested task efficiently and correctly
 ✓ Changes documented
 ✓ No issues introduced
 </validation>"""
+}
+SCAFFOLD_SLOTS = ('context', 'request')
+_TEMPLATE_TOKEN = re.compile(r"\{\{|\}\}|\{(\w+)\}")
+
+
+class ScaffoldTemplate:
+    """
+    A scaffold parsed once into literal and slot segments. Rendering copies the
+    segment list, drops the values into the slot positions and joins it, with
+    no parsing or formatting work per call.
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        self.parts: List[str] = []
+        self.slots: List[Tuple[int, str]] = []
+        literal = []
+        position = 0
+        for match in _TEMPLATE_TOKEN.finditer(text):
+            literal.append(text[position:match.start()])
+            position = match.end()
+            slot = match.group(1)
+            if slot is None:
+                literal.append(match.group()[0])  # {{ or }}
+                continue
+            if slot not in SCAFFOLD_SLOTS:
+                raise ValueError(f"template {name!r}: unknown slot {{{slot}}} (expected {', '.join(SCAFFOLD_SLOTS)})")
+            self.parts.append(''.join(literal))
+            self.slots.append((len(self.parts), slot))
+            self.parts.append('')
+            literal = []
+        literal.append(text[position:])
+        self.parts.append(''.join(literal))
+
+    def render(self, **values: str) -> str:
+        """Fill the slots with `values` (one keyword argument per slot)"""
+        parts = self.parts.copy()
+        for index, slot in self.slots:
+            parts[index] = values[slot]
+        return ''.join(parts)
+
+
+class TemplateRegistry:
+    """
+    Parsed scaffolds by request type: the built-ins, overridden or extended by
+    `<type>.txt` files in $SUPERCLAUDE_PROMPT_TEMPLATES or ~/.claude/prompt_templates.
+    Types without a template use the 'general' one.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.environ.get('SUPERCLAUDE_PROMPT_TEMPLATES') or os.path.join(
+            os.path.expanduser('~'), '.claude', 'prompt_templates')
+        self.templates: Dict[str, ScaffoldTemplate] = {
+            name: ScaffoldTemplate(name, text) for name, text in SCAFFOLD_TEMPLATES.items()
+        }
+        self.overridden: List[str] = []
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            return
+        for filename in names:
+            name, extension = os.path.splitext(filename)
+            if extension != '.txt':
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                    self.templates[name] = ScaffoldTemplate(name, f.read())
+                self.overridden.append(name)
+            except (OSError, ValueError) as e:
+                print(f"prompt_optimizer: ignoring template {filename}: {e}", file=sys.stderr)
+
+    def render(self, request_type: str, **values: str) -> str:
+        """Render the scaffold for a request type"""
+        template = self.templates.get(request_type) or self.templates['general']
+        return template.render(**values)
+
+
+def get_cache_dir() -> Path:
+    """Return the SuperClaude cache directory ($XDG_CACHE_HOME/superclaude or ~/.cache/superclaude)"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'superclaude'
+
+
+def _parse_gitignore(path: str, base: str) -> List[Tuple[str, str, bool, bool, bool]]:
+    """
+    Read a .gitignore into (base, pattern, negated, dir_only, anchored) rules.
+    Covers the common subset of gitignore syntax: comments, negation, trailing
+    slash for directories, and patterns anchored by a slash.
+    """
+    rules = []
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.strip('/') if dir_only else line
+        anchored = '/' in line
+        line = line.lstrip('/')
+        if line:
+            rules.append((base, line, negated, dir_only, anchored))
+    return rules
+
+
+def _is_ignored(rel_path: str, name: str, is_dir: bool, rules: List[Tuple[str, str, bool, bool, bool]]) -> bool:
+    """Apply .gitignore rules to a path relative to the scan root; the last matching rule wins"""
+    ignored = False
+    for base, pattern, negated, dir_only, anchored in rules:
+        if dir_only and not is_dir:
+            continue
+        if anchored:
+            if base and not rel_path.startswith(base + '/'):
+                continue
+            matched = fnmatch.fnmatchcase(rel_path[len(base) + 1:] if base else rel_path, pattern)
+        else:
+            matched = fnmatch.fnmatchcase(name, pattern)
+        if matched:
+            ignored = not negated
+    return ignored
+
+
+class ProjectScanner:
+    """
+    Breadth-first walk of the project with os.scandir, one directory level at a
+    time across a thread pool. Ignored and dependency directories are pruned
+    before they are listed, and the walk stops at the first of the time, entry or
+    depth budgets, so a huge monorepo yields a partial but bounded scan.
+    """
+
+    def __init__(self, root: str, time_budget: float = SCAN_TIME_BUDGET, max_entries: int = SCAN_MAX_ENTRIES,
+                 max_depth: int = SCAN_MAX_DEPTH, workers: int = SCAN_WORKERS):
+        self.root = root
+        self.time_budget = time_budget
+        self.max_entries = max_entries
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+
+    def _scan_dir(self, rel_dir: str, rules: List, deadline: float) -> Dict:
+        """List one directory: its mtime, files, and the subdirectories left after pruning"""
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        listing = {'rel': rel_dir, 'stamps': [], 'files': [], 'dirs': [], 'rules': rules, 'complete': True}
+        try:
+            listing['stamps'].append([path, os.stat(path).st_mtime_ns])
+            gitignore = os.path.join(path, '.gitignore')
+            if os.path.isfile(gitignore):
+                listing['stamps'].append([gitignore, os.stat(gitignore).st_mtime_ns])
+                listing['rules'] = rules + _parse_gitignore(gitignore, rel_dir)
+
+            with os.scandir(path) as entries:
+                for count, entry in enumerate(entries):
+                    if count >= self.max_entries or (count % 64 == 63 and time.monotonic() > deadline):
+                        listing['complete'] = False
+                        break
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir and entry.name in PRUNED_DIRS:
+                        continue
+                    if _is_ignored(rel_path, entry.name, is_dir, listing['rules']):
+                        continue
+                    (listing['dirs'] if is_dir else listing['files']).append(entry.name)
+        except OSError:
+            pass  # Unreadable directory: skip it, the rest of the scan still counts
+        return listing
+
+    def scan(self) -> Dict:
+        """Walk the project within the budgets and summarize what was found"""
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        result = {
+            'root_files': [],
+            'subprojects': {},
+            'languages': {},
+            'test_dirs': [],
+            'test_files': 0,
+            'entries': 0,
+            'directories': 0,
+            'truncated': False,
+            'stamps': []
+        }
+
+        level = [('', [])]
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for depth in range(self.max_depth + 1):
+                if not level:
+                    break
+                futures = [pool.submit(self._scan_dir, rel_dir, rules, deadline) for rel_dir, rules in level]
+                next_level = []
+                for index, future in enumerate(futures):
+                    try:
+                        listing = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    except FuturesTimeout:
+                        listing = None
+                    if listing is None or result['entries'] >= self.max_entries:
+                        # Out of budget: drop the directories not listed yet and stop descending
+                        for pending in futures[index:]:
+                            pending.cancel()
+                        result['truncated'] = True
+                        next_level = []
+                        break
+                    self._record(result, listing, depth)
+                    if not listing['complete']:
+                        result['truncated'] = True
+                    next_level.extend((f"{listing['rel']}/{name}" if listing['rel'] else name, listing['rules'])
+                                      for name in listing['dirs'])
+                if next_level and depth == self.max_depth:
+                    result['truncated'] = True
+                level = next_level
+        finally:
+            # Don't wait for a listing still blocked in the filesystem; it ends at its next deadline check
+            pool.shutdown(wait=False)
+
+        result['elapsed_ms'] = round((time.monotonic() - started) * 1000, 1)
+        return result
+
+    @staticmethod
+    def _record(result: Dict, listing: Dict, depth: int) -> None:
+        """Fold one directory listing into the scan summary"""
+        rel_dir = listing['rel']
+        files = listing['files']
+        if depth <= SCAN_STAMP_DEPTH:
+            result['stamps'].extend(listing['stamps'])
+        result['directories'] += 1
+        result['entries'] += len(files) + len(listing['dirs'])
+        if depth == 0:
+            result['root_files'] = [name for name in files if not name.startswith('.')]
+
+        names = set(files)
+        for marker, framework, language in PROJECT_MARKERS:
+            if marker in names:
+                result['subprojects'][rel_dir or '.'] = {'framework': framework, 'language': language}
+                break
+
+        if os.path.basename(rel_dir) in TEST_DIRS:
+            result['test_dirs'].append(rel_dir)
+        for name in files:
+            language = LANGUAGE_EXTENSIONS.get(os.path.splitext(name)[1])
+            if language:
+                result['languages'][language] = result['languages'].get(language, 0) + 1
+            if TEST_FILE_PATTERN.match(name):
+                result['test_files'] += 1
+
+
+class ContextCache:
+    """
+    Project context per working directory, validated against the mtimes of the
+    root and first-level directories and their .gitignore files. Adding, removing
+    or renaming an entry updates its directory's mtime, so matching stamps mean
+    the project layout is unchanged and the scan can be skipped; deeper changes
+    wait for one of those to move. A partial scan is cached as well and keeps its
+    `truncated` flag, so the prompt still says the context is partial.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_cache_dir() / 'prompt_context.json'
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('version') == CONTEXT_CACHE_VERSION:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _stamps_current(stamps: List[List]) -> bool:
+        """Check that every recorded path still has the recorded mtime"""
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime for path, mtime in stamps)
+        except OSError:
+            return False
+
+    def get(self, cwd: str) -> Optional[Dict]:
+        """Return the cached context if nothing it was gathered from has changed"""
+        entry = self.entries.get(cwd)
+        if not entry or not entry.get('stamps') or not self._stamps_current(entry['stamps']):
+            return None
+        return entry['context']
+
+    def put(self, cwd: str, stamps: List[List], context: Dict) -> None:
+        """Remember a freshly gathered context, partial or not"""
+        self.entries.pop(cwd, None)
+        # A change later in the same mtime tick would go unnoticed; scan again next time
+        if stamps and time.time() - max(mtime for _, mtime in stamps) / 1e9 >= RACY_MTIME_WINDOW:
+            self.entries[cwd] = {'stamps': stamps, 'context': context}
+            while len(self.entries) > CONTEXT_CACHE_LIMIT:
+                del self.entries[next(iter(self.entries))]
+        self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically; failures only cost a scan next time"""
+        if not self.dirty:
+            return
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CONTEXT_CACHE_VERSION, 'entries': self.entries}, f)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
+GIT_STAT_BUDGET = 0.05  # Seconds spent comparing tracked files with the index per invocation
+GIT_FILE_TYPES = ('bugfix', 'refactor')  # Request types whose scaffold lists the files being worked on
+_INDEX_ENTRY = struct.Struct('>10L')  # ctime, ctime_ns, mtime, mtime_ns, dev, ino, mode, uid, gid, size
+_GITLINK_MODE = 0o160000  # Submodule entries point at a commit, not a file
+
+
+def find_git_dir(start: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Return (worktree, git_dir, common_dir) for the repository containing `start`,
+    following `.git` files (worktrees, submodules) and `commondir`, or None.
+    """
+    path = os.path.abspath(start)
+    while True:
+        dot_git = os.path.join(path, '.git')
+        git_dir = None
+        if os.path.isdir(dot_git):
+            git_dir = dot_git
+        elif os.path.isfile(dot_git):
+            try:
+                with open(dot_git, 'r', encoding='utf-8') as f:
+                    line = f.readline().strip()
+            except OSError:
+                line = ''
+            if line.startswith('gitdir:'):
+                git_dir = os.path.normpath(os.path.join(path, line[len('gitdir:'):].strip()))
+        if git_dir and os.path.isfile(os.path.join(git_dir, 'HEAD')):
+            common_dir = git_dir
+            try:
+                with open(os.path.join(git_dir, 'commondir'), 'r', encoding='utf-8') as f:
+                    common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+            except OSError:
+                pass
+            return path, git_dir, common_dir
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _read_git_head(git_dir: str, common_dir: str) -> Tuple[Optional[str], Optional[str], List[str]]:
+    """Return (branch, commit, files the answer depends on); branch is None for a detached HEAD"""
+    head_path = os.path.join(git_dir, 'HEAD')
+    with open(head_path, 'r', encoding='utf-8') as f:
+        head = f.read().strip()
+    if not head.startswith('ref:'):
+        return None, head or None, [head_path]
+
+    ref = head[len('ref:'):].strip()
+    branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else ref
+    loose_path = os.path.join(common_dir, *ref.split('/'))
+    packed_path = os.path.join(common_dir, 'packed-refs')
+    # A loose ref appearing later changes its directory's mtime, so that is watched too
+    sources = [head_path, os.path.dirname(loose_path)]
+    try:
+        with open(loose_path, 'r', encoding='utf-8') as f:
+            commit = f.read().strip() or None
+        sources.append(loose_path)
+        return branch, commit, sources
+    except OSError:
+        pass
+
+    commit = None
+    try:
+        with open(packed_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) == 2 and fields[1] == ref:
+                    commit = fields[0]
+                    break
+        sources.append(packed_path)
+    except OSError:
+        pass  # Unborn branch: no commit yet
+    return branch, commit, sources
+
+
+def _git_hash_size(common_dir: str) -> int:
+    """Object id length in bytes: 32 for SHA-256 repositories, 20 otherwise"""
+    try:
+        with open(os.path.join(common_dir, 'config'), 'r', encoding='utf-8') as f:
+            config = f.read().lower()
+    except OSError:
+        return 20
+    return 32 if re.search(r'objectformat\s*=\s*sha256', config) else 20
+
+
+def read_git_index(index_path: str, hash_size: int = 20) -> Dict:
+    """
+    Parse the index (versions 2-4) into parallel lists of the tracked paths and the
+    mtime_ns and size git recorded for them, plus the paths with merge conflicts.
+    Submodules and skip-worktree (sparse checkout) entries are left out.
+    """
+    with open(index_path, 'rb') as f:
+        data = f.read()
+    signature, version, count = struct.unpack_from('>4sLL', data, 0)
+    if signature != b'DIRC' or version not in (2, 3, 4):
+        raise ValueError(f"unsupported index format (version {version})")
+
+    tracked = {'paths': [], 'mtimes': [], 'sizes': [], 'unmerged': []}
+    position = 12
+    previous = b''
+    fixed_size = _INDEX_ENTRY.size + hash_size + 2
+    for _ in range(count):
+        fields = _INDEX_ENTRY.unpack_from(data, position)
+        flags = struct.unpack_from('>H', data, position + _INDEX_ENTRY.size + hash_size)[0]
+        name_start = position + fixed_size
+        skip_worktree = False
+        if flags & 0x4000:  # Extended flags (version 3+)
+            skip_worktree = bool(struct.unpack_from('>H', data, name_start)[0] & 0x4000)
+            name_start += 2
+
+        if version == 4:
+            # Path stored as a prefix length to drop from the previous path plus a suffix
+            byte = data[name_start]
+            name_start += 1
+            strip = byte & 0x7f
+            while byte & 0x80:
+                byte = data[name_start]
+                name_start += 1
+                strip = ((strip + 1) << 7) | (byte & 0x7f)
+            name_end = data.index(b'\0', name_start)
+            name = previous[:len(previous) - strip] + data[name_start:name_end]
+            position = name_end + 1
+        else:
+            name_end = data.index(b'\0', name_start)
+            name = data[name_start:name_end]
+            position += (name_end - position) // 8 * 8 + 8  # Entries are NUL-padded to a multiple of 8
+        previous = name
+
+        path = name.decode('utf-8', 'surrogateescape')
+        if (flags >> 12) & 3:
+            if not tracked['unmerged'] or tracked['unmerged'][-1] != path:
+                tracked['unmerged'].append(path)
+            continue
+        if skip_worktree or fields[6] & 0o170000 == _GITLINK_MODE:
+            continue
+        tracked['paths'].append(path)
+        tracked['mtimes'].append(fields[2] * 1_000_000_000 + fields[3])
+        tracked['sizes'].append(fields[9])
+    return tracked
+
+
+def _modified_files(worktree: str, tracked: Dict, budget: float) -> Tuple[List[Tuple[str, int]], bool]:
+    """
+    Stat tracked files against their index entries the way `git status` does
+    before hashing; returns ([(path, mtime_ns)] of changed or deleted files, complete).
+    """
+    deadline = time.monotonic() + budget
+    modified = []
+    for index, (path, mtime, size) in enumerate(zip(tracked['paths'], tracked['mtimes'], tracked['sizes'])):
+        if index % 256 == 255 and time.monotonic() > deadline:
+            return modified, False
+        try:
+            stat = os.lstat(os.path.join(worktree, path))
+        except OSError:
+            modified.append((path, 0))  # Deleted
+            continue
+        # The index keeps 32-bit sizes and may hold whole seconds only
+        same_time = stat.st_mtime_ns == mtime or (mtime % 1_000_000_000 == 0
+                                                  and stat.st_mtime_ns // 1_000_000_000 == mtime // 1_000_000_000)
+        if not same_time or stat.st_size & 0xffffffff != size:
+            modified.append((path, stat.st_mtime_ns))
+    return modified, True
+
+
+def read_git_metadata(start: str, use_cache: bool = True, stat_budget: float = GIT_STAT_BUDGET) -> Optional[Dict]:
+    """
+    Read branch, commit and working-tree state straight from .git, without running git.
+    The parsed index and HEAD are cached per repository, keyed on the mtimes of the
+    index, HEAD and the branch ref; tracked files are compared with the index on every
+    call, within `stat_budget` seconds. Untracked files are not reported.
+    """
+    found = find_git_dir(start)
+    if found is None:
+        return None
+    worktree, git_dir, common_dir = found
+    index_path = os.path.join(git_dir, 'index')
+
+    cache = None
+    repository = None
+    if use_cache:
+        key = hashlib.sha1(git_dir.encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+        cache = ContextCache(get_cache_dir() / 'git' / f'{key}.json')
+        repository = cache.get(git_dir)
+    if repository is None:
+        try:
+            branch, commit, sources = _read_git_head(git_dir, common_dir)
+            if os.path.exists(index_path):
+                tracked = read_git_index(index_path, _git_hash_size(common_dir))
+                sources.append(index_path)
+            else:
+                tracked = {'paths': [], 'mtimes': [], 'sizes': [], 'unmerged': []}
+            stamps = [[source, os.stat(source).st_mtime_ns] for source in sources]
+        except (OSError, ValueError, struct.error):
+            return {'worktree': worktree, 'branch': None, 'commit': None, 'tracked': 0,
+                    'modified': [], 'unmerged': [], 'dirty': None, 'complete': False}
+        repository = {'branch': branch, 'commit': commit, 'tracked': tracked}
+        if cache is not None:
+            cache.put(git_dir, stamps, repository)
+            cache.save()
+
+    tracked = repository['tracked']
+    modified, complete = _modified_files(worktree, tracked, stat_budget)
+    modified.sort(key=lambda item: item[1], reverse=True)  # Most recently edited first
+    return {
+        'worktree': worktree,
+        'branch': repository['branch'],
+        'commit': repository['commit'],
+        'tracked': len(tracked['paths']),
+        'modified': [path for path, _ in modified],
+        'unmerged': tracked['unmerged'],
+        'dirty': bool(modified or tracked['unmerged']),
+        'complete': complete
+    }
+
+
+class PromptOptimizer:
+    def __init__(self, use_cache: Optional[bool] = None, context: Optional[Dict] = None,
+                 vocabulary: Optional[Dict[str, Dict[str, float]]] = None):
+        if use_cache is None:
+            use_cache = os.environ.get('SUPERCLAUDE_NO_CACHE') != '1'
+        if context is None:
+            context = self._cached_context() if use_cache else self._gather_context()
+            # Working-tree state changes without touching any directory, so it is never kept in the context cache
+            context = dict(context, git=read_git_metadata(context['cwd'], use_cache))
+            context['has_git'] = context['git'] is not None
+        self.context = context
+        self.vocabulary = vocabulary if vocabulary is not None else load_vocabulary()
+        self.classifier = RequestClassifier(self.vocabulary)
+        self.templates = TemplateRegistry()
+
+    def _cached_context(self) -> Dict:
+        """Return the project context, scanning the filesystem only when something changed"""
+        cwd = os.getcwd()
+        cache = ContextCache()
+        context = cache.get(cwd)
+        if context is None:
+            stamps: List[List] = []
+            context = self._gather_context(stamps)
+            cache.put(cwd, stamps, context)
+            cache.save()
+        return context
+
+    def _gather_context(self, stamps: Optional[List[List]] = None) -> Dict:
+        """Gather project context for enrichment; `stamps` collects the paths it depended on"""
+        cwd = os.getcwd()
+        scan = ProjectScanner(cwd).scan()
+        if stamps is not None:
+            stamps.extend(scan['stamps'])
+
+        subprojects = [
+            {'path': path, **info} for path, info in sorted(scan['subprojects'].items())
+        ]
+        languages = [[language, count] for language, count in
+                     sorted(scan['languages'].items(), key=lambda item: (-item[1], item[0]))]
+        context = {
+            'cwd': cwd,
+            'files': scan['root_files'][:10],
+            'framework': None,
+            'language': None,
+            'has_tests': bool(scan['test_dirs'] or scan['test_files']),
+            'has_git': os.path.exists('.git'),
+            'subprojects': subprojects,
+            'languages': languages,
+            'test_dirs': scan['test_dirs'],
+            'test_files': scan['test_files'],
+            'scan': {key: scan[key] for key in ('entries', 'directories', 'truncated', 'elapsed_ms')}
+        }
+
+        # The root project decides; a monorepo without one reports every framework found below it
+        root = scan['subprojects'].get('.')
+        if root:
+            context['framework'] = root['framework']
+            context['language'] = root['language']
+        elif subprojects:
+            context['framework'] = ', '.join(dict.fromkeys(project['framework'] for project in subprojects))
+            context['language'] = ', '.join(dict.fromkeys(project['language'] for project in subprojects))
+
+        return context
+
+    def classify_request(self, request: str) -> str:
+        """Classify the type of request"""
+        return self.classify_labels(request)[0]
+
+    def classify_labels(self, request: str) -> List[str]:
+        """Classify the request into its main type followed by any secondary types"""
+        return self.classifier.classify(request)
+
+    def scaffold_prompt(self, request: str, request_type: str, related: Optional[List[str]] = None) -> str:
+        """Create scaffolded prompt based on request type; `related` lists secondary types to mention"""
+
+        # Base context
+        context_info = []
+        if self.context['framework']:
+            context_info.append(f"Project type: {self.context['framework']}")
+        if self.context['language']:
+            context_info.append(f"Language: {self.context['language']}")
+        if self.context['files']:
+            context_info.append(f"Project contains: {', '.join(self.context['files'][:5])}")
+        subprojects = [project for project in self.context.get('subprojects', []) if project['path'] != '.']
+        if subprojects:
+            context_info.append("Subprojects: " + ', '.join(
+                f"{project['path']} ({project['framework']})" for project in subprojects[:8]))
+        if self.context.get('languages'):
+            context_info.append("Languages by file count: " + ', '.join(
+                f"{language} ({count})" for language, count in self.context['languages'][:5]))
+        if self.context.get('test_dirs'):
+            context_info.append(f"Test directories: {', '.join(self.context['test_dirs'][:5])}")
+        elif self.context.get('test_files'):
+            context_info.append(f"Test files: {self.context['test_files']} alongside the sources")
+        if self.context.get('scan', {}).get('truncated'):
+            context_info.append("(Project scan was partial: the repository exceeds the scan budget)")
+        git = self.context.get('git')
+        if git:
+            context_info.append(self._describe_git(git))
+            if git['unmerged']:
+                context_info.append(f"Unresolved merge conflicts: {', '.join(git['unmerged'][:8])}")
+            if request_type in GIT_FILE_TYPES and git['modified']:
+                more = len(git['modified']) - 8
+                context_info.append("Files being worked on: " + ', '.join(git['modified'][:8]) +
+                                    (f" (+{more} more)" if more > 0 else ""))
+        if related:
+            context_info.append(f"Also involves: {', '.join(related)}")
+
+        context_str = '\n'.join(context_info) if context_info else "Working in current directory"
+
+        return self.templates.render(request_type, context=context_str, request=request)
+
+    @staticmethod
+    def _describe_git(git: Dict) -> str:
+        """Summarize branch and working-tree state in one context line"""
+        commit = (git['commit'] or '')[:7]
+        if git['branch']:
+            where = f"branch {git['branch']}" + (f" at {commit}" if commit else " (no commits yet)")
+        else:
+            where = f"detached HEAD at {commit}"
+        if git['dirty'] is None:
+            state = "state unknown"
+        elif git['modified']:
+            state = f"{len(git['modified'])} modified tracked file{'s' if len(git['modified']) != 1 else ''}"
+        else:
+            state = "no modified tracked files" if not git['unmerged'] else "conflicts unresolved"
+        if not git['complete'] and git['dirty'] is not None:
+            state += f" (checked within {GIT_STAT_BUDGET * 1000:.0f}ms; {git['tracked']} tracked)"
+        return f"Git: {where}, {state}"
 
     def optimize(self, user_request: str) -> Tuple[str, str]:
         """Main optimization function"""
-        request_type = self.classify_request(user_request)
-        scaffolded = self.scaffold_prompt(user_request, request_type)
+        labels = self.classify_labels(user_request)
+        request_type = labels[0]
+        scaffolded = self.scaffold_prompt(user_request, request_type, labels[1:])
         return request_type, scaffolded
 
+BATCH_CHUNK_SIZE = 256  # Requests read ahead and handed to the worker pool at a time
+BATCH_TEXT_FIELDS = ('request', 'original', 'prompt', 'body', 'title')
+BATCH_ID_FIELDS = ('id', 'request_id')
+
+_BATCH_OPTIMIZER: Optional['PromptOptimizer'] = None
+
+
+def _init_batch_worker(context: Dict, vocabulary: Dict[str, Dict[str, float]]) -> None:
+    """Give each worker process an optimizer built from the parent's context, without rescanning"""
+    global _BATCH_OPTIMIZER
+    _BATCH_OPTIMIZER = PromptOptimizer(context=context, vocabulary=vocabulary)
+
+
+def _classify_and_scaffold(optimizer: 'PromptOptimizer', request: str) -> Tuple[List[str], str]:
+    """Return (labels, scaffolded prompt) for one request"""
+    labels = optimizer.classify_labels(request)
+    return labels, optimizer.scaffold_prompt(request, labels[0], labels[1:])
+
+
+def _optimize_batch_item(request: str) -> Tuple[List[str], str]:
+    """Classify and scaffold one request in a worker process"""
+    return _classify_and_scaffold(_BATCH_OPTIMIZER, request)
+
+
+def _parse_batch_line(line: str, field: Optional[str]) -> Tuple[Optional[str], Dict]:
+    """
+    Return (request text, identifying fields) for one input line: a JSON string, or
+    an object holding the text under `field` or the first of BATCH_TEXT_FIELDS present.
+    Raises ValueError for lines with no request text.
+    """
+    item = json.loads(line)
+    if isinstance(item, str):
+        return item, {}
+    if not isinstance(item, dict):
+        raise ValueError("expected a JSON string or object")
+    keys = [field] if field else BATCH_TEXT_FIELDS
+    text = next((item[key] for key in keys if isinstance(item.get(key), str) and item[key].strip()), None)
+    if text is None:
+        raise ValueError(f"no request text in {', '.join(keys)}")
+    return text, {key: item[key] for key in BATCH_ID_FIELDS if key in item}
+
+
+def run_batch(input_stream, output_stream, workers: int = 1, field: Optional[str] = None) -> Dict:
+    """
+    Stream JSONL requests in and JSONL results ({original, type, labels, scaffolded}) out,
+    in input order. Project context is gathered once; with workers > 1 requests are
+    scaffolded across a process pool in chunks of BATCH_CHUNK_SIZE.
+    Returns {"requests", "errors", "seconds", "workers"}.
+    """
+    started = time.perf_counter()
+    optimizer = PromptOptimizer()
+    stats = {'requests': 0, 'errors': 0, 'workers': max(1, workers)}
+
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                   initargs=(optimizer.context, optimizer.vocabulary))
+
+    def flush(chunk: List[Tuple[int, Optional[str], Dict]]) -> None:
+        texts = [text for _, text, _ in chunk if text is not None]
+        if pool:
+            results = pool.map(_optimize_batch_item, texts, chunksize=max(1, len(texts) // (workers * 4)))
+        else:
+            results = (_classify_and_scaffold(optimizer, text) for text in texts)
+        results = iter(results)
+        for line_number, text, extra in chunk:
+            if text is None:
+                record = {'line': line_number, **extra}
+                stats['errors'] += 1
+            else:
+                labels, scaffolded = next(results)
+                record = {**extra, 'original': text, 'type': labels[0], 'labels': labels, 'scaffolded': scaffolded}
+                stats['requests'] += 1
+            output_stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    try:
+        chunk = []
+        for line_number, line in enumerate(input_stream, 1):
+            if not line.strip():
+                continue
+            try:
+                text, extra = _parse_batch_line(line, field)
+            except ValueError as e:
+                text, extra = None, {'error': str(e)}
+            chunk.append((line_number, text, extra))
+            if len(chunk) >= BATCH_CHUNK_SIZE:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        output_stream.flush()
+    finally:
+        if pool:
+            pool.shutdown()
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def bench_templates(iterations: int = 20000) -> int:
+    """Print the one-time parse cost and per-render cost of every registered scaffold"""
+    registry = TemplateRegistry()
+    context = "Project type: Python\nLanguage: Python\nProject contains: README.md, setup.py"
+    request = "add retry with backoff to the HTTP client"
+
+    print(f"Template render benchmark ({iterations} renders per type)")
+    if registry.overridden:
+        print(f"Overrides from {registry.directory}: {', '.join(registry.overridden)}")
+    print(f"{'type':<15} {'segments':>8} {'chars':>6} {'parse us':>9} {'render us':>10} {'format us':>10}")
+    for name, template in registry.templates.items():
+        started = time.perf_counter()
+        ScaffoldTemplate(name, template.text)
+        parse_us = (time.perf_counter() - started) * 1e6
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            rendered = template.render(context=context, request=request)
+        render_us = (time.perf_counter() - started) * 1e6 / iterations
+
+        # str.format re-parses the template text on every call; shown for comparison
+        started = time.perf_counter()
+        for _ in range(iterations):
+            template.text.format(context=context, request=request)
+        format_us = (time.perf_counter() - started) * 1e6 / iterations
+
+        print(f"{name:<15} {len(template.parts):>8} {len(rendered):>6} {parse_us:>9.1f} "
+              f"{render_us:>10.3f} {format_us:>10.3f}")
+    return 0
+
+
+def batch_main(argv: List[str]) -> int:
+    """Entry point for `prompt_optimizer.py --batch [INPUT] [--output FILE] [--workers N] [--field NAME]`"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="prompt_optimizer.py --batch",
+                                     description="Scaffold a JSONL file of requests into JSONL results")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL input file, or - for stdin (default)")
+    parser.add_argument("--output", "-o", default="-", help="JSONL output file, or - for stdout (default)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1, in-process)")
+    parser.add_argument("--field", help=f"Object key holding the request (default: first of {', '.join(BATCH_TEXT_FIELDS)})")
+    args = parser.parse_args(argv)
+
+    input_stream = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8')
+    output_stream = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8')
+    try:
+        stats = run_batch(input_stream, output_stream, args.workers, args.field)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+    rate = stats['requests'] / stats['seconds'] if stats['seconds'] else 0.0
+    print(f"Scaffolded {stats['requests']} requests in {stats['seconds']:.2f}s "
+          f"({rate:.0f} requests/s, {stats['workers']} workers)"
+          + (f", {stats['errors']} lines skipped" if stats['errors'] else ""), file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: prompt_optimizer.py '<request>'")
+        print("       prompt_optimizer.py --batch [INPUT.jsonl] [--output OUT.jsonl] [--workers N]")
+        print("       prompt_optimizer.py --bench-templates [ITERATIONS]")
         sys.exit(1)
 
+    if sys.argv[1] == '--batch':
+        sys.exit(batch_main(sys.argv[2:]))
+    if sys.argv[1] == '--bench-templates':
+        sys.exit(bench_templates(int(sys.argv[2]) if len(sys.argv) > 2 else 20000))
+
     user_request = ' '.join(sys.argv[1:])
     optimizer = PromptOptimizer()
     request_type, scaffolded = optimizer.optimize(user_request)
@@ -16,7 +16,7 @@ import argparse
 import subprocess
 import difflib
 from pathlib import Path
-from typing import Dict, Callable
+from typing import Dict, Optional
 
 # This needed a modification for windows and python 3.10 - JPShag
 # Resolved ImportError: cannot import 'setup.utils.ui' because the sibling 'setup' directory was not on sys.path.
@@ -38,6 +38,7 @@ try:
     )
     from setup.utils.logger import setup_logging, get_logger, LogLevel
     from setup import DEFAULT_INSTALL_DIR
+    from setup.operations import OPERATIONS, register_operation_parser
 except ImportError:
     # Provide minimal fallback functions and constants if imports fail
     class Colors:
@@ -58,6 +59,10 @@ except ImportError:
     # Default install directory fallback
     DEFAULT_INSTALL_DIR = Path.home() / ".claude"
 
+    # No parser specs: every operation gets a legacy stub parser
+    OPERATIONS = {}
+    register_operation_parser = None
+
 
 def create_global_parser() -> argparse.ArgumentParser:
     """Create shared parser for global flags used by all commands"""
@@ -139,7 +144,7 @@ def get_operation_modules() -> Dict[str, str]:
 
 
 def load_operation_module(name: str):
-    """Try to dynamically import an operation module"""
+    """Import an operation module; only the operation being run is ever loaded"""
     try:
         return __import__(f"setup.operations.{name}", fromlist=[name])
     except ImportError as e:
@@ -149,16 +154,18 @@ def load_operation_module(name: str):
         return None
 
 
-def register_operation_parsers(subparsers, global_parser) -> Dict[str, Callable]:
-    """Register subcommand parsers and map operation names to their run functions"""
+def register_operation_parsers(subparsers, global_parser) -> Dict[str, Optional[str]]:
+    """
+    Register subcommand parsers from the static OPERATIONS table without importing
+    any operation module; returns operation name -> module path (None for a legacy stub)
+    """
     operations = {}
     for name, desc in get_operation_modules().items():
-        module = load_operation_module(name)
-        if module and hasattr(module, 'register_parser') and hasattr(module, 'run'):
-            module.register_parser(subparsers, global_parser)
-            operations[name] = module.run
+        if name in OPERATIONS:
+            register_operation_parser(subparsers, name, global_parser)
+            operations[name] = OPERATIONS[name]["module"]
         else:
-            # If module doesn't exist, register a stub parser and fallback to legacy
+            # No parser spec: register a stub parser and fallback to legacy
             parser = subparsers.add_parser(name, help=f"{desc} (legacy fallback)", parents=[global_parser])
             parser.add_argument("--legacy", action="store_true", help="Use legacy script")
             operations[name] = None
@@ -221,8 +228,9 @@ def main() -> int:
         setup_global_environment(args)
         logger = get_logger()
 
-        # Execute operation
-        run_func = operations.get(args.operation)
+        # Execute operation, importing its module only now
+        module = load_operation_module(args.operation) if operations[args.operation] else None
+        run_func = getattr(module, 'run', None)
         if run_func:
             if logger:
                 logger.info(f"Executing operation: {args.operation}")
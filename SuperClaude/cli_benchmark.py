@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+SuperClaude CLI Startup Benchmark
+Times fresh `SuperClaude` invocations that never reach an operation's run()
+(help screens and argument errors) and compares them with an eager baseline
+that imports every operation module first, the way the hub used to, so a
+change that brings the installer stack back onto the startup path shows up.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OPERATION_MODULES = ["install", "update", "uninstall", "backup"]
+
+# argv after `SuperClaude` for each measured invocation
+SCENARIOS = {
+    "--help": ["--help"],
+    "backup --help": ["backup", "--help"],
+    "install --help": ["install", "--help"],
+    "no operation": ["--quiet"],
+}
+
+RUNNER = """
+import sys
+for name in {preload!r}:
+    __import__("setup.operations." + name)
+sys.argv = ["SuperClaude"] + {argv!r}
+from SuperClaude.__main__ import main
+try:
+    sys.exit(main())
+except SystemExit as e:
+    sys.exit(e.code)
+"""
+
+
+def run_once(argv: list, preload: list) -> dict:
+    """Run one invocation in a fresh interpreter; returns wall time and import statistics"""
+    code = RUNNER.format(preload=preload, argv=argv)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    import_us = 0
+    setup_modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        import_us += int(self_us)
+        name = name.strip()
+        if name == "setup" or name.startswith("setup."):
+            setup_modules += 1
+    return {"wall_ms": wall_ms, "import_ms": import_us / 1000, "setup_modules": setup_modules}
+
+
+def measure(argv: list, preload: list, runs: int) -> dict:
+    """Median of `runs` invocations"""
+    samples = [run_once(argv, preload) for _ in range(runs)]
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark SuperClaude CLI startup against eager operation loading")
+    parser.add_argument("--runs", type=int, default=10, help="Invocations per scenario and mode (default: 10)")
+    args = parser.parse_args()
+
+    print(f"Median of {args.runs} fresh interpreters per row\n")
+    print(f"{'invocation':<16} {'mode':<6} {'wall ms':>9} {'import ms':>10} {'setup modules':>14}")
+    slower = []
+    for label, argv in SCENARIOS.items():
+        lazy = measure(argv, [], args.runs)
+        eager = measure(argv, OPERATION_MODULES, args.runs)
+        for mode, stats in (("lazy", lazy), ("eager", eager)):
+            print(f"{label:<16} {mode:<6} {stats['wall_ms']:>9.1f} {stats['import_ms']:>10.1f} "
+                  f"{stats['setup_modules']:>14.0f}")
+        saved = eager["import_ms"] - lazy["import_ms"]
+        print(f"{'':<16} saved  {eager['wall_ms'] - lazy['wall_ms']:>9.1f} {saved:>10.1f}\n")
+        if lazy["import_ms"] >= eager["import_ms"]:
+            slower.append(label)
+
+    if slower:
+        print(f"❌ Lazy loading imported no less than eager loading for: {', '.join(slower)}", file=sys.stderr)
+        sys.exit(1)
+    print("✅ Every invocation imports less than with eager operation loading")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
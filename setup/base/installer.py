@@ -2,30 +2,47 @@
 Base installer logic for SuperClaude installation system fixed some issues
 """
 
-from typing import List, Dict, Optional, Set, Tuple, Any
+from typing import List, Dict, Optional, Set, Tuple, Any, TYPE_CHECKING
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 import tempfile
+import time
 from datetime import datetime
 from .component import Component
 
+if TYPE_CHECKING:
+    from ..core.registry import ComponentRegistry
+
+DEFAULT_INSTALL_WORKERS = 4  # Components of one dependency level installed concurrently
+
 
 class Installer:
     """Main installer orchestrator"""
 
     def __init__(self,
                  install_dir: Optional[Path] = None,
-                 dry_run: bool = False):
+                 dry_run: bool = False,
+                 max_workers: int = DEFAULT_INSTALL_WORKERS,
+                 registry: Optional["ComponentRegistry"] = None):
         """
         Initialize installer
         
         Args:
             install_dir: Target installation directory
             dry_run: If True, only simulate installation
+            max_workers: Components installed concurrently within a dependency level (1 = sequential)
+            registry: Component registry that orders installation (default: the bundled components)
         """
-        from .. import DEFAULT_INSTALL_DIR
+        from .. import DEFAULT_INSTALL_DIR, SETUP_DIR
+        if registry is None:
+            from ..core.registry import ComponentRegistry
+            registry = ComponentRegistry(SETUP_DIR / "components")
         self.install_dir = install_dir or DEFAULT_INSTALL_DIR
+        self.registry = registry
         self.dry_run = dry_run
+        self.max_workers = max(1, max_workers)
+        self.results: Dict[str, Dict[str, Any]] = {}
         self.components: Dict[str, Component] = {}
         self.installed_components: Set[str] = set()
         self.updated_components: Set[str] = set()
@@ -96,6 +113,27 @@ class Installer:
 
         return resolved
 
+    def get_installation_levels(self, component_names: List[str]) -> List[List[str]]:
+        """
+        Group components (with their dependencies) into dependency levels
+        
+        Args:
+            component_names: List of component names to install
+            
+        Returns:
+            List of levels in installation order; the components of a level
+            depend only on earlier levels and can be installed in parallel
+            
+        Raises:
+            ValueError: If circular dependencies detected or unknown component
+        """
+        levels = self.registry.get_installation_order(component_names)
+        for level in levels:
+            for name in level:
+                if name not in self.components:
+                    raise ValueError(f"Component not registered with the installer: {name}")
+        return levels
+
     def validate_system_requirements(self) -> Tuple[bool, List[str]]:
         """
         Validate system requirements for all registered components
@@ -203,35 +241,65 @@ class Installer:
         if component_name in self.installed_components:
             return True
 
-        # Check prerequisites
-        success, errors = component.validate_prerequisites()
-        if not success:
-            print(f"Prerequisites failed for {component_name}:")
-            for error in errors:
-                print(f"  - {error}")
-            self.failed_components.add(component_name)
-            return False
-
-        # Perform installation
+        start = time.monotonic()
+        errors: List[str] = []
         try:
-            if self.dry_run:
+            # Check prerequisites
+            success, errors = component.validate_prerequisites()
+            if not success:
+                print(f"Prerequisites failed for {component_name}:")
+                for error in errors:
+                    print(f"  - {error}")
+
+            # Perform installation
+            elif self.dry_run:
                 print(f"[DRY RUN] Would install {component_name}")
-                success = True
             else:
                 success = component.install(config)
-
-            if success:
-                self.installed_components.add(component_name)
-                self.updated_components.add(component_name)
-            else:
-                self.failed_components.add(component_name)
-
-            return success
+                if not success:
+                    errors = ["Installation reported failure (see log)"]
 
         except Exception as e:
             print(f"Error installing {component_name}: {e}")
+            success = False
+            errors = [str(e)]
+
+        if success:
+            self.installed_components.add(component_name)
+            self.updated_components.add(component_name)
+        else:
             self.failed_components.add(component_name)
-            return False
+
+        self.results[component_name] = {
+            'status': 'installed' if success else 'failed',
+            'duration': time.monotonic() - start,
+            'errors': list(errors)
+        }
+        return success
+
+    def _install_level(self, level: List[str], config: Dict[str, Any]) -> bool:
+        """
+        Install one dependency level, concurrently when allowed, and wait for all of it
+        
+        Args:
+            level: Component names whose dependencies are already installed
+            config: Installation configuration
+            
+        Returns:
+            True if every component in the level installed successfully
+        """
+        def install(name: str) -> bool:
+            print(f"\nInstalling {name}...")
+            return self.install_component(name, config)
+
+        workers = min(self.max_workers, len(level))
+        if workers <= 1:
+            return all([install(name) for name in level])
+
+        # Leaving the block joins every worker before the next level starts
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="install") as pool:
+            outcomes = list(pool.map(install, level))
+        return all(outcomes)
 
     def install_components(self,
                            component_names: List[str],
@@ -248,9 +316,9 @@ class Installer:
         """
         config = config or {}
 
-        # Resolve dependencies
+        # Resolve dependencies into levels that can be installed in parallel
         try:
-            ordered_names = self.resolve_dependencies(component_names)
+            levels = self.get_installation_levels(component_names)
         except ValueError as e:
             print(f"Dependency resolution error: {e}")
             return False
@@ -268,13 +336,27 @@ class Installer:
             print("Creating backup of existing installation...")
             self.create_backup()
 
-        # Install each component
+        # Install level by level; a failure skips its dependents but not unrelated components
         all_success = True
-        for name in ordered_names:
-            print(f"\nInstalling {name}...")
-            if not self.install_component(name, config):
+        for level in levels:
+            runnable = []
+            for name in level:
+                blocked = [dep for dep in self.components[name].get_dependencies()
+                           if dep in self.failed_components or dep in self.skipped_components]
+                if blocked:
+                    print(f"\nSkipping {name}: dependency {', '.join(blocked)} was not installed")
+                    self.skipped_components.add(name)
+                    self.results[name] = {
+                        'status': 'skipped',
+                        'duration': 0.0,
+                        'errors': [f"Dependency not installed: {dep}" for dep in blocked]
+                    }
+                    all_success = False
+                else:
+                    runnable.append(name)
+
+            if runnable and not self._install_level(runnable, config):
                 all_success = False
-                # Continue installing other components even if one fails
 
         if not self.dry_run:
             self._run_post_install_validation()
@@ -318,6 +400,7 @@ class Installer:
             'installed': list(self.installed_components),
             'failed': list(self.failed_components),
             'skipped': list(self.skipped_components),
+            'results': dict(self.results),
             'backup_path': str(self.backup_path) if self.backup_path else None,
             'install_dir': str(self.install_dir),
             'dry_run': self.dry_run
@@ -1,15 +1,28 @@
 """Component implementations for SuperClaude installation system"""
 
-from .core import CoreComponent
-from .commands import CommandsComponent
-from .mcp import MCPComponent
-from .hooks import HooksComponent
-from .scripts import ScriptsComponent
+import importlib
+
+# Exported class -> module; each module is imported on first access so that
+# loading one component (as the registry does) does not load them all
+_COMPONENT_MODULES = {
+    'CoreComponent': 'core',
+    'CommandsComponent': 'commands',
+    'MCPComponent': 'mcp',
+    'HooksComponent': 'hooks',
+    'ScriptsComponent': 'scripts'
+}
 
 __all__ = [
     'CoreComponent',
-    'CommandsComponent', 
+    'CommandsComponent',
     'MCPComponent',
     'HooksComponent',
     'ScriptsComponent'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _COMPONENT_MODULES:
+        module = importlib.import_module(f".{_COMPONENT_MODULES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,11 +2,22 @@
 Hooks component for Claude Code hooks integration (future-ready)
 """
 
+import json
+import shutil
+import socket
+import sys
+import time
 from typing import Dict, List, Tuple, Optional, Any
 from pathlib import Path
 
 from ..base.component import Component
 
+# anti_sycophant runtime state (daemon socket, session index, caches, telemetry) under the hooks directory
+HOOK_STATE_DIR = ".anti_sycophant"
+DAEMON_SOCKET = "daemon.sock"
+DAEMON_SHUTDOWN_REQUEST = {"request": "shutdown"}
+DAEMON_SHUTDOWN_TIMEOUT = 2.0  # Seconds to wait for the daemon to save its state and remove the socket
+
 
 class HooksComponent(Component):
     """Claude Code hooks integration component"""
@@ -17,8 +28,18 @@ class HooksComponent(Component):
         
         # Define hook files to install
         self.hook_files = [
-            "anti_sycophant.py"  # Anti-sycophantic behavior hook
+            "anti_sycophant.py",         # Anti-sycophantic behavior hook
+            "anti_sycophant_client.py",  # Thin client forwarding Stop events to the daemon
+            "anti_sycophant_daemon.py"   # Optional resident detector daemon
         ]
+
+        # Resident daemon mode (set from the installation config)
+        self.use_daemon = False
+        self.daemon_idle_timeout = 900
+
+        # Extra anti_sycophant rule packs and notification backend (set from the installation config)
+        self.rule_packs: List[str] = []
+        self.notifier = "auto"
         
         # Set component_files for base class
         self.component_files = self.hook_files
@@ -64,6 +85,14 @@ class HooksComponent(Component):
         """Install hooks component"""
         self.logger.info("Installing SuperClaude hooks component...")
 
+        # Options not given on the command line (e.g. during update) keep the saved choice
+        saved = self.settings_manager.get_hook_config("anti_sycophant")
+        self.use_daemon = self._choice(config, "hook_daemon", saved, "daemon", False)
+        self.daemon_idle_timeout = self._choice(config, "hook_daemon_idle_timeout", saved,
+                                                "daemon_idle_timeout", self.daemon_idle_timeout)
+        self.rule_packs = config.get("hook_rule_packs") or []
+        self.notifier = self._choice(config, "hook_notifier", saved, "notifier", "auto")
+
         # Check if source directory exists
         source_dir = self._get_source_dir()
 
@@ -171,10 +200,28 @@ For more information, see SuperClaude documentation.
 
             # Configure anti_sycophant hook in settings.json if it was installed
             anti_sycophant_path = self.install_component_subdir / "anti_sycophant.py"
-            if anti_sycophant_path.exists():
+            client_path = self.install_component_subdir / "anti_sycophant_client.py"
+            if self.use_daemon and client_path.exists():
+                # The client forwards events to the resident daemon (started on first use)
+                command = f"{client_path} --idle-timeout {self.daemon_idle_timeout}"
+                self.settings_manager.add_stop_hook(command, timeout=5)
+                self.logger.info("Configured anti_sycophant hook (daemon mode) in settings.json")
+            elif anti_sycophant_path.exists():
                 self.settings_manager.add_stop_hook(str(anti_sycophant_path), timeout=5)
                 self.logger.info("Configured anti_sycophant hook in settings.json")
 
+            # Runtime configuration read by the hook (merged with anti_sycophant_rules/*.json)
+            hook_config = self.settings_manager.get_hook_config("anti_sycophant")
+            hook_config["notifier"] = self._resolve_notifier()
+            hook_config["daemon"] = self.use_daemon
+            hook_config["daemon_idle_timeout"] = self.daemon_idle_timeout
+            if self.rule_packs:
+                existing_packs = hook_config.get("rule_packs", [])
+                hook_config["rule_packs"] = existing_packs + [p for p in self.rule_packs if p not in existing_packs]
+                self.logger.info(f"Registered {len(self.rule_packs)} anti_sycophant rule pack(s)")
+            self.settings_manager.set_hook_config("anti_sycophant", hook_config)
+            self.logger.info(f"anti_sycophant notifications: {hook_config['notifier']}")
+
             self.logger.info("Updated metadata with hooks component registration")
         except Exception as e:
             self.logger.error(f"Failed to update metadata: {e}")
@@ -203,6 +250,15 @@ For more information, see SuperClaude documentation.
                 removed_count += 1
                 self.logger.debug("Removed hooks placeholder")
             
+            # Stop a running daemon before its state directory goes away
+            state_dir = self.install_component_subdir / HOOK_STATE_DIR
+            self._stop_daemon(state_dir / DAEMON_SOCKET)
+            if state_dir.exists():
+                if self.file_manager.remove_directory(state_dir, recursive=True):
+                    self.logger.debug("Removed anti_sycophant state directory")
+                else:
+                    self.logger.warning(f"Could not remove {state_dir}")
+
             # Remove hooks directory if empty
             try:
                 if self.install_component_subdir.exists():
@@ -218,6 +274,12 @@ For more information, see SuperClaude documentation.
                 if self.settings_manager.is_component_installed("hooks"):
                     self.settings_manager.remove_component_registration("hooks")
                     self.logger.info("Removed hooks component from metadata")
+                
+                # Drop the saved daemon, notifier and rule-pack choices with the hook
+                if self.settings_manager.remove_metadata_setting("hook_config.anti_sycophant"):
+                    if not self.settings_manager.get_metadata_setting("hook_config"):
+                        self.settings_manager.remove_metadata_setting("hook_config")
+                    self.logger.debug("Removed anti_sycophant hook configuration from metadata")
                     
                 # Remove hooks configuration from settings.json
                 settings = self.settings_manager.load_settings()
@@ -232,7 +294,7 @@ For more information, see SuperClaude documentation.
                         if "hooks" in hook_config:
                             filtered_hook_list = []
                             for hook in hook_config["hooks"]:
-                                if hook.get("command", "").endswith("anti_sycophant.py"):
+                                if self._is_anti_sycophant_command(hook.get("command", "")):
                                     hooks_removed = True
                                     continue
                                 filtered_hook_list.append(hook)
@@ -265,6 +327,49 @@ For more information, see SuperClaude documentation.
             self.logger.exception(f"Unexpected error during hooks uninstallation: {e}")
             return False
     
+    def _stop_daemon(self, socket_path: Path) -> None:
+        """Ask a running anti_sycophant daemon to exit and wait until it has removed its socket"""
+        if not socket_path.exists() or not hasattr(socket, "AF_UNIX"):
+            return
+
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.settimeout(DAEMON_SHUTDOWN_TIMEOUT)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(DAEMON_SHUTDOWN_REQUEST).encode('utf-8'))
+            client.shutdown(socket.SHUT_WR)
+            client.recv(1)  # Returns once the daemon closes the connection
+        except OSError:
+            # Nobody is listening: the socket is stale and is removed with the state directory
+            return
+        finally:
+            client.close()
+
+        deadline = time.monotonic() + DAEMON_SHUTDOWN_TIMEOUT
+        while socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.logger.info("Stopped the anti_sycophant daemon")
+
+    @staticmethod
+    def _choice(config: Dict[str, Any], key: str, saved: Dict[str, Any], saved_key: str, default: Any) -> Any:
+        """Return a hook option from the installation config, else the saved hook_config, else the default"""
+        if config.get(key) is not None:
+            return config[key]
+        return saved.get(saved_key, default)
+
+    def _resolve_notifier(self) -> str:
+        """Pick the notification backend once at install time so the hook never probes for it"""
+        if self.notifier != "auto":
+            return self.notifier
+        if sys.platform == "darwin" or shutil.which("notify-send"):
+            return "detached"
+        return "none"
+
+    def _is_anti_sycophant_command(self, command: str) -> bool:
+        """Check if a Stop hook command runs the anti_sycophant hook (directly or via the daemon client)"""
+        executable = command.split(" ", 1)[0]
+        return executable.endswith("anti_sycophant.py") or executable.endswith("anti_sycophant_client.py")
+
     def get_dependencies(self) -> List[str]:
         """Get dependencies"""
         return ["core"]
@@ -2,14 +2,115 @@
 MCP component for MCP server integration
 """
 
+import re
 import subprocess
 import sys
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Tuple, Optional, Any
 from pathlib import Path
 
 from ..base.component import Component
 from ..utils.ui import display_info, display_warning
 
+MCP_LIST_TIMEOUT = 15      # Seconds for `claude mcp list`
+MCP_ADD_TIMEOUT = 120      # Default per-server deadline for fetch + `claude mcp add` (override with "timeout")
+MCP_INSTALL_WORKERS = 4    # Servers provisioned at once
+
+# `claude mcp add` and `claude mcp remove` each rewrite ~/.claude.json in full,
+# so concurrent calls lose each other's changes; run them one at a time
+_MCP_CONFIG_LOCK = threading.Lock()
+
+# `claude mcp list` prints one "name: command-or-url [- status]" line per server
+_MCP_LIST_ENTRY = re.compile(r"^\s*([\w.-]+):\s")
+
+
+def parse_mcp_list(output: str) -> Dict[str, Dict[str, str]]:
+    """
+    Parse `claude mcp list` output
+    
+    Returns:
+        Dict mapping server name to its target (command or URL) and health status
+        (empty when the CLI does not report one)
+    """
+    servers = {}
+    for line in output.splitlines():
+        match = _MCP_LIST_ENTRY.match(line)
+        if match:
+            target, separator, status = line[match.end():].strip().rpartition(" - ")
+            if not separator:
+                target, status = status, ""
+            servers[match.group(1)] = {"target": target, "status": status}
+    return servers
+
+
+class MCPInventory:
+    """
+    Installed MCP servers, read with one `claude mcp list` and kept up to date
+    as servers are added or removed. Lookups are by exact name, so "magic" is
+    not reported installed because "magic-extra" is.
+    """
+    
+    def __init__(self, logger=None):
+        self.logger = logger
+        self._servers: Optional[Dict[str, Dict[str, str]]] = None
+        self._lock = threading.Lock()
+    
+    def servers(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Installed servers, listing them on first use after an invalidation
+        
+        Returns:
+            Dict of server name to details, or None if the Claude CLI could not list them
+        """
+        with self._lock:
+            if self._servers is None:
+                self._servers = self._list()
+            return self._servers
+    
+    def contains(self, server_name: str) -> bool:
+        """Check whether a server with exactly this name is installed"""
+        servers = self.servers()
+        return servers is not None and server_name in servers
+    
+    def record(self, server_name: str, details: Optional[Dict[str, str]]) -> None:
+        """Apply a completed add (details) or remove (None) to the listing without listing again"""
+        with self._lock:
+            if self._servers is None:
+                return
+            if details is None:
+                self._servers.pop(server_name, None)
+            else:
+                self._servers[server_name] = details
+    
+    def invalidate(self) -> None:
+        """Forget the listing, so the next lookup asks the Claude CLI again"""
+        with self._lock:
+            self._servers = None
+    
+    def _list(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Run `claude mcp list`; failures are not cached, so the next lookup retries"""
+        try:
+            result = subprocess.run(
+                ["claude", "mcp", "list"],
+                capture_output=True,
+                text=True,
+                timeout=MCP_LIST_TIMEOUT,
+                shell=(sys.platform == "win32")
+            )
+        except (subprocess.SubprocessError, OSError) as e:
+            if self.logger:
+                self.logger.warning(f"Error checking MCP server status: {e}")
+            return None
+        
+        if result.returncode != 0:
+            if self.logger:
+                self.logger.warning(f"Could not list MCP servers: {result.stderr}")
+            return None
+        
+        return parse_mcp_list(result.stdout)
+
 
 class MCPComponent(Component):
     """MCP servers integration component"""
@@ -18,6 +119,9 @@ class MCPComponent(Component):
         """Initialize MCP component"""
         super().__init__(install_dir)
         
+        # Installed servers, listed once and shared by install, uninstall, update and validation
+        self.inventory = MCPInventory(self.logger)
+        
         # Define MCP servers to install
         self.mcp_servers = {
             "sequential-thinking": {
@@ -57,68 +161,53 @@ class MCPComponent(Component):
             "category": "integration"
         }
     
-    def validate_prerequisites(self, installSubPath: Optional[Path] = None) -> Tuple[bool, List[str]]:
-        """Check prerequisites"""
-        errors = []
-        
-        # Check if Node.js is available
+    def _tool_version(self, tool: str) -> Optional[str]:
+        """Run `<tool> --version`; None if the tool is missing or fails"""
         try:
             result = subprocess.run(
-                ["node", "--version"], 
+                [tool, "--version"], 
                 capture_output=True, 
                 text=True, 
                 timeout=10,
                 shell=(sys.platform == "win32")
             )
-            if result.returncode != 0:
-                errors.append("Node.js not found - required for MCP servers")
-            else:
-                version = result.stdout.strip()
-                self.logger.debug(f"Found Node.js {version}")
-                
-                # Check version (require 18+)
-                try:
-                    version_num = int(version.lstrip('v').split('.')[0])
-                    if version_num < 18:
-                        errors.append(f"Node.js version {version} found, but version 18+ required")
-                except:
-                    self.logger.warning(f"Could not parse Node.js version: {version}")
         except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    def validate_prerequisites(self, installSubPath: Optional[Path] = None) -> Tuple[bool, List[str]]:
+        """Check prerequisites"""
+        errors = []
+        
+        # The version probes only read, so they run side by side
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            node_version, claude_version, npm_version = pool.map(self._tool_version, ["node", "claude", "npm"])
+        
+        # Check if Node.js is available
+        if node_version is None:
             errors.append("Node.js not found - required for MCP servers")
+        else:
+            self.logger.debug(f"Found Node.js {node_version}")
+            
+            # Check version (require 18+)
+            try:
+                version_num = int(node_version.lstrip('v').split('.')[0])
+                if version_num < 18:
+                    errors.append(f"Node.js version {node_version} found, but version 18+ required")
+            except:
+                self.logger.warning(f"Could not parse Node.js version: {node_version}")
         
         # Check if Claude CLI is available
-        try:
-            result = subprocess.run(
-                ["claude", "--version"], 
-                capture_output=True, 
-                text=True, 
-                timeout=10,
-                shell=(sys.platform == "win32")
-            )
-            if result.returncode != 0:
-                errors.append("Claude CLI not found - required for MCP server management")
-            else:
-                version = result.stdout.strip()
-                self.logger.debug(f"Found Claude CLI {version}")
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        if claude_version is None:
             errors.append("Claude CLI not found - required for MCP server management")
+        else:
+            self.logger.debug(f"Found Claude CLI {claude_version}")
         
         # Check if npm is available
-        try:
-            result = subprocess.run(
-                ["npm", "--version"], 
-                capture_output=True, 
-                text=True, 
-                timeout=10,
-                shell=(sys.platform == "win32")
-            )
-            if result.returncode != 0:
-                errors.append("npm not found - required for MCP server installation")
-            else:
-                version = result.stdout.strip()
-                self.logger.debug(f"Found npm {version}")
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        if npm_version is None:
             errors.append("npm not found - required for MCP server installation")
+        else:
+            self.logger.debug(f"Found npm {npm_version}")
         
         return len(errors) == 0, errors
     
@@ -145,109 +234,207 @@ class MCPComponent(Component):
     
     def _check_mcp_server_installed(self, server_name: str) -> bool:
         """Check if MCP server is already installed"""
+        return self.inventory.contains(server_name)
+    
+    def _announce_api_key(self, server_info: Dict[str, Any], config: Dict[str, Any]) -> None:
+        """Tell the user about a server's API key requirement"""
+        if "api_key_env" not in server_info or config.get("dry_run", False):
+            return
+        
+        server_name = server_info["name"]
+        api_key_env = server_info["api_key_env"]
+        api_key_desc = server_info.get("api_key_description", f"API key for {server_name}")
+        
+        display_info(f"MCP server '{server_name}' requires an API key")
+        display_info(f"Environment variable: {api_key_env}")
+        display_info(f"Description: {api_key_desc}")
+        
+        # Check if API key is already set
+        import os
+        if not os.getenv(api_key_env):
+            display_warning(f"API key {api_key_env} not found in environment")
+            self.logger.warning(f"Proceeding without {api_key_env} - server may not function properly")
+    
+    def _fetch_mcp_package(self, server_info: Dict[str, Any], deadline: float) -> Optional[str]:
+        """
+        Download a server's npm package into the npx cache, so its first start does not
+        have to. Touches no Claude configuration, so servers fetch side by side.
+        
+        Returns:
+            Error message, or None once the package is cached
+        """
+        npm_package = server_info["npm_package"]
+        
+        self.logger.debug(f"Running: npm exec --yes --package {npm_package} -- node --version")
         try:
             result = subprocess.run(
-                ["claude", "mcp", "list"], 
-                capture_output=True, 
-                text=True, 
-                timeout=15,
+                ["npm", "exec", "--yes", "--package", npm_package, "--", "node", "--version"],
+                capture_output=True,
+                text=True,
+                timeout=max(deadline - time.monotonic(), 0.1),
                 shell=(sys.platform == "win32")
             )
-            
-            if result.returncode != 0:
-                self.logger.warning(f"Could not list MCP servers: {result.stderr}")
-                return False
-            
-            # Parse output to check if server is installed
-            output = result.stdout.lower()
-            return server_name.lower() in output
-            
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
-            self.logger.warning(f"Error checking MCP server status: {e}")
-            return False
+        except subprocess.TimeoutExpired:
+            return "timed out fetching the package"
+        except Exception as e:
+            return str(e)
+        
+        if result.returncode != 0:
+            return result.stderr.strip() if result.stderr else "Unknown error"
+        return None
     
-    def _install_mcp_server(self, server_info: Dict[str, Any], config: Dict[str, Any]) -> bool:
-        """Install a single MCP server"""
+    def _add_mcp_server(self, server_info: Dict[str, Any], deadline: Optional[float] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Run `claude mcp add` for one server within its deadline, one add at a time
+        
+        Returns:
+            Tuple of (success, error message)
+        """
         server_name = server_info["name"]
         npm_package = server_info["npm_package"]
-        
+        budget = server_info.get("timeout", MCP_ADD_TIMEOUT)
         command = "npx"
         
+        self.logger.debug(f"Running: claude mcp add -s user {server_name} {command} -y {npm_package}")
+        try:
+            with _MCP_CONFIG_LOCK:
+                timeout = budget if deadline is None else deadline - time.monotonic()
+                if timeout <= 0:
+                    self.logger.error(f"Timeout installing MCP server {server_name}")
+                    return False, f"timed out after {budget}s"
+                result = subprocess.run(
+                    ["claude", "mcp", "add", "-s", "user", "--", server_name, command, "-y", npm_package],
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout,
+                    shell=(sys.platform == "win32")
+                )
+        except subprocess.TimeoutExpired:
+            # The add may still have been written
+            self.inventory.invalidate()
+            self.logger.error(f"Timeout installing MCP server {server_name}")
+            return False, f"timed out after {budget}s"
+        except Exception as e:
+            self.inventory.invalidate()
+            self.logger.error(f"Error installing MCP server {server_name}: {e}")
+            return False, str(e)
+        
+        if result.returncode == 0:
+            self.inventory.record(server_name, {"target": f"{command} -y {npm_package}", "status": ""})
+            self.logger.success(f"Successfully installed MCP server (user scope): {server_name}")
+            return True, None
+        
+        error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+        self.logger.error(f"Failed to install MCP server {server_name}: {error_msg}")
+        return False, error_msg
+    
+    def _install_mcp_server(self, server_info: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Install a single MCP server unless the inventory already lists it
+        
+        Returns:
+            Result dict: status (present, installed, planned, failed),
+            duration in seconds and error message
+        """
+        server_name = server_info["name"]
+        start = time.monotonic()
+        
         try:
             self.logger.info(f"Installing MCP server: {server_name}")
             
             # Check if already installed
             if self._check_mcp_server_installed(server_name):
                 self.logger.info(f"MCP server {server_name} already installed")
-                return True
+                return {"status": "present", "duration": 0.0, "error": None}
             
-            # Handle API key requirements
-            if "api_key_env" in server_info:
-                api_key_env = server_info["api_key_env"]
-                api_key_desc = server_info.get("api_key_description", f"API key for {server_name}")
-                
-                if not config.get("dry_run", False):
-                    display_info(f"MCP server '{server_name}' requires an API key")
-                    display_info(f"Environment variable: {api_key_env}")
-                    display_info(f"Description: {api_key_desc}")
-                    
-                    # Check if API key is already set
-                    import os
-                    if not os.getenv(api_key_env):
-                        display_warning(f"API key {api_key_env} not found in environment")
-                        self.logger.warning(f"Proceeding without {api_key_env} - server may not function properly")
+            self._announce_api_key(server_info, config)
             
             # Install using Claude CLI
             if config.get("dry_run"):
-                self.logger.info(f"Would install MCP server (user scope): claude mcp add -s user {server_name} {command} -y {npm_package}")
-                return True
-            
-            self.logger.debug(f"Running: claude mcp add -s user {server_name} {command} -y {npm_package}")
-            
-            result = subprocess.run(
-                ["claude", "mcp", "add", "-s", "user", "--", server_name, command, "-y", npm_package],
-                capture_output=True,
-                text=True,
-                timeout=120,  # 2 minutes timeout for installation
-                shell=(sys.platform == "win32")
-            )
+                self.logger.info(f"Would install MCP server (user scope): claude mcp add -s user {server_name} npx -y {server_info['npm_package']}")
+                return {"status": "planned", "duration": 0.0, "error": None}
             
-            if result.returncode == 0:
-                self.logger.success(f"Successfully installed MCP server (user scope): {server_name}")
-                return True
-            else:
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                self.logger.error(f"Failed to install MCP server {server_name}: {error_msg}")
-                return False
+            # Fetching is the slow part and runs concurrently; only the add is serialized
+            deadline = start + server_info.get("timeout", MCP_ADD_TIMEOUT)
+            fetch_error = self._fetch_mcp_package(server_info, deadline)
+            if fetch_error:
+                self.logger.warning(f"Could not fetch {server_info['npm_package']} ({fetch_error}); npx will fetch it on first start")
+            success, error = self._add_mcp_server(server_info, deadline)
                 
-        except subprocess.TimeoutExpired:
-            self.logger.error(f"Timeout installing MCP server {server_name}")
-            return False
         except Exception as e:
             self.logger.error(f"Error installing MCP server {server_name}: {e}")
-            return False
+            success, error = False, str(e)
+        
+        return {"status": "installed" if success else "failed",
+                "duration": time.monotonic() - start, "error": error}
+    
+    def _provision_mcp_servers(self, config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Install every missing MCP server
+        
+        The inventory's one `claude mcp list` finds the servers already present. The missing
+        ones are provisioned in parallel (at most MCP_INSTALL_WORKERS at a time, each within
+        its own deadline): packages download concurrently and only the `claude mcp add`
+        config writes queue behind each other, so the install takes about as long as the
+        slowest download. One fresh listing afterwards confirms the adds were recorded.
+        
+        Returns:
+            Dict mapping server name to its _install_mcp_server result
+        """
+        # List once up front; the workers all read the cached inventory
+        self.inventory.servers()
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=MCP_INSTALL_WORKERS) as pool:
+            futures = {server_name: pool.submit(self._install_mcp_server, server_info, config)
+                       for server_name, server_info in self.mcp_servers.items()}
+            for server_name, future in futures.items():
+                results[server_name] = future.result()
+        
+        # Verify installation
+        added = [name for name, result in results.items() if result["status"] == "installed"]
+        if added:
+            self.logger.info("Verifying MCP server installation...")
+            self.inventory.invalidate()
+            listed = self.inventory.servers()
+            if listed is None:
+                self.logger.warning("Could not verify MCP server installation")
+            else:
+                self.logger.debug(f"MCP servers listed: {', '.join(sorted(listed))}")
+                for server_name in added:
+                    if server_name not in listed:
+                        self.logger.error(f"MCP server {server_name} not listed after install")
+                        results[server_name].update(status="failed", error="not listed after install")
+        
+        return results
     
     def _uninstall_mcp_server(self, server_name: str) -> bool:
         """Uninstall a single MCP server"""
+        self.logger.info(f"Uninstalling MCP server: {server_name}")
+        
+        # Check if installed
+        if not self._check_mcp_server_installed(server_name):
+            self.logger.info(f"MCP server {server_name} not installed")
+            return True
+        
+        return self._remove_mcp_server(server_name)
+    
+    def _remove_mcp_server(self, server_name: str) -> bool:
+        """Run `claude mcp remove` for an installed server"""
         try:
-            self.logger.info(f"Uninstalling MCP server: {server_name}")
-            
-            # Check if installed
-            if not self._check_mcp_server_installed(server_name):
-                self.logger.info(f"MCP server {server_name} not installed")
-                return True
-            
             self.logger.debug(f"Running: claude mcp remove {server_name} (auto-detect scope)")
             
-            result = subprocess.run(
-                ["claude", "mcp", "remove", server_name],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                shell=(sys.platform == "win32")
-            )
+            with _MCP_CONFIG_LOCK:
+                result = subprocess.run(
+                    ["claude", "mcp", "remove", server_name],
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                    shell=(sys.platform == "win32")
+                )
             
             if result.returncode == 0:
+                self.inventory.record(server_name, None)
                 self.logger.success(f"Successfully uninstalled MCP server: {server_name}")
                 return True
             else:
@@ -256,9 +443,12 @@ class MCPComponent(Component):
                 return False
                 
         except subprocess.TimeoutExpired:
+            # The remove may still have been written
+            self.inventory.invalidate()
             self.logger.error(f"Timeout uninstalling MCP server {server_name}")
             return False
         except Exception as e:
+            self.inventory.invalidate()
             self.logger.error(f"Error uninstalling MCP server {server_name}: {e}")
             return False
     
@@ -273,43 +463,20 @@ class MCPComponent(Component):
                 self.logger.error(error)
             return False
 
-        # Install each MCP server
-        installed_count = 0
-        failed_servers = []
-
-        for server_name, server_info in self.mcp_servers.items():
-            if self._install_mcp_server(server_info, config):
-                installed_count += 1
-            else:
-                failed_servers.append(server_name)
-                
-                # Check if this is a required server
-                if server_info.get("required", False):
-                    self.logger.error(f"Required MCP server {server_name} failed to install")
-                    return False
-
-        # Verify installation
-        if not config.get("dry_run", False):
-            self.logger.info("Verifying MCP server installation...")
-            try:
-                result = subprocess.run(
-                    ["claude", "mcp", "list"],
-                    capture_output=True,
-                    text=True,
-                    timeout=15,
-                    shell=(sys.platform == "win32")
-                )
-                
-                if result.returncode == 0:
-                    self.logger.debug("MCP servers list:")
-                    for line in result.stdout.strip().split('\n'):
-                        if line.strip():
-                            self.logger.debug(f"  {line.strip()}")
-                else:
-                    self.logger.warning("Could not verify MCP server installation")
-                    
-            except Exception as e:
-                self.logger.warning(f"Could not verify MCP installation: {e}")
+        # Install the missing MCP servers concurrently
+        results = self._provision_mcp_servers(config)
+        installed_count = sum(1 for result in results.values() if result["status"] != "failed")
+        failed_servers = [name for name, result in results.items() if result["status"] == "failed"]
+        
+        for server_name in failed_servers:
+            self.logger.debug(f"MCP server {server_name}: {results[server_name]['error']}")
+        
+        # Check if any of the failures is a required server
+        failed_required = [name for name in failed_servers if self.mcp_servers[name].get("required", False)]
+        if failed_required:
+            for server_name in failed_required:
+                self.logger.error(f"Required MCP server {server_name} failed to install")
+            return False
 
         if failed_servers:
             self.logger.warning(f"Some MCP servers failed to install: {failed_servers}")
@@ -345,7 +512,7 @@ class MCPComponent(Component):
         try:
             self.logger.info("Uninstalling SuperClaude MCP servers...")
             
-            # Uninstall each MCP server
+            # Uninstall each MCP server, checked against the shared inventory
             uninstalled_count = 0
             
             for server_name in self.mcp_servers.keys():
@@ -357,10 +524,7 @@ class MCPComponent(Component):
                 if self.settings_manager.is_component_installed("mcp"):
                     self.settings_manager.remove_component_registration("mcp")
                     # Also remove MCP configuration from metadata
-                    metadata = self.settings_manager.load_metadata()
-                    if "mcp" in metadata:
-                        del metadata["mcp"]
-                        self.settings_manager.save_metadata(metadata)
+                    self.settings_manager.remove_metadata_setting("mcp")
                     self.logger.info("Removed MCP component from metadata")
             except Exception as e:
                 self.logger.warning(f"Could not update metadata: {e}")
@@ -391,36 +555,35 @@ class MCPComponent(Component):
             
             self.logger.info(f"Updating MCP component from {current_version} to {target_version}")
             
-            # For MCP servers, update means reinstall to get latest versions
-            updated_count = 0
-            failed_servers = []
+            # For MCP servers, update means reinstall to get latest versions:
+            # remove the installed ones, then provision them all again concurrently
+            not_removed = []
+            if not config.get("dry_run", False):
+                for server_name in self.mcp_servers:
+                    if not self._uninstall_mcp_server(server_name):
+                        not_removed.append(server_name)
             
-            for server_name, server_info in self.mcp_servers.items():
-                try:
-                    # Uninstall old version
-                    if self._check_mcp_server_installed(server_name):
-                        self._uninstall_mcp_server(server_name)
-                    
-                    # Install new version
-                    if self._install_mcp_server(server_info, config):
-                        updated_count += 1
-                    else:
-                        failed_servers.append(server_name)
-                        
-                except Exception as e:
-                    self.logger.error(f"Error updating MCP server {server_name}: {e}")
-                    failed_servers.append(server_name)
+            results = self._provision_mcp_servers(config)
+            # A server that could not be removed is still listed, so provisioning reports it
+            # present without reinstalling it; that server was not updated
+            for server_name in not_removed:
+                results[server_name] = {"status": "failed", "duration": 0.0, "error": "could not remove for reinstall"}
+            failed_servers = [name for name, result in results.items() if result["status"] == "failed"]
             
             # Update metadata
             try:
                 # Update component version in metadata
-                metadata = self.settings_manager.load_metadata()
-                if "components" in metadata and "mcp" in metadata["components"]:
-                    metadata["components"]["mcp"]["version"] = target_version
-                    metadata["components"]["mcp"]["servers_count"] = len(self.mcp_servers)
-                if "mcp" in metadata:
-                    metadata["mcp"]["servers"] = list(self.mcp_servers.keys())
-                self.settings_manager.save_metadata(metadata)
+                self.settings_manager.update_metadata({
+                    "components": {
+                        "mcp": {
+                            "version": target_version,
+                            "servers_count": len(self.mcp_servers)
+                        }
+                    },
+                    "mcp": {
+                        "servers": list(self.mcp_servers.keys())
+                    }
+                })
             except Exception as e:
                 self.logger.warning(f"Could not update metadata: {e}")
             
@@ -450,28 +613,14 @@ class MCPComponent(Component):
         if installed_version != expected_version:
             errors.append(f"Version mismatch: installed {installed_version}, expected {expected_version}")
         
-        # Check if Claude CLI is available
-        try:
-            result = subprocess.run(
-                ["claude", "mcp", "list"],
-                capture_output=True,
-                text=True,
-                timeout=15,
-                shell=(sys.platform == "win32")
-            )
-            
-            if result.returncode != 0:
-                errors.append("Could not communicate with Claude CLI for MCP server verification")
-            else:
-                # Check if required servers are installed
-                output = result.stdout.lower()
-                for server_name, server_info in self.mcp_servers.items():
-                    if server_info.get("required", False):
-                        if server_name.lower() not in output:
-                            errors.append(f"Required MCP server not found: {server_name}")
-                            
-        except Exception as e:
-            errors.append(f"Could not verify MCP server installation: {e}")
+        # Check required servers against the inventory (listed at most once per operation)
+        installed = self.inventory.servers()
+        if installed is None:
+            errors.append("Could not communicate with Claude CLI for MCP server verification")
+        else:
+            for server_name, server_info in self.mcp_servers.items():
+                if server_info.get("required", False) and server_name not in installed:
+                    errors.append(f"Required MCP server not found: {server_name}")
         
         return len(errors) == 0, errors
     
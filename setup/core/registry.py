@@ -2,27 +2,54 @@
 Component registry for auto-discovery and dependency resolution
 """
 
+import hashlib
 import importlib
 import inspect
-from typing import Dict, List, Set, Optional, Type
+import json
+import os
+from typing import Dict, List, Set, Optional, Type, Any
 from pathlib import Path
 from ..base.component import Component
 
+MANIFEST_VERSION = 1
+
+
+def _file_hash(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
 
 class ComponentRegistry:
-    """Auto-discovery and management of installable components"""
+    """
+    Auto-discovery and management of installable components
+
+    Discovery imports and instantiates every component once, then records each
+    one's name, class path, metadata, dependencies and category in a manifest
+    keyed by the component sources' mtimes (and hashes, when only the mtime
+    changed). While the manifest is current, listing, metadata and dependency
+    resolution are answered from it and a component's module is imported only
+    when its class or an instance is requested.
+    """
     
-    def __init__(self, components_dir: Path):
+    def __init__(self, components_dir: Path, manifest_path: Optional[Path] = None):
         """
         Initialize component registry
         
         Args:
             components_dir: Directory containing component modules
+            manifest_path: Manifest cache file (defaults to one per components_dir in CACHE_DIR)
         """
         self.components_dir = components_dir
         self.component_classes: Dict[str, Type[Component]] = {}
         self.component_instances: Dict[str, Component] = {}
         self.dependency_graph: Dict[str, Set[str]] = {}
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        if manifest_path is None:
+            from .. import CACHE_DIR
+            key = hashlib.sha1(str(Path(components_dir).resolve()).encode("utf-8")).hexdigest()[:12]
+            manifest_path = CACHE_DIR / f"component_manifest_{key}.json"
+        self.manifest_path = manifest_path
+        self.use_manifest = os.environ.get("SUPERCLAUDE_NO_CACHE") != "1"
         self._discovered = False
     
     def discover_components(self, force_reload: bool = False) -> None:
@@ -30,7 +57,7 @@ class ComponentRegistry:
         Auto-discover all component classes in components directory
         
         Args:
-            force_reload: Force rediscovery even if already done
+            force_reload: Force rediscovery (importing every component) even if already done
         """
         if self._discovered and not force_reload:
             return
@@ -38,10 +65,20 @@ class ComponentRegistry:
         self.component_classes.clear()
         self.component_instances.clear()
         self.dependency_graph.clear()
+        self.manifest = {}
         
         if not self.components_dir.exists():
             return
         
+        sources = self._source_files()
+        if self.use_manifest and not force_reload:
+            manifest = self._read_manifest(sources)
+            if manifest is not None:
+                self.manifest = manifest
+                self._build_dependency_graph()
+                self._discovered = True
+                return
+        
         # Add components directory to Python path temporarily
         import sys
         original_path = sys.path.copy()
@@ -67,10 +104,12 @@ class ComponentRegistry:
         # Build dependency graph
         self._build_dependency_graph()
         self._discovered = True
+        if self.use_manifest:
+            self._write_manifest(sources)
     
     def _load_component_module(self, module_name: str) -> None:
         """
-        Load component classes from a module
+        Load component classes from a module and record them in the manifest
         
         Args:
             module_name: Name of module to load
@@ -97,23 +136,82 @@ class ComponentRegistry:
                         
                     except Exception as e:
                         print(f"Warning: Could not instantiate component {name}: {e}")
+                        continue
+                    
+                    try:
+                        dependencies = list(instance.get_dependencies())
+                    except Exception as e:
+                        print(f"Warning: Could not get dependencies for {component_name}: {e}")
+                        dependencies = []
+                    
+                    self.manifest[component_name] = {
+                        "module": obj.__module__,
+                        "class": obj.__name__,
+                        "metadata": dict(metadata),
+                        "dependencies": dependencies,
+                        "category": metadata.get("category", "unknown")
+                    }
         
         except Exception as e:
             print(f"Warning: Could not load component module {module_name}: {e}")
     
     def _build_dependency_graph(self) -> None:
         """Build dependency graph for all discovered components"""
-        for name, instance in self.component_instances.items():
-            try:
-                dependencies = instance.get_dependencies()
-                self.dependency_graph[name] = set(dependencies)
-            except Exception as e:
-                print(f"Warning: Could not get dependencies for {name}: {e}")
-                self.dependency_graph[name] = set()
+        for name, entry in self.manifest.items():
+            self.dependency_graph[name] = set(entry["dependencies"])
+    
+    def _source_files(self) -> Dict[str, Path]:
+        """Files the manifest depends on: every component module plus the Component base class"""
+        sources = {
+            py_file.name: py_file for py_file in self.components_dir.glob("*.py")
+            if not py_file.name.startswith("__")
+        }
+        sources["base/component.py"] = Path(inspect.getfile(Component))
+        return sources
+    
+    def _read_manifest(self, sources: Dict[str, Path]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Return the stored manifest if it was generated from the current sources
+        
+        Args:
+            sources: Current source files by name
+            
+        Returns:
+            Manifest components or None if missing or stale
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION or set(data["sources"]) != set(sources):
+                return None
+            for name, path in sources.items():
+                mtime_ns, size, digest = data["sources"][name]
+                stat = path.stat()
+                # A checkout or touch changes the mtime without changing the code
+                if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size) and _file_hash(path) != digest:
+                    return None
+            return data["components"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def _write_manifest(self, sources: Dict[str, Path]) -> None:
+        """Store the manifest atomically; failures only cost a full discovery next time"""
+        temp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        try:
+            stamps = {}
+            for name, path in sources.items():
+                stat = path.stat()
+                stamps[name] = [stat.st_mtime_ns, stat.st_size, _file_hash(path)]
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": MANIFEST_VERSION, "sources": stamps, "components": self.manifest}, f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except OSError:
+            pass
     
     def get_component_class(self, component_name: str) -> Optional[Type[Component]]:
         """
-        Get component class by name
+        Get component class by name, importing its module on first use
         
         Args:
             component_name: Name of component
@@ -122,6 +220,14 @@ class ComponentRegistry:
             Component class or None if not found
         """
         self.discover_components()
+        if component_name not in self.component_classes and component_name in self.manifest:
+            entry = self.manifest[component_name]
+            try:
+                module = importlib.import_module(entry["module"])
+                self.component_classes[component_name] = getattr(module, entry["class"])
+            except (ImportError, AttributeError) as e:
+                print(f"Warning: Could not load component {component_name}: {e}")
+                return None
         return self.component_classes.get(component_name)
     
     def get_component_instance(self, component_name: str, install_dir: Optional[Path] = None) -> Optional[Component]:
@@ -135,19 +241,25 @@ class ComponentRegistry:
         Returns:
             Component instance or None if not found
         """
-        self.discover_components()
+        component_class = self.get_component_class(component_name)
+        if not component_class:
+            return None
         
         if install_dir is not None:
             # Create new instance with specified install directory
-            component_class = self.component_classes.get(component_name)
-            if component_class:
-                try:
-                    return component_class(install_dir)
-                except Exception as e:
-                    print(f"Error creating component instance {component_name}: {e}")
-                    return None
+            try:
+                return component_class(install_dir)
+            except Exception as e:
+                print(f"Error creating component instance {component_name}: {e}")
+                return None
         
-        return self.component_instances.get(component_name)
+        if component_name not in self.component_instances:
+            try:
+                self.component_instances[component_name] = component_class()
+            except Exception as e:
+                print(f"Error creating component instance {component_name}: {e}")
+                return None
+        return self.component_instances[component_name]
     
     def list_components(self) -> List[str]:
         """
@@ -157,7 +269,7 @@ class ComponentRegistry:
             List of component names
         """
         self.discover_components()
-        return list(self.component_classes.keys())
+        return list(self.manifest.keys())
     
     def get_component_metadata(self, component_name: str) -> Optional[Dict[str, str]]:
         """
@@ -170,13 +282,8 @@ class ComponentRegistry:
             Component metadata dict or None if not found
         """
         self.discover_components()
-        instance = self.component_instances.get(component_name)
-        if instance:
-            try:
-                return instance.get_metadata()
-            except Exception:
-                return None
-        return None
+        entry = self.manifest.get(component_name)
+        return dict(entry["metadata"]) if entry else None
     
     def resolve_dependencies(self, component_names: List[str]) -> List[str]:
         """
@@ -290,17 +397,7 @@ class ComponentRegistry:
             List of component names in the category
         """
         self.discover_components()
-        components = []
-        
-        for name, instance in self.component_instances.items():
-            try:
-                metadata = instance.get_metadata()
-                if metadata.get("category") == category:
-                    components.append(name)
-            except Exception:
-                continue
-        
-        return components
+        return [name for name, entry in self.manifest.items() if entry["category"] == category]
     
     def get_installation_order(self, component_names: List[str]) -> List[List[str]]:
         """
@@ -315,19 +412,18 @@ class ComponentRegistry:
         """
         self.discover_components()
         
-        # Get all components including dependencies
-        all_components = set(self.resolve_dependencies(component_names))
+        # Get all components including dependencies, in resolution order so levels are deterministic
+        remaining = self.resolve_dependencies(component_names)
         
         # Group by dependency level
         levels = []
-        remaining = all_components.copy()
         
         while remaining:
             # Find components with no unresolved dependencies
             current_level = []
-            for name in list(remaining):
+            for name in remaining:
                 deps = self.dependency_graph.get(name, set())
-                unresolved_deps = deps & remaining
+                unresolved_deps = deps.intersection(remaining)
                 
                 if not unresolved_deps:
                     current_level.append(name)
@@ -337,7 +433,7 @@ class ComponentRegistry:
                 raise ValueError("Circular dependency detected in installation order calculation")
             
             levels.append(current_level)
-            remaining -= set(current_level)
+            remaining = [name for name in remaining if name not in current_level]
         
         return levels
     
@@ -375,20 +471,11 @@ class ComponentRegistry:
         
         # Group components by category
         categories = {}
-        for name, instance in self.component_instances.items():
-            try:
-                metadata = instance.get_metadata()
-                category = metadata.get("category", "unknown")
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append(name)
-            except Exception:
-                if "unknown" not in categories:
-                    categories["unknown"] = []
-                categories["unknown"].append(name)
+        for name, entry in self.manifest.items():
+            categories.setdefault(entry["category"], []).append(name)
         
         return {
-            "total_components": len(self.component_classes),
+            "total_components": len(self.manifest),
             "categories": categories,
             "dependency_graph": {name: list(deps) for name, deps in self.dependency_graph.items()},
             "validation_errors": self.validate_dependency_graph()
@@ -4,14 +4,31 @@ Handles settings.json migration to the new SuperClaude metadata json file
 Allows for manipulation of these json files with deep merge and backup
 """
 
+import functools
 import json
 import shutil
+import threading
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 from datetime import datetime
 import copy
 
 
+# settings.json and the metadata file are rewritten wholesale, and components
+# installed in parallel each hold their own SettingsManager; one re-entrant
+# lock per process keeps every read-modify-write from losing another's changes
+_FILE_LOCK = threading.RLock()
+
+
+def _synchronized(method):
+    """Run a method while holding the settings file lock"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with _FILE_LOCK:
+            return method(*args, **kwargs)
+    return wrapper
+
+
 class SettingsManager:
     """Manages settings.json file operations"""
     
@@ -27,6 +44,7 @@ class SettingsManager:
         self.metadata_file = install_dir / ".superclaude-metadata.json"
         self.backup_dir = install_dir / "backups" / "settings"
         
+    @_synchronized
     def load_settings(self) -> Dict[str, Any]:
         """
         Load settings from settings.json
@@ -43,6 +61,7 @@ class SettingsManager:
         except (json.JSONDecodeError, IOError) as e:
             raise ValueError(f"Could not load settings from {self.settings_file}: {e}")
     
+    @_synchronized
     def save_settings(self, settings: Dict[str, Any], create_backup: bool = True) -> None:
         """
         Save settings to settings.json with optional backup
@@ -65,6 +84,7 @@ class SettingsManager:
         except IOError as e:
             raise ValueError(f"Could not save settings to {self.settings_file}: {e}")
     
+    @_synchronized
     def load_metadata(self) -> Dict[str, Any]:
         """
         Load SuperClaude metadata from .superclaude-metadata.json
@@ -81,6 +101,7 @@ class SettingsManager:
         except (json.JSONDecodeError, IOError) as e:
             raise ValueError(f"Could not load metadata from {self.metadata_file}: {e}")
     
+    @_synchronized
     def save_metadata(self, metadata: Dict[str, Any]) -> None:
         """
         Save SuperClaude metadata to .superclaude-metadata.json
@@ -111,6 +132,7 @@ class SettingsManager:
         existing = self.load_metadata()
         return self._deep_merge(existing, modifications)
 
+    @_synchronized
     def update_metadata(self, modifications: Dict[str, Any]) -> None:
         """
         Update settings with modifications
@@ -122,6 +144,7 @@ class SettingsManager:
         merged = self.merge_metadata(modifications)
         self.save_metadata(merged)
 
+    @_synchronized
     def migrate_superclaude_data(self) -> bool:
         """
         Migrate SuperClaude-specific data from settings.json to metadata file
@@ -173,6 +196,7 @@ class SettingsManager:
         existing = self.load_settings()
         return self._deep_merge(existing, modifications)
     
+    @_synchronized
     def update_settings(self, modifications: Dict[str, Any], create_backup: bool = True) -> None:
         """
         Update settings with modifications
@@ -227,6 +251,7 @@ class SettingsManager:
         
         self.update_settings(modification, create_backup)
     
+    @_synchronized
     def remove_setting(self, key_path: str, create_backup: bool = True) -> bool:
         """
         Remove setting using dot-notation path
@@ -258,6 +283,7 @@ class SettingsManager:
         except (KeyError, TypeError):
             return False
     
+    @_synchronized
     def add_component_registration(self, component_name: str, component_info: Dict[str, Any]) -> None:
         """
         Add component to registry in metadata
@@ -277,6 +303,7 @@ class SettingsManager:
         
         self.save_metadata(metadata)
     
+    @_synchronized
     def remove_component_registration(self, component_name: str) -> bool:
         """
         Remove component from registry in metadata
@@ -331,6 +358,7 @@ class SettingsManager:
         component_info = components.get(component_name, {})
         return component_info.get("version")
     
+    @_synchronized
     def update_framework_version(self, version: str) -> None:
         """
         Update SuperClaude framework version in metadata
@@ -386,6 +414,35 @@ class SettingsManager:
         except (KeyError, TypeError):
             return default
     
+    @_synchronized
+    def remove_metadata_setting(self, key_path: str) -> bool:
+        """
+        Remove metadata value using dot-notation path
+        
+        Args:
+            key_path: Dot-separated path to remove
+        
+        Returns:
+            True if value was removed, False if not found
+        """
+        metadata = self.load_metadata()
+        keys = key_path.split('.')
+        
+        current = metadata
+        try:
+            for key in keys[:-1]:
+                current = current[key]
+            
+            if keys[-1] in current:
+                del current[keys[-1]]
+                self.save_metadata(metadata)
+                return True
+            else:
+                return False
+                
+        except (KeyError, TypeError):
+            return False
+    
     def _deep_merge(self, base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
         """
         Deep merge two dictionaries
@@ -483,6 +540,7 @@ class SettingsManager:
         backups.sort(key=lambda x: x["created"], reverse=True)
         return backups
     
+    @_synchronized
     def restore_backup(self, backup_name: str) -> bool:
         """
         Restore settings from backup
@@ -514,6 +572,7 @@ class SettingsManager:
         except (json.JSONDecodeError, IOError):
             return False
     
+    @_synchronized
     def configure_hooks(self, hook_name: str, hook_config: Dict[str, Any]) -> None:
         """
         Configure hooks in settings.json for Claude Code
@@ -556,3 +615,34 @@ class SettingsManager:
         ]
         
         self.configure_hooks("Stop", stop_hook_config)
+
+    def get_hook_config(self, hook_name: str) -> Dict[str, Any]:
+        """
+        Get the runtime configuration a hook reads from metadata
+        
+        Args:
+            hook_name: Name of the hook (e.g., "anti_sycophant")
+            
+        Returns:
+            Hook configuration dict (empty if not configured)
+        """
+        hook_config = self.get_metadata_setting(f"hook_config.{hook_name}", {})
+        return hook_config if isinstance(hook_config, dict) else {}
+    
+    @_synchronized
+    def set_hook_config(self, hook_name: str, hook_config: Dict[str, Any]) -> None:
+        """
+        Store the runtime configuration a hook reads from metadata
+        (e.g. anti_sycophant rule packs, sensitivity, block_and_revise)
+        
+        Args:
+            hook_name: Name of the hook (e.g., "anti_sycophant")
+            hook_config: Hook configuration dict, replacing any existing one
+        """
+        metadata = self.load_metadata()
+        if "hook_config" not in metadata:
+            metadata["hook_config"] = {}
+        
+        metadata["hook_config"][hook_name] = hook_config
+        
+        self.save_metadata(metadata)
@@ -4,10 +4,14 @@ SuperClaude Operations Module
 This module contains all SuperClaude management operations that can be
 executed through the unified CLI hub (SuperClaude).
 
-Each operation module should implement:
+Each operation is described in OPERATIONS (module path and CLI arguments) and
+its module should implement:
 - register_parser(subparsers): Register CLI arguments for the operation
 - run(args): Execute the operation with parsed arguments
 
+The hub builds parsers from OPERATIONS alone and imports an operation module
+only to run it; `python SuperClaude/cli_benchmark.py` checks the startup cost.
+
 Available operations:
 - install: Install SuperClaude framework components
 - update: Update existing SuperClaude installation
@@ -18,33 +22,176 @@ Available operations:
 __version__ = "3.0.0"
 __all__ = ["install", "update", "uninstall", "backup"]
 
+import argparse
+from pathlib import Path
+
+
+# Static CLI specification of every operation. The hub builds all subcommand
+# parsers from this table and imports only the module of the operation that
+# was chosen, so `SuperClaude --help` never loads the installer stack.
+# Arguments are (flags, add_argument keyword arguments); "exclusive" holds
+# mutually exclusive groups as {"required": bool, "arguments": [...]}.
+OPERATIONS = {
+    "install": {
+        "module": "setup.operations.install",
+        "help": "Install SuperClaude framework components",
+        "description": "Install SuperClaude Framework with various options and profiles",
+        "epilog": """
+Examples:
+  SuperClaude install                          # Interactive installation
+  SuperClaude install --quick --dry-run        # Quick installation (dry-run)
+  SuperClaude install --profile developer      # Developer profile  
+  SuperClaude install --components core mcp    # Specific components
+  SuperClaude install --verbose --force        # Verbose with force mode
+        """,
+        "arguments": [
+            # Installation mode options
+            (("--quick",), {"action": "store_true", "help": "Quick installation with pre-selected components"}),
+            (("--minimal",), {"action": "store_true", "help": "Minimal installation (core only)"}),
+            (("--profile",), {"type": str, "help": "Installation profile (quick, minimal, developer, etc.)"}),
+            (("--components",), {"type": str, "nargs": "+", "help": "Specific components to install"}),
+            # Installation options
+            (("--no-backup",), {"action": "store_true", "help": "Skip backup creation"}),
+            # Hook options default to None so a reinstall keeps the choices saved in hook_config
+            (("--hook-daemon",), {"action": "store_true", "default": None,
+                                  "help": "Run the anti-sycophant hook through a resident daemon (faster Stop hooks)"}),
+            (("--no-hook-daemon",), {"action": "store_false", "dest": "hook_daemon", "default": None,
+                                     "help": "Run the anti-sycophant hook directly, without the daemon"}),
+            (("--hook-idle-timeout",), {"type": int, "default": None,
+                                        "help": "Seconds of inactivity before the hook daemon exits, "
+                                                "0 to keep it running (default: saved value, else 900)"}),
+            (("--hook-notifier",), {"choices": ["auto", "detached", "desktop", "none"], "default": None,
+                                    "help": "How the anti-sycophant hook shows notifications "
+                                            "(default: saved choice, else auto-detect)"}),
+            (("--hook-rule-pack",), {"action": "append", "metavar": "PATH",
+                                     "help": "JSON rule pack for the anti-sycophant hook (can be repeated)"}),
+            (("--jobs", "-j"), {"type": int, "default": 4,
+                                "help": "Components installed in parallel within a dependency level, "
+                                        "1 for sequential (default: 4)"}),
+            (("--list-components",), {"action": "store_true", "help": "List available components and exit"}),
+            (("--diagnose",), {"action": "store_true", "help": "Run system diagnostics and show installation help"}),
+        ]
+    },
+    "update": {
+        "module": "setup.operations.update",
+        "help": "Update existing SuperClaude installation",
+        "description": "Update SuperClaude Framework components to latest versions",
+        "epilog": """
+Examples:
+  SuperClaude update                       # Interactive update
+  SuperClaude update --check --verbose     # Check for updates (verbose)
+  SuperClaude update --components core mcp # Update specific components
+  SuperClaude update --backup --force      # Create backup before update (forced)
+        """,
+        "arguments": [
+            # Update mode options
+            (("--check",), {"action": "store_true", "help": "Check for available updates without installing"}),
+            (("--components",), {"type": str, "nargs": "+", "help": "Specific components to update"}),
+            # Backup options
+            (("--backup",), {"action": "store_true", "help": "Create backup before update"}),
+            (("--no-backup",), {"action": "store_true", "help": "Skip backup creation"}),
+            # Update options
+            (("--reinstall",), {"action": "store_true", "help": "Reinstall components even if versions match"}),
+            (("--jobs", "-j"), {"type": int, "default": 4,
+                                "help": "Components updated in parallel within a dependency level, "
+                                        "1 for sequential (default: 4)"}),
+        ]
+    },
+    "uninstall": {
+        "module": "setup.operations.uninstall",
+        "help": "Remove SuperClaude framework installation",
+        "description": "Uninstall SuperClaude Framework components",
+        "epilog": """
+Examples:
+  SuperClaude uninstall                    # Interactive uninstall
+  SuperClaude uninstall --components core  # Remove specific components
+  SuperClaude uninstall --complete --force # Complete removal (forced)
+  SuperClaude uninstall --keep-backups     # Keep backup files
+        """,
+        "arguments": [
+            # Uninstall mode options
+            (("--components",), {"type": str, "nargs": "+", "help": "Specific components to uninstall"}),
+            (("--complete",), {"action": "store_true", "help": "Complete uninstall (remove all files and directories)"}),
+            # Data preservation options
+            (("--keep-backups",), {"action": "store_true", "help": "Keep backup files during uninstall"}),
+            (("--keep-logs",), {"action": "store_true", "help": "Keep log files during uninstall"}),
+            (("--keep-settings",), {"action": "store_true", "help": "Keep user settings during uninstall"}),
+            # Safety options
+            (("--no-confirm",), {"action": "store_true", "help": "Skip confirmation prompts (use with caution)"}),
+        ]
+    },
+    "backup": {
+        "module": "setup.operations.backup",
+        "help": "Backup and restore SuperClaude installations",
+        "description": "Create, list, restore, and manage SuperClaude installation backups",
+        "epilog": """
+Examples:
+  SuperClaude backup --create               # Create new backup
+  SuperClaude backup --list --verbose       # List available backups (verbose)
+  SuperClaude backup --restore              # Interactive restore
+  SuperClaude backup --restore backup.tar.gz  # Restore specific backup
+  SuperClaude backup --info backup.tar.gz   # Show backup information
+  SuperClaude backup --cleanup --force      # Clean up old backups (forced)
+        """,
+        "exclusive": [
+            # Backup operations
+            {"required": True, "arguments": [
+                (("--create",), {"action": "store_true", "help": "Create a new backup"}),
+                (("--list",), {"action": "store_true", "help": "List available backups"}),
+                (("--restore",), {"nargs": "?", "const": "interactive",
+                                  "help": "Restore from backup (optionally specify backup file)"}),
+                (("--info",), {"type": str, "help": "Show information about a specific backup file"}),
+                (("--cleanup",), {"action": "store_true", "help": "Clean up old backup files"}),
+            ]}
+        ],
+        "arguments": [
+            # Backup options
+            (("--backup-dir",), {"type": Path, "help": "Backup directory (default: <install-dir>/backups)"}),
+            (("--name",), {"type": str, "help": "Custom backup name (for --create)"}),
+            (("--compress",), {"choices": ["none", "gzip", "bzip2"], "default": "gzip",
+                               "help": "Compression method (default: gzip)"}),
+            # Restore options
+            (("--overwrite",), {"action": "store_true", "help": "Overwrite existing files during restore"}),
+            # Cleanup options
+            (("--keep",), {"type": int, "default": 5,
+                           "help": "Number of backups to keep during cleanup (default: 5)"}),
+            (("--older-than",), {"type": int, "help": "Remove backups older than N days"}),
+        ]
+    }
+}
+
 
 def get_operation_info():
     """Get information about available operations"""
     return {
-        "install": {
-            "name": "install",
-            "description": "Install SuperClaude framework components",
-            "module": "setup.operations.install"
-        },
-        "update": {
-            "name": "update", 
-            "description": "Update existing SuperClaude installation",
-            "module": "setup.operations.update"
-        },
-        "uninstall": {
-            "name": "uninstall",
-            "description": "Remove SuperClaude framework installation", 
-            "module": "setup.operations.uninstall"
-        },
-        "backup": {
-            "name": "backup",
-            "description": "Backup and restore SuperClaude installations",
-            "module": "setup.operations.backup"
-        }
+        name: {"name": name, "description": spec["help"], "module": spec["module"]}
+        for name, spec in OPERATIONS.items()
     }
 
 
+def register_operation_parser(subparsers, name: str, global_parser=None) -> argparse.ArgumentParser:
+    """Build an operation's subcommand parser from its entry in OPERATIONS"""
+    spec = OPERATIONS[name]
+    parser = subparsers.add_parser(
+        name,
+        help=spec["help"],
+        description=spec["description"],
+        epilog=spec["epilog"],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        parents=[global_parser] if global_parser else []
+    )
+
+    for group_spec in spec.get("exclusive", []):
+        group = parser.add_mutually_exclusive_group(required=group_spec["required"])
+        for flags, options in group_spec["arguments"]:
+            group.add_argument(*flags, **options)
+
+    for flags, options in spec["arguments"]:
+        parser.add_argument(*flags, **options)
+
+    return parser
+
+
 class OperationBase:
     """Base class for all operations providing common functionality"""
     
@@ -19,7 +19,7 @@ from ..utils.ui import (
 )
 from ..utils.logger import get_logger
 from .. import DEFAULT_INSTALL_DIR
-from . import OperationBase
+from . import OperationBase, register_operation_parser
 
 
 class BackupOperation(OperationBase):
@@ -31,101 +31,7 @@ class BackupOperation(OperationBase):
 
 def register_parser(subparsers, global_parser=None) -> argparse.ArgumentParser:
     """Register backup CLI arguments"""
-    parents = [global_parser] if global_parser else []
-    
-    parser = subparsers.add_parser(
-        "backup",
-        help="Backup and restore SuperClaude installations",
-        description="Create, list, restore, and manage SuperClaude installation backups",
-        epilog="""
-Examples:
-  SuperClaude backup --create               # Create new backup
-  SuperClaude backup --list --verbose       # List available backups (verbose)
-  SuperClaude backup --restore              # Interactive restore
-  SuperClaude backup --restore backup.tar.gz  # Restore specific backup
-  SuperClaude backup --info backup.tar.gz   # Show backup information
-  SuperClaude backup --cleanup --force      # Clean up old backups (forced)
-        """,
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        parents=parents
-    )
-    
-    # Backup operations (mutually exclusive)
-    operation_group = parser.add_mutually_exclusive_group(required=True)
-    
-    operation_group.add_argument(
-        "--create",
-        action="store_true",
-        help="Create a new backup"
-    )
-    
-    operation_group.add_argument(
-        "--list",
-        action="store_true",
-        help="List available backups"
-    )
-    
-    operation_group.add_argument(
-        "--restore",
-        nargs="?",
-        const="interactive",
-        help="Restore from backup (optionally specify backup file)"
-    )
-    
-    operation_group.add_argument(
-        "--info",
-        type=str,
-        help="Show information about a specific backup file"
-    )
-    
-    operation_group.add_argument(
-        "--cleanup",
-        action="store_true",
-        help="Clean up old backup files"
-    )
-    
-    # Backup options
-    parser.add_argument(
-        "--backup-dir",
-        type=Path,
-        help="Backup directory (default: <install-dir>/backups)"
-    )
-    
-    parser.add_argument(
-        "--name",
-        type=str,
-        help="Custom backup name (for --create)"
-    )
-    
-    parser.add_argument(
-        "--compress",
-        choices=["none", "gzip", "bzip2"],
-        default="gzip",
-        help="Compression method (default: gzip)"
-    )
-    
-    # Restore options
-    parser.add_argument(
-        "--overwrite",
-        action="store_true",
-        help="Overwrite existing files during restore"
-    )
-    
-    # Cleanup options
-    parser.add_argument(
-        "--keep",
-        type=int,
-        default=5,
-        help="Number of backups to keep during cleanup (default: 5)"
-    )
-    
-    parser.add_argument(
-        "--older-than",
-        type=int,
-        help="Remove backups older than N days"
-    )
-    
-    return parser
+    return register_operation_parser(subparsers, "backup", global_parser)
 
 
 def get_backup_directory(args: argparse.Namespace) -> Path:
@@ -19,7 +19,7 @@ from ..utils.ui import (
 )
 from ..utils.logger import get_logger
 from .. import DEFAULT_INSTALL_DIR, PROJECT_ROOT
-from . import OperationBase
+from . import OperationBase, register_operation_parser
 
 
 class InstallOperation(OperationBase):
@@ -31,70 +31,7 @@ class InstallOperation(OperationBase):
 
 def register_parser(subparsers, global_parser=None) -> argparse.ArgumentParser:
     """Register installation CLI arguments"""
-    parents = [global_parser] if global_parser else []
-    
-    parser = subparsers.add_parser(
-        "install",
-        help="Install SuperClaude framework components",
-        description="Install SuperClaude Framework with various options and profiles",
-        epilog="""
-Examples:
-  SuperClaude install                          # Interactive installation
-  SuperClaude install --quick --dry-run        # Quick installation (dry-run)
-  SuperClaude install --profile developer      # Developer profile  
-  SuperClaude install --components core mcp    # Specific components
-  SuperClaude install --verbose --force        # Verbose with force mode
-        """,
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        parents=parents
-    )
-    
-    # Installation mode options
-    parser.add_argument(
-        "--quick", 
-        action="store_true",
-        help="Quick installation with pre-selected components"
-    )
-    
-    parser.add_argument(
-        "--minimal",
-        action="store_true", 
-        help="Minimal installation (core only)"
-    )
-    
-    parser.add_argument(
-        "--profile",
-        type=str,
-        help="Installation profile (quick, minimal, developer, etc.)"
-    )
-    
-    parser.add_argument(
-        "--components",
-        type=str,
-        nargs="+",
-        help="Specific components to install"
-    )
-    
-    # Installation options
-    parser.add_argument(
-        "--no-backup",
-        action="store_true",
-        help="Skip backup creation"
-    )
-    
-    parser.add_argument(
-        "--list-components",
-        action="store_true",
-        help="List available components and exit"
-    )
-    
-    parser.add_argument(
-        "--diagnose",
-        action="store_true",
-        help="Run system diagnostics and show installation help"
-    )
-    
-    return parser
+    return register_operation_parser(subparsers, "install", global_parser)
 
 
 def validate_system_requirements(validator: Validator, component_names: List[str]) -> bool:
@@ -337,15 +274,18 @@ def perform_installation(components: List[str], args: argparse.Namespace) -> boo
     start_time = time.time()
     
     try:
-        # Create installer
-        installer = Installer(args.install_dir, dry_run=args.dry_run)
-        
         # Create component registry
         registry = ComponentRegistry(PROJECT_ROOT / "setup" / "components")
         registry.discover_components()
         
-        # Create component instances
-        component_instances = registry.create_component_instances(components, args.install_dir)
+        # Create installer; the registry decides the installation order
+        installer = Installer(args.install_dir, dry_run=args.dry_run, max_workers=args.jobs, registry=registry)
+        
+        # Resolve dependencies
+        ordered_components = registry.resolve_dependencies(components)
+        
+        # Create component instances, dependencies included, so the installer can order them
+        component_instances = registry.create_component_instances(ordered_components, args.install_dir)
         
         if not component_instances:
             logger.error("No valid component instances created")
@@ -354,9 +294,6 @@ def perform_installation(components: List[str], args: argparse.Namespace) -> boo
         # Register components with installer
         installer.register_components(list(component_instances.values()))
         
-        # Resolve dependencies
-        ordered_components = registry.resolve_dependencies(components)
-        
         # Setup progress tracking
         progress = ProgressBar(
             total=len(ordered_components),
@@ -370,7 +307,11 @@ def perform_installation(components: List[str], args: argparse.Namespace) -> boo
         config = {
             "force": args.force,
             "backup": not args.no_backup,
-            "dry_run": args.dry_run
+            "dry_run": args.dry_run,
+            "hook_daemon": args.hook_daemon,
+            "hook_daemon_idle_timeout": args.hook_idle_timeout,
+            "hook_notifier": args.hook_notifier,
+            "hook_rule_packs": [str(Path(path).expanduser().resolve()) for path in args.hook_rule_pack or []]
         }
         
         success = installer.install_components(ordered_components, config)
@@ -379,6 +320,8 @@ def perform_installation(components: List[str], args: argparse.Namespace) -> boo
         for i, component_name in enumerate(ordered_components):
             if component_name in installer.installed_components:
                 progress.update(i + 1, f"Installed {component_name}")
+            elif component_name in installer.skipped_components:
+                progress.update(i + 1, f"Skipped {component_name}")
             else:
                 progress.update(i + 1, f"Failed {component_name}")
             time.sleep(0.1)  # Brief pause for visual effect
@@ -405,6 +348,11 @@ def perform_installation(components: List[str], args: argparse.Namespace) -> boo
             summary = installer.get_installation_summary()
             if summary['failed']:
                 logger.error(f"Failed components: {', '.join(summary['failed'])}")
+            if summary['skipped']:
+                logger.error(f"Skipped components: {', '.join(summary['skipped'])}")
+            for component_name, result in summary['results'].items():
+                for error in result['errors']:
+                    logger.error(f"  {component_name}: {error}")
         
         return success
         
@@ -18,7 +18,7 @@ from ..utils.ui import (
 )
 from ..utils.logger import get_logger
 from .. import DEFAULT_INSTALL_DIR, PROJECT_ROOT
-from . import OperationBase
+from . import OperationBase, register_operation_parser
 
 
 class UninstallOperation(OperationBase):
@@ -30,64 +30,7 @@ class UninstallOperation(OperationBase):
 
 def register_parser(subparsers, global_parser=None) -> argparse.ArgumentParser:
     """Register uninstall CLI arguments"""
-    parents = [global_parser] if global_parser else []
-    
-    parser = subparsers.add_parser(
-        "uninstall",
-        help="Remove SuperClaude framework installation",
-        description="Uninstall SuperClaude Framework components",
-        epilog="""
-Examples:
-  SuperClaude uninstall                    # Interactive uninstall
-  SuperClaude uninstall --components core  # Remove specific components
-  SuperClaude uninstall --complete --force # Complete removal (forced)
-  SuperClaude uninstall --keep-backups     # Keep backup files
-        """,
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        parents=parents
-    )
-    
-    # Uninstall mode options
-    parser.add_argument(
-        "--components",
-        type=str,
-        nargs="+",
-        help="Specific components to uninstall"
-    )
-    
-    parser.add_argument(
-        "--complete",
-        action="store_true",
-        help="Complete uninstall (remove all files and directories)"
-    )
-    
-    # Data preservation options
-    parser.add_argument(
-        "--keep-backups",
-        action="store_true",
-        help="Keep backup files during uninstall"
-    )
-    
-    parser.add_argument(
-        "--keep-logs",
-        action="store_true",
-        help="Keep log files during uninstall"
-    )
-    
-    parser.add_argument(
-        "--keep-settings",
-        action="store_true",
-        help="Keep user settings during uninstall"
-    )
-    
-    # Safety options
-    parser.add_argument(
-        "--no-confirm",
-        action="store_true",
-        help="Skip confirmation prompts (use with caution)"
-    )
-    
-    return parser
+    return register_operation_parser(subparsers, "uninstall", global_parser)
 
 def get_installed_components(install_dir: Path) -> Dict[str, Dict[str, Any]]:
     """Get currently installed components and their versions"""
@@ -19,7 +19,7 @@ from ..utils.ui import (
 )
 from ..utils.logger import get_logger
 from .. import DEFAULT_INSTALL_DIR, PROJECT_ROOT
-from . import OperationBase
+from . import OperationBase, register_operation_parser
 
 
 class UpdateOperation(OperationBase):
@@ -31,58 +31,7 @@ class UpdateOperation(OperationBase):
 
 def register_parser(subparsers, global_parser=None) -> argparse.ArgumentParser:
     """Register update CLI arguments"""
-    parents = [global_parser] if global_parser else []
-    
-    parser = subparsers.add_parser(
-        "update",
-        help="Update existing SuperClaude installation",
-        description="Update SuperClaude Framework components to latest versions",
-        epilog="""
-Examples:
-  SuperClaude update                       # Interactive update
-  SuperClaude update --check --verbose     # Check for updates (verbose)
-  SuperClaude update --components core mcp # Update specific components
-  SuperClaude update --backup --force      # Create backup before update (forced)
-        """,
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        parents=parents
-    )
-    
-    # Update mode options
-    parser.add_argument(
-        "--check",
-        action="store_true",
-        help="Check for available updates without installing"
-    )
-    
-    parser.add_argument(
-        "--components",
-        type=str,
-        nargs="+",
-        help="Specific components to update"
-    )
-    
-    # Backup options
-    parser.add_argument(
-        "--backup",
-        action="store_true",
-        help="Create backup before update"
-    )
-    
-    parser.add_argument(
-        "--no-backup",
-        action="store_true",
-        help="Skip backup creation"
-    )
-    
-    # Update options
-    parser.add_argument(
-        "--reinstall",
-        action="store_true",
-        help="Reinstall components even if versions match"
-    )
-    
-    return parser
+    return register_operation_parser(subparsers, "update", global_parser)
 
 def check_installation_exists(install_dir: Path) -> bool:
     """Check if SuperClaude installation exists"""
@@ -241,13 +190,13 @@ def perform_update(components: List[str], args: argparse.Namespace) -> bool:
     start_time = time.time()
     
     try:
-        # Create installer
-        installer = Installer(args.install_dir, dry_run=args.dry_run)
-        
         # Create component registry
         registry = ComponentRegistry(PROJECT_ROOT / "setup" / "components")
         registry.discover_components()
         
+        # Create installer; the registry decides the installation order
+        installer = Installer(args.install_dir, dry_run=args.dry_run, max_workers=args.jobs, registry=registry)
+        
         # Create component instances
         component_instances = registry.create_component_instances(components, args.install_dir)
         
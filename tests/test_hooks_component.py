@@ -0,0 +1,101 @@
+"""
+Tests for installing, updating and uninstalling the hooks component
+"""
+
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from setup.components.hooks import HooksComponent
+
+
+@pytest.fixture
+def hooks(tmp_path, monkeypatch):
+    """Hooks component installing into a scratch directory"""
+    # The security validator refuses system temp directories as install targets
+    monkeypatch.setattr(HooksComponent, "validate_prerequisites", lambda self, subdir=None: (True, []))
+    return lambda: HooksComponent(tmp_path / ".claude")
+
+
+def stop_command(install_dir):
+    settings = json.loads((install_dir / "settings.json").read_text())
+    return settings["hooks"]["Stop"][0]["hooks"][0]["command"]
+
+
+def test_update_keeps_hook_options_chosen_at_install(hooks, tmp_path):
+    rule_pack = tmp_path / "team.json"
+    rule_pack.write_text("{}")
+
+    installed = hooks()
+    assert installed.install({
+        "hook_daemon": True,
+        "hook_daemon_idle_timeout": 60,
+        "hook_notifier": "desktop",
+        "hook_rule_packs": [str(rule_pack)]
+    })
+    command = stop_command(installed.install_dir)
+    assert "anti_sycophant_client.py --idle-timeout 60" in command
+
+    # The update operation passes no hook options
+    updated = hooks()
+    assert updated.install({"force": False, "backup": False, "dry_run": False, "update_mode": True})
+
+    assert stop_command(updated.install_dir) == command
+    hook_config = updated.settings_manager.get_hook_config("anti_sycophant")
+    assert hook_config["notifier"] == "desktop"
+    assert hook_config["rule_packs"] == [str(rule_pack)]
+    assert hook_config["daemon"] is True
+    assert hook_config["daemon_idle_timeout"] == 60
+
+
+def test_command_line_overrides_saved_hook_options(hooks):
+    assert hooks().install({"hook_daemon": True, "hook_notifier": "desktop"})
+
+    reinstalled = hooks()
+    assert reinstalled.install({"hook_daemon": False, "hook_notifier": "none"})
+
+    assert stop_command(reinstalled.install_dir).endswith("anti_sycophant.py")
+    hook_config = reinstalled.settings_manager.get_hook_config("anti_sycophant")
+    assert hook_config["notifier"] == "none"
+    assert hook_config["daemon"] is False
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="the hook daemon needs Unix sockets")
+def test_uninstall_stops_daemon_and_removes_state(hooks):
+    installed = hooks()
+    assert installed.install({"hook_daemon": True})
+    hooks_dir = installed.install_component_subdir
+    state_dir = hooks_dir / ".anti_sycophant"
+    socket_path = state_dir / "daemon.sock"
+
+    # The daemon finds its state directory from where the hook is installed
+    daemon = subprocess.Popen([sys.executable, str(hooks_dir / "anti_sycophant_daemon.py"), "--idle-timeout", "30"])
+    try:
+        deadline = time.monotonic() + 10
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert socket_path.exists()
+
+        assert hooks().uninstall()
+        assert daemon.wait(timeout=5) == 0
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+
+    assert not state_dir.exists()
+    assert not hooks_dir.exists()
+
+
+def test_uninstall_removes_saved_hook_options(hooks):
+    installed = hooks()
+    assert installed.install({"hook_daemon": True, "hook_notifier": "desktop"})
+    assert installed.settings_manager.get_hook_config("anti_sycophant")
+
+    uninstalled = hooks()
+    assert uninstalled.uninstall()
+    assert uninstalled.settings_manager.get_hook_config("anti_sycophant") == {}
+    assert uninstalled.settings_manager.get_metadata_setting("hook_config") is None
@@ -0,0 +1,127 @@
+"""
+Tests for installing, updating and uninstalling MCP servers through the Claude CLI
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+from setup.components.mcp import MCPComponent
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the fake Claude CLI is a shell script")
+
+FAKE_CLAUDE = '''#!{python}
+import json, os, sys, time
+state, calls = os.environ["FAKE_MCP_STATE"], os.environ["FAKE_MCP_CALLS"]
+args = sys.argv[1:]
+def load():
+    return json.load(open(state)) if os.path.exists(state) else []
+def log(entry):
+    with open(calls, "a") as f:
+        f.write(entry + "\\n")
+if args == ["--version"]:
+    print("1.0.0 (Claude Code)")
+elif args[:2] == ["mcp", "list"]:
+    log("list")
+    for name in load():
+        print(name + ": npx -y pkg - Connected")
+elif args[:2] == ["mcp", "add"]:
+    name = args[args.index("--") + 1]
+    log("add start " + name)
+    servers = load()
+    time.sleep(0.05)
+    json.dump(servers + [name], open(state, "w"))
+    log("add end " + name)
+elif args[:2] == ["mcp", "remove"]:
+    log("remove " + args[2])
+    if args[2] == os.environ.get("FAKE_MCP_REMOVE_FAILS"):
+        sys.exit("cannot remove " + args[2])
+    json.dump([s for s in load() if s != args[2]], open(state, "w"))
+'''
+
+FAKE_NPM = '''#!{python}
+import os, sys, time
+args = sys.argv[1:]
+def log(entry):
+    with open(os.environ["FAKE_MCP_CALLS"], "a") as f:
+        f.write(entry + "\\n")
+if args[:1] == ["exec"]:
+    package = args[args.index("--package") + 1]
+    log("fetch start " + package)
+    time.sleep(0.3)
+    log("fetch end " + package)
+else:
+    print("10.0.0")
+'''
+
+
+@pytest.fixture
+def claude(tmp_path, monkeypatch):
+    """A fake `claude` (plus node and npm) first on PATH; returns a reader for its call log"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    scripts = {"claude": FAKE_CLAUDE.format(python=sys.executable),
+               "node": "#!/bin/sh\necho v20.0.0\n",
+               "npm": FAKE_NPM.format(python=sys.executable)}
+    for name, script in scripts.items():
+        (bin_dir / name).write_text(script)
+        (bin_dir / name).chmod(0o755)
+
+    calls = tmp_path / "calls"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_MCP_STATE", str(tmp_path / "servers.json"))
+    monkeypatch.setenv("FAKE_MCP_CALLS", str(calls))
+
+    def read_calls():
+        entries = calls.read_text().splitlines() if calls.exists() else []
+        calls.unlink(missing_ok=True)
+        return entries
+    return read_calls
+
+
+def test_install_update_uninstall_share_one_listing(claude, tmp_path):
+    install_dir = tmp_path / ".claude"
+    servers = list(MCPComponent(install_dir).mcp_servers)
+
+    component = MCPComponent(install_dir)
+    assert component.install({})
+    assert component.validate_installation() == (True, [])
+    calls = claude()
+    # One listing to find what is missing, one to verify
+    assert calls.count("list") == 2
+    # Packages download side by side, but config-writing adds never overlap
+    fetches = [entry.split()[1] for entry in calls if entry.startswith("fetch")]
+    assert fetches == ["start"] * len(servers) + ["end"] * len(servers)
+    adds = [entry for entry in calls if entry.startswith("add")]
+    assert sorted(adds[::2]) == sorted(f"add start {name}" for name in servers)
+    assert adds[1::2] == [entry.replace("start", "end") for entry in adds[::2]]
+
+    component = MCPComponent(install_dir)
+    component.settings_manager.update_metadata({"components": {"mcp": {"version": "2.0.0"}}})
+    assert component.update({})
+    calls = claude()
+    assert calls.count("list") == 2
+    assert [entry for entry in calls if entry.startswith("remove")] == [f"remove {name}" for name in servers]
+    assert component.settings_manager.get_component_version("mcp") == "3.0.0"
+    assert component.settings_manager.get_metadata_setting("mcp.servers") == servers
+
+    component = MCPComponent(install_dir)
+    assert component.uninstall()
+    calls = claude()
+    assert calls == ["list"] + [f"remove {name}" for name in servers]
+    assert json.loads((tmp_path / "servers.json").read_text()) == []
+    assert component.settings_manager.get_metadata_setting("mcp") is None
+
+
+def test_update_fails_for_a_server_it_could_not_remove(claude, tmp_path, monkeypatch):
+    install_dir = tmp_path / ".claude"
+    assert MCPComponent(install_dir).install({})
+    claude()
+
+    component = MCPComponent(install_dir)
+    component.settings_manager.update_metadata({"components": {"mcp": {"version": "2.0.0"}}})
+    monkeypatch.setenv("FAKE_MCP_REMOVE_FAILS", "magic")
+    assert not component.update({})
+    assert not any(entry == "add start magic" for entry in claude())
@@ -0,0 +1,71 @@
+"""
+Tests for the prompt optimizer context cache and request classifier
+"""
+
+import os
+import time
+
+from SuperClaude.Scripts import prompt_optimizer
+
+
+def settled_stamps(path):
+    """Stamps for a directory whose mtime is old enough to be trusted"""
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    return [[str(path), os.stat(path).st_mtime_ns]]
+
+
+def test_context_cache_keeps_truncated_scans_partial(tmp_path):
+    cache = prompt_optimizer.ContextCache(tmp_path / "cache.json")
+    stamps = settled_stamps(tmp_path)
+
+    cache.put("/project", stamps, {"cwd": "/project", "scan": {"truncated": True}})
+    assert cache.get("/project") == {"cwd": "/project", "scan": {"truncated": True}}
+    optimizer = prompt_optimizer.PromptOptimizer(context=dict(cache.get("/project"), framework=None,
+                                                              language=None, files=[]), vocabulary={})
+    assert "Project scan was partial" in optimizer.scaffold_prompt("fix it", "bugfix")
+
+    os.utime(tmp_path)
+    assert cache.get("/project") is None
+
+
+def test_scan_stamps_only_root_and_first_level(tmp_path):
+    (tmp_path / "src" / "pkg" / "deep").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "deep" / "module.py").write_text("")
+    (tmp_path / "src" / ".gitignore").write_text("*.log\n")
+    (tmp_path / "docs").mkdir()
+
+    scan = prompt_optimizer.ProjectScanner(str(tmp_path)).scan()
+    assert scan["directories"] == 5
+    assert sorted(os.path.relpath(path, tmp_path) for path, _ in scan["stamps"]) == [
+        ".", "docs", "src", os.path.join("src", ".gitignore")]
+
+
+def test_inflected_keywords_share_a_stem():
+    stems = prompt_optimizer._stems
+    assert stems("speed speeds speeding") == ["speed"] * 3
+    assert stems("optimize optimizes optimizing optimized") == ["optimiz"] * 4
+    assert stems("fix fixes fixed fixing") == ["fix"] * 4
+    assert stems("debug debugging debugged") == ["debug"] * 3
+    assert stems("crash crashes crashed") == ["crash"] * 3
+    # Words that only look inflected are kept whole
+    assert stems("need string class analysis status") == ["need", "string", "class", "analysis", "status"]
+
+
+def test_classifier_matches_inflected_forms():
+    classifier = prompt_optimizer.RequestClassifier()
+    cases = {
+        "the importer speeds through small files but stalls on large ones": "performance",
+        "speeding up the importer": "performance",
+        "optimizing the query planner": "performance",
+        "the parser crashed on empty input": "bugfix",
+        "fixing the uploads that failed": "bugfix",
+        "tested the retry logic?": "testing",
+        "documenting the public api": "documentation",
+        "refactoring the settings loader": "refactor",
+    }
+    for request, category in cases.items():
+        assert classifier.classify(request)[0] == category, request
+
+    for form in ("speed", "speeds", "speeding"):
+        assert classifier.score(f"{form} it up") == classifier.score("speed it up")